@@ -2,7 +2,6 @@ import asyncio
 import logging
 
 from aiogram import Bot, Dispatcher
-from aiogram.fsm.storage.memory import MemoryStorage
 
 # Настройка логирования
 logging.basicConfig(
@@ -11,22 +10,82 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+async def sync_catalog_index(catalog_index, interval: int):
+    """
+    Периодическая синхронизация индекса /search с файлами результатов
+    (файлы, сохраненные парсером вне бота; неизмененные не перечитываются)
+
+    Args:
+        catalog_index: Индекс каталога
+        interval: Пауза между синхронизациями (секунды)
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        try:
+            stats = await loop.run_in_executor(None, catalog_index.sync)
+            if stats["updated"]:
+                logger.info(
+                    f"Индекс каталога: файлов {stats['files']}, "
+                    f"обновлено {stats['updated']} автомобилей"
+                )
+        except Exception as e:
+            logger.error(f"Ошибка синхронизации индекса каталога: {e}")
+        await asyncio.sleep(interval)
+
+
 async def main():
     """Главная функция запуска бота"""
     from encar_bot.config import load_config
+    from encar_bot.handlers.batch import batch_router
     from encar_bot.handlers.common import common_router
     from encar_bot.handlers.parser import parser_router
+    from encar_bot.handlers.search import search_router
+    from encar_bot.storage import JobStore, SQLiteStorage
+    from encar_bot.utils.images import ImagePipeline
+    from encar_bot.utils.jobs import resume_unfinished_jobs
+    from encar_parser.data.catalog_index import CatalogIndex
+    from encar_parser.utils.log_config import setup_logging
+    from encar_parser.utils.metrics import start_metrics_server
+    from encar_parser.utils.profiling import configure_profiling
 
     # Загрузка конфигурации
     config = load_config()
 
+    # Логи парсера: уровень INFO (без отладки по каждому элементу)
+    setup_logging(verbose=False)
+
+    # Эндпоинт метрик (curl http://localhost:<port>/metrics)
+    if config.metrics_port:
+        start_metrics_server(config.metrics_port)
+
+    # Профилирование запросов к парсеру (PARSER_PROFILE=sample рекомендуется:
+    # cProfile на Python 3.12+ не работает в нескольких потоках пула одновременно)
+    if config.profile_mode:
+        configure_profiling(config.profile_mode)
+
     # Инициализация бота
     bot = Bot(token=config.token)
-    storage = MemoryStorage()
-    dp = Dispatcher(storage=storage)
+    storage = SQLiteStorage(config.storage_path)
+    job_store = JobStore(result_ttl=config.result_cache_ttl, storage=storage)
+    job_store.prune_jobs()
+    image_pipeline = ImagePipeline(
+        check_urls=config.image_check,
+        resize=config.image_resize,
+        file_id_store=job_store,
+    )
+    catalog_index = CatalogIndex(config.index_path)
+    dp = Dispatcher(
+        storage=storage,
+        config=config,
+        job_store=job_store,
+        image_pipeline=image_pipeline,
+        catalog_index=catalog_index,
+    )
 
-    # Подключение роутеров
+    # Подключение роутеров (команды - до обработчиков текста в состояниях)
     dp.include_router(common_router)
+    dp.include_router(search_router)
+    dp.include_router(batch_router)
     dp.include_router(parser_router)
 
     logger.info("Запуск бота...")
@@ -34,10 +93,24 @@ async def main():
     # Удаление вебхуков
     await bot.delete_webhook(drop_pending_updates=True)
 
+    # Возобновление задач, прерванных прошлым перезапуском
+    resume_task = asyncio.create_task(resume_unfinished_jobs(bot, job_store))
+
+    # Индекс: файлы результатов, появившиеся без бота (при запуске и периодически)
+    sync_task = asyncio.create_task(
+        sync_catalog_index(catalog_index, config.index_sync_interval)
+    )
+
     # Запуск polling
     try:
         await dp.start_polling(bot)
     finally:
+        resume_task.cancel()
+        sync_task.cancel()
+        await image_pipeline.close()
+        job_store.close()
+        await storage.close()
+        catalog_index.close()
         await bot.session.close()
 
 
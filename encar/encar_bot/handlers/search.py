@@ -0,0 +1,57 @@
+"""
+Хэндлеры поиска по индексу результатов парсинга
+"""
+
+import asyncio
+import logging
+
+from aiogram import Router, types
+from aiogram.filters import Command, CommandObject
+
+from encar_bot.utils.formatters import (
+    format_car_short,
+    format_search_summary,
+    get_search_help,
+)
+from encar_parser.data.catalog_index import CatalogIndex, parse_search_terms
+
+search_router = Router()
+logger = logging.getLogger(__name__)
+
+# Максимум автомобилей в ответе
+SEARCH_LIMIT = 10
+
+
+def _search(catalog_index: CatalogIndex, filters: dict):
+    """Поиск с подсчетом (выполняется в пуле потоков)"""
+    return catalog_index.count(**filters), catalog_index.search(**filters)
+
+
+@search_router.message(Command("search"))
+async def cmd_search(
+    message: types.Message, command: CommandObject, catalog_index: CatalogIndex
+):
+    """Обработчик команды /search"""
+    if not command.args:
+        await message.answer(get_search_help(), parse_mode="HTML")
+        return
+
+    try:
+        filters = parse_search_terms(command.args)
+    except ValueError as e:
+        await message.answer(f"⚠️ {e}\n\n{get_search_help()}", parse_mode="HTML")
+        return
+
+    filters["limit"] = min(filters.get("limit") or SEARCH_LIMIT, SEARCH_LIMIT)
+
+    loop = asyncio.get_event_loop()
+    try:
+        total, cars = await loop.run_in_executor(None, _search, catalog_index, filters)
+    except Exception as e:
+        logger.error(f"Ошибка поиска '{command.args}': {e}")
+        await message.answer("❌ Ошибка поиска. Попробуйте позже.", parse_mode="HTML")
+        return
+
+    await message.answer(format_search_summary(total, len(cars)), parse_mode="HTML")
+    for car_data in cars:
+        await message.answer(format_car_short(car_data), parse_mode="HTML")
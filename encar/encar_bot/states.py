@@ -4,3 +4,4 @@ from aiogram.fsm.state import State, StatesGroup
 class ParserStates(StatesGroup):
     """Состояния FSM для парсера"""
     waiting_for_link = State()
+    waiting_for_batch = State()
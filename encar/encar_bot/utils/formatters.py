@@ -53,6 +53,42 @@ def format_car_info(data: dict) -> str:
     return message
 
 
+def format_car_short(data: dict) -> str:
+    """
+    Краткая строка об автомобиле для пакетного режима
+    """
+    title = f"{data.get('brand', '')} {data.get('model', '')}".strip()
+    message = f"🚗 <b>{title or 'Автомобиль'}</b>"
+
+    if data.get("year"):
+        message += f" ({data['year']})"
+    if data.get("price"):
+        message += f" — {data['price']} ₩"
+    if data.get("mileage"):
+        message += f", {data['mileage']} км"
+
+    message += f"\n🆔 <code>{data.get('id', '')}</code>"
+    return message
+
+
+def format_batch_summary(total: int, successful: int, failed_ids: list) -> str:
+    """
+    Итоговое сообщение пакетной обработки
+    """
+    message = (
+        "📦 <b>Пакетная обработка завершена</b>\n\n"
+        f"Всего: {total}\n"
+        f"✅ Успешно: {successful}\n"
+        f"❌ Ошибок: {len(failed_ids)}\n"
+    )
+
+    if failed_ids:
+        message += "\nНе удалось получить:\n"
+        message += "\n".join(f"• <code>{car_id}</code>" for car_id in failed_ids)
+
+    return message
+
+
 def format_car_images(data: dict) -> list:
     """
     Возвращает список URL изображений для отправки
@@ -60,6 +96,22 @@ def format_car_images(data: dict) -> list:
     return data.get("images", [])[:10]  # Максимум 10 фото
 
 
+def format_car_options(options: dict) -> str:
+    """
+    Форматирует список опций автомобиля
+    """
+    active_options = [name for name, enabled in options.items() if enabled]
+
+    if not active_options:
+        return "📋 <b>Опции</b>\n\nОпции не найдены."
+
+    message = f"📋 <b>Опции ({len(active_options)})</b>\n\n"
+    for name in active_options:
+        message += f"✅ {name.replace('_', ' ')}\n"
+
+    return message
+
+
 def get_welcome_message() -> str:
     """Возвращает приветственное сообщение"""
     return (
@@ -85,5 +137,33 @@ def get_help_message() -> str:
         "<b>Команды:</b>\n"
         "/start - Начать работу\n"
         "/help - Помощь\n"
+        "/batch - Пакетная обработка (несколько ссылок или файл .txt/.csv)\n"
+        "/search - Поиск по ранее собранным автомобилям\n"
         "/cancel - Отменить текущую операцию"
     )
+
+
+def format_search_summary(total: int, shown: int) -> str:
+    """
+    Итог поиска по индексу
+    """
+    if not total:
+        return "🔍 Ничего не найдено."
+    if shown < total:
+        return f"🔍 Найдено: <b>{total}</b>, показаны первые {shown}"
+    return f"🔍 Найдено: <b>{total}</b>"
+
+
+def get_search_help() -> str:
+    """Справка по команде /search"""
+    return (
+        "🔍 <b>Поиск по собранным автомобилям</b>\n\n"
+        "<code>/search brand=kia year=2019- price=-3000 option=sunroof</code>\n\n"
+        "<b>Фильтры:</b>\n"
+        "• brand, model, fuel - марка, модель, топливо\n"
+        "• year, price, mileage - диапазон: <code>a-b</code>, <code>a-</code>, "
+        "<code>-b</code> (цена в 만원)\n"
+        "• option - обязательная опция (можно несколько)\n"
+        "• order - price, -price, year, -year, mileage, new\n"
+        "• остальные слова - поиск по названию"
+    )
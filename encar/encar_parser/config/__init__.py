@@ -3,8 +3,20 @@ Configuration module for Encar Parser
 Содержит все настройки и конфигурации парсера
 """
 
-from .catalog_settings import BRANDS, CATALOG_CONFIG, build_catalog_url
-from .field_mappings import CAR_DATA, CAR_OPTIONS, FIELD_MAPPING, FIELDS_TRANSLATE
+from .catalog_settings import (
+    BRANDS,
+    CATALOG_CONFIG,
+    CatalogQuery,
+    build_catalog_url,
+    parse_catalog_url,
+)
+from .field_mappings import (
+    CAR_DATA,
+    CAR_OPTIONS,
+    FIELD_MAPPING,
+    FIELDS_TRANSLATE,
+    PARSE_FIELDS,
+)
 from .selectors import CAR_LINK_SELECTORS, EXTRA_BUTTON_SELECTORS
 from .settings import SETTINGS
 
@@ -16,7 +28,10 @@ __all__ = [
     "CAR_OPTIONS",
     "FIELD_MAPPING",
     "FIELDS_TRANSLATE",
+    "PARSE_FIELDS",
     "BRANDS",
     "CATALOG_CONFIG",
+    "CatalogQuery",
     "build_catalog_url",
+    "parse_catalog_url",
 ]
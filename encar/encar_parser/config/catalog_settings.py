@@ -3,6 +3,11 @@ Catalog settings for Encar Parser
 Настройки каталогов для парсера
 """
 
+import json
+from dataclasses import dataclass, field, fields
+from typing import List, Optional
+from urllib.parse import parse_qs, quote, unquote, urlencode, urlsplit
+
 # ============================================================
 # НАСТРОЙКИ МАРОК АВТОМОБИЛЕЙ
 # ============================================================
@@ -55,20 +60,315 @@ CATALOG_CONFIG = {
     "headless": True,
     # Использовать профиль Chrome (для обхода капчи)
     "use_profile": True,
-    # Лимит автомобилей на странице
+    # Лимит автомобилей на странице (в браузере и при ошибке подбора размера)
     "items_per_page": 50,
+    # Подбор размера страницы для поискового API по каждой марке:
+    # пробуются размеры по убыванию, берется наибольший принятый
+    "auto_page_size": True,
+    "page_size_candidates": [1000, 500, 200, 100],
     # Тип сортировки
     "sort_by": "ModifiedDate",
     # Тип продажи
     "sell_type": "일반",
     # Тип автомобиля
     "car_type": "N",
+    # Фильтры поиска на стороне сайта (поля CatalogQuery), например:
+    # {"year_from": 2020, "price_to": 3000, "fuel": ["diesel"], "region": ["seoul"]}
+    "filters": {},
+    # Количество автомобилей и первая страница через поисковый API
+    # (без загрузки страницы в браузере; при ошибке - через браузер)
+    "use_search_api": True,
+    # Время жизни кэша количества автомобилей по марке/фильтру (секунды)
+    "count_cache_ttl": 600,
+    # Обход только изменений (при сортировке ModifiedDate): страницы
+    # листаются до автомобилей старше отметки прошлого запуска
+    "delta": False,
+    # Файл отметок (самый новый ModifiedDate по маркам)
+    "delta_state_file": "output/delta_state.json",
+    # Параллельный парсинг: дополнительные браузеры разбирают автомобили,
+    # пока основной обходит страницы каталога (0 = последовательно)
+    "detail_workers": 0,
+    # Размер очереди ID между обходом каталога и парсингом автомобилей
+    "pipeline_queue_size": 100,
+}
+
+# ============================================================
+# НАСТРОЙКИ ОБХОДА НЕСКОЛЬКИХ МАРОК (см. core/orchestrator.py)
+# ============================================================
+
+ORCHESTRATOR_CONFIG = {
+    # Марки для обхода ([] = все из BRANDS)
+    "brands": [],
+    # Порядок: "size" - сначала марки с большим числом автомобилей,
+    # "priority" - по priorities (марки без приоритета - в конце, по размеру)
+    "order": "size",
+    # Приоритеты марок (больше = раньше)
+    "priorities": {},
+    # Количество браузеров в общем пуле
+    "workers": 2,
+    # Максимум автомобилей на марку (0 = без ограничения)
+    "max_cars_per_brand": 0,
+    # Максимум страниц каталога на марку (0 = все страницы)
+    "max_pages": 0,
+    # Директория для результатов по маркам и общего файла
+    "output_dir": "output/brands",
+    # Файл состояния для продолжения прерванного обхода
+    "state_file": "output/brands/crawl_state.json",
+}
+
+# ============================================================
+# НАСТРОЙКИ ОБХОДА ЧАСТЯМИ (см. core/sharding.py)
+# ============================================================
+
+SHARD_CONFIG = {
+    # Директория частичных результатов (<output_dir>/<марка>/shard_<i>of<n>.jsonl)
+    # и объединенных файлов
+    "output_dir": "output/shards",
 }
 
 # ============================================================
 # ШАБЛОН URL КАТАЛОГА
 # ============================================================
 
+# Страница каталога (состояние поиска - в JSON после #!)
+CATALOG_URL = "https://www.encar.com/fc/fc_carsearchlist.do?carType=for"
+
+# Поисковый API, который использует страница каталога
+SEARCH_API_URL = "https://api.encar.com/search/car/list/general"
+
+
+# Топливо: ключ -> значение FuelType в запросе
+FUEL_TYPES = {
+    "gasoline": "가솔린",
+    "diesel": "디젤",
+    "lpg": "LPG",
+    "hybrid": "가솔린+전기",
+    "electric": "전기",
+    "hydrogen": "수소",
+}
+
+# Регион продавца: ключ -> значение OfficeCityState в запросе
+REGIONS = {
+    "seoul": "서울",
+    "gyeonggi": "경기",
+    "incheon": "인천",
+    "busan": "부산",
+    "daegu": "대구",
+    "daejeon": "대전",
+    "gwangju": "광주",
+    "ulsan": "울산",
+    "sejong": "세종",
+    "gangwon": "강원",
+    "chungbuk": "충북",
+    "chungnam": "충남",
+    "jeonbuk": "전북",
+    "jeonnam": "전남",
+    "gyeongbuk": "경북",
+    "gyeongnam": "경남",
+    "jeju": "제주",
+}
+
+
+@dataclass
+class CatalogQuery:
+    """
+    Поисковый запрос каталога (DSL Encar: (And.Hidden.N._.(C.CarType...)...)).
+    Фильтры применяются на стороне сайта - обходятся только подходящие автомобили.
+
+    Пример: CatalogQuery("hyundai", year_from=2020, price_to=3000, fuel=["diesel"])
+    """
+
+    # Ключ марки из BRANDS (или корейское название)
+    brand: str = ""
+    # Модельный ряд (корейское название, например "쏘나타")
+    model: str = ""
+    # None = из CATALOG_CONFIG
+    car_type: Optional[str] = None
+    sell_type: Optional[str] = None
+    # Год выпуска (включительно)
+    year_from: Optional[int] = None
+    year_to: Optional[int] = None
+    # Цена в 만원 (10 000 вон)
+    price_from: Optional[int] = None
+    price_to: Optional[int] = None
+    # Пробег (км)
+    mileage_from: Optional[int] = None
+    mileage_to: Optional[int] = None
+    # Ключи FUEL_TYPES / REGIONS или значения на корейском (несколько = "или")
+    fuel: List[str] = field(default_factory=list)
+    region: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_settings(cls, brand_key=None, **kwargs):
+        """
+        Запрос по CATALOG_CONFIG (включая "filters") с переопределением
+
+        Args:
+            brand_key: Ключ марки (None = default_brand)
+            **kwargs: Поля запроса; прочие параметры (sort_by и т.д.) игнорируются
+
+        Returns:
+            CatalogQuery: Запрос
+        """
+        names = {query_field.name for query_field in fields(cls)}
+        values = {**CATALOG_CONFIG.get("filters", {}), **kwargs}
+        values = {name: value for name, value in values.items() if name in names}
+        values["brand"] = brand_key or values.get("brand") or CATALOG_CONFIG["default_brand"]
+        return cls(**values)
+
+    @property
+    def manufacturer(self):
+        """Марка на корейском для запроса"""
+        brand = self.brand or CATALOG_CONFIG["default_brand"]
+        if brand.lower() in BRANDS:
+            return BRANDS[brand.lower()]
+        if brand in BRANDS.values():
+            return brand
+        raise ValueError(f"Марка '{brand}' не найдена в списке BRANDS")
+
+    def to_query(self):
+        """
+        Строка запроса (значение action/q)
+
+        Returns:
+            str: Запрос вида (And.Hidden.N._.(C.CarType.N._.Manufacturer.<марка>.)_.SellType.<тип>.)
+        """
+        car_type = self.car_type or CATALOG_CONFIG["car_type"]
+        sell_type = self.sell_type or CATALOG_CONFIG["sell_type"]
+
+        maker = f"Manufacturer.{self.manufacturer}."
+        if self.model:
+            maker = f"(C.{maker}_.ModelGroup.{self.model}.)"
+
+        clauses = [
+            "Hidden.N.",
+            f"(C.CarType.{car_type}._.{maker})",
+            f"SellType.{sell_type}.",
+        ]
+
+        if self.year_from or self.year_to:
+            clauses.append(
+                "Year."
+                + _range(
+                    self.year_from and self.year_from * 100,
+                    self.year_to and self.year_to * 100 + 99,
+                )
+            )
+        if self.price_from is not None or self.price_to is not None:
+            clauses.append("Price." + _range(self.price_from, self.price_to))
+        if self.mileage_from is not None or self.mileage_to is not None:
+            clauses.append("Mileage." + _range(self.mileage_from, self.mileage_to))
+
+        clauses.extend(_any_of("FuelType", self.fuel, FUEL_TYPES))
+        clauses.extend(_any_of("OfficeCityState", self.region, REGIONS))
+
+        return "(And." + "_.".join(clauses) + ")"
+
+    @classmethod
+    def from_query(cls, query):
+        """
+        Разбор строки запроса (обратное к to_query)
+
+        Args:
+            query: Строка запроса
+
+        Returns:
+            CatalogQuery: Запрос (неизвестные условия пропускаются)
+
+        Raises:
+            ValueError: Если строка не является запросом
+        """
+        clauses = {}
+        for name, value in _parse_clauses(query):
+            clauses.setdefault(name, []).append(value)
+
+        def first(name):
+            return clauses.get(name, [None])[0]
+
+        def bounds(name):
+            value = first(name)
+            if value is None:
+                return None, None
+            low, _, high = value[len("range(") : -1].partition("..")
+            return (int(low) if low else None), (int(high) if high else None)
+
+        brand_keys = {korean: key for key, korean in BRANDS.items()}
+        fuel_keys = {korean: key for key, korean in FUEL_TYPES.items()}
+        region_keys = {korean: key for key, korean in REGIONS.items()}
+
+        year_from, year_to = bounds("Year")
+        price_from, price_to = bounds("Price")
+        mileage_from, mileage_to = bounds("Mileage")
+        manufacturer = first("Manufacturer") or ""
+
+        return cls(
+            brand=brand_keys.get(manufacturer, manufacturer),
+            model=first("ModelGroup") or "",
+            car_type=first("CarType"),
+            sell_type=first("SellType"),
+            year_from=year_from and year_from // 100,
+            year_to=year_to and year_to // 100,
+            price_from=price_from,
+            price_to=price_to,
+            mileage_from=mileage_from,
+            mileage_to=mileage_to,
+            fuel=[fuel_keys.get(fuel, fuel) for fuel in clauses.get("FuelType", [])],
+            region=[region_keys.get(region, region) for region in clauses.get("OfficeCityState", [])],
+        )
+
+
+def _range(low, high):
+    """Условие-диапазон: range(low..high). (пустая граница = без ограничения)"""
+    low = "" if low is None else low
+    high = "" if high is None else high
+    return f"range({low}..{high})."
+
+
+def _any_of(name, values, mapping):
+    """Условие "одно из значений": Name.v. или (Or.Name.v1._.Name.v2.)"""
+    values = [mapping.get(value, value) for value in values]
+    if len(values) == 1:
+        return [f"{name}.{values[0]}."]
+    if values:
+        return ["(Or." + "_.".join(f"{name}.{value}." for value in values) + ")"]
+    return []
+
+
+def _parse_clauses(query):
+    """
+    Все условия запроса (включая вложенные группы C./Or.)
+
+    Returns:
+        list: [(имя, значение), ...] в порядке запроса
+    """
+    query = query.strip()
+    if not (query.startswith("(") and query.endswith(")")):
+        raise ValueError(f"Некорректный запрос каталога: {query}")
+
+    clauses = []
+    # Содержимое группы без скобок и оператора (And./C./Or.)
+    body = query[1:-1].partition(".")[2]
+
+    depth = 0
+    item_start = 0
+    for i, char in enumerate(body + "_."):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif depth == 0 and body[i : i + 2] in ("_.", "") and i >= item_start:
+            item = body[item_start:i]
+            item_start = i + 2
+            if not item:
+                continue
+            if item.startswith("(") and not item.startswith("range("):
+                clauses.extend(_parse_clauses(item))
+            else:
+                name, _, value = item.partition(".")
+                clauses.append((name, value[:-1] if value.endswith(".") else value))
+
+    return clauses
+
 
 def build_catalog_url(brand_key=None, page=1, **kwargs):
     """
@@ -77,39 +377,112 @@ def build_catalog_url(brand_key=None, page=1, **kwargs):
     Args:
         brand_key: Ключ марки из BRANDS (например, 'peugeot')
         page: Номер страницы
-        **kwargs: Дополнительные параметры (sort_by, items_per_page и т.д.)
+        **kwargs: Дополнительные параметры (sort_by, items_per_page, поля
+            CatalogQuery) или query - готовый CatalogQuery
 
     Returns:
         str: Готовый URL для каталога
     """
-    # Получаем марку
-    if brand_key is None:
-        brand_key = CATALOG_CONFIG["default_brand"]
-
-    brand_korean = BRANDS.get(brand_key.lower())
-    if not brand_korean:
-        raise ValueError(f"Марка '{brand_key}' не найдена в списке BRANDS")
+    query = kwargs.get("query") or CatalogQuery.from_settings(brand_key, **kwargs)
 
     # Параметры из конфига или переданные
     sort_by = kwargs.get("sort_by", CATALOG_CONFIG["sort_by"])
     items_per_page = kwargs.get("items_per_page", CATALOG_CONFIG["items_per_page"])
-    sell_type = kwargs.get("sell_type", CATALOG_CONFIG["sell_type"])
-    car_type = kwargs.get("car_type", CATALOG_CONFIG["car_type"])
 
+    state = {
+        "action": query.to_query(),
+        "toggle": {},
+        "layer": "",
+        "sort": sort_by,
+        "page": page,
+        "limit": items_per_page,
+        "searchKey": "",
+        "loginCheck": False,
+    }
     # Формируем URL
-    url = (
-        f"https://www.encar.com/fc/fc_carsearchlist.do?carType=for#!%7B%22action%22%3A%22(And.Hidden.N._.("
-        f"C.CarType.{car_type}._."
-        f"Manufacturer.{brand_korean}.)"
-        f"_.SellType.{sell_type}.)"
-        f"%22%2C%22toggle%22%3A%7B%7D%2C%22layer%22%3A%22%22%2C%22"
-        f"sort%22%3A%22{sort_by}%22%2C%22"
-        f"page%22%3A{page}%2C%22"
-        f"limit%22%3A{items_per_page}%2C%22"
-        f"searchKey%22%3A%22%22%2C%22loginCheck%22%3Afalse%7D"
+    return CATALOG_URL + "#!" + quote(json.dumps(state, separators=(",", ":"), ensure_ascii=False), safe="")
+
+
+def build_search_query(brand_key=None, **kwargs):
+    """
+    Поисковый запрос каталога (значение action/q)
+
+    Args:
+        brand_key: Ключ марки из BRANDS
+        **kwargs: Поля CatalogQuery (sell_type, car_type, year_from, ...)
+            или query - готовый CatalogQuery
+
+    Returns:
+        str: Запрос вида (And.Hidden.N._.(C.CarType.N._.Manufacturer.<марка>.)_.SellType.<тип>.)
+    """
+    query = kwargs.get("query") or CatalogQuery.from_settings(brand_key, **kwargs)
+    return query.to_query()
+
+
+def build_search_api_url(brand_key=None, page=1, **kwargs):
+    """
+    URL поискового API каталога (JSON: Count и SearchResults)
+
+    Args:
+        brand_key: Ключ марки из BRANDS
+        page: Номер страницы
+        **kwargs: Дополнительные параметры (sort_by, items_per_page, поля
+            CatalogQuery или query)
+
+    Returns:
+        str: URL запроса к API
+    """
+    sort_by = kwargs.get("sort_by", CATALOG_CONFIG["sort_by"])
+    items_per_page = kwargs.get("items_per_page", CATALOG_CONFIG["items_per_page"])
+    offset = (page - 1) * items_per_page
+
+    params = urlencode(
+        {
+            "count": "true",
+            "q": build_search_query(brand_key, **kwargs),
+            "sr": f"|{sort_by}|{offset}|{items_per_page}",
+        }
     )
+    return f"{SEARCH_API_URL}?{params}"
+
 
-    return url
+def parse_catalog_url(url):
+    """
+    Разбор URL каталога или поискового API (для проверки и повторного
+    использования ссылок, скопированных с сайта)
+
+    Args:
+        url: URL страницы каталога (fc_carsearchlist.do#!{...}) или API (?q=...&sr=...)
+
+    Returns:
+        dict: {"query": CatalogQuery, "page", "sort_by", "items_per_page"}
+
+    Raises:
+        ValueError: Если URL не содержит запроса каталога
+    """
+    parts = urlsplit(url)
+
+    if parts.fragment.startswith("!"):
+        state = json.loads(unquote(parts.fragment[1:]))
+        return {
+            "query": CatalogQuery.from_query(state["action"]),
+            "page": int(state.get("page", 1)),
+            "sort_by": state.get("sort", CATALOG_CONFIG["sort_by"]),
+            "items_per_page": int(state.get("limit", CATALOG_CONFIG["items_per_page"])),
+        }
+
+    params = parse_qs(parts.query)
+    if "q" not in params:
+        raise ValueError(f"URL не содержит запроса каталога: {url}")
+
+    _, sort_by, offset, limit = (params.get("sr", ["|||"])[0].split("|") + ["", "", ""])[:4]
+    items_per_page = int(limit) if limit else CATALOG_CONFIG["items_per_page"]
+    return {
+        "query": CatalogQuery.from_query(params["q"][0]),
+        "page": int(offset) // items_per_page + 1 if offset else 1,
+        "sort_by": sort_by or CATALOG_CONFIG["sort_by"],
+        "items_per_page": items_per_page,
+    }
 
 
 # ============================================================
@@ -129,6 +502,12 @@ if __name__ == "__main__":
     url3 = build_catalog_url("hyundai")
     print("\nHyundai URL:", url3)
 
+    # Пример 3a: Hyundai 2020+, до 3000 만원, дизель - фильтры на стороне сайта
+    query = CatalogQuery("hyundai", year_from=2020, price_to=3000, fuel=["diesel"])
+    url3a = build_catalog_url(query=query)
+    print("\nHyundai (фильтры) URL:", url3a)
+    print("Разбор:", parse_catalog_url(url3a)["query"])
+
     # Пример 4: Список всех доступных марок
     print("\nДоступные марки:")
     for key in sorted(BRANDS.keys()):
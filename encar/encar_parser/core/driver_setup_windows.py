@@ -3,10 +3,14 @@ WebDriver setup and configuration with anti-captcha measures
 Настройка WebDriver с мерами против капчи
 """
 
+import logging
+
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.wait import WebDriverWait
 
+logger = logging.getLogger(__name__)
+
 
 def setup_chrome_driver(headless=True, window_size="1920,1080"):
     """
@@ -97,11 +101,11 @@ def setup_chrome_driver(headless=True, window_size="1920,1080"):
         )
 
         wait = WebDriverWait(driver, 15)
-        print("Chrome WebDriver инициализирован (anti-captcha режим)")
+        logger.info("Chrome WebDriver инициализирован (anti-captcha режим)")
         return driver, wait
 
     except Exception as e:
-        print(f"Ошибка инициализации WebDriver: {e}")
+        logger.error("Ошибка инициализации WebDriver: %s", e)
         raise
 
 
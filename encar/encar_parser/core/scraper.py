@@ -1,6 +1,7 @@
 """
 Low-level scraping methods for interacting with web pages
 """
+import logging
 import random
 import time
 from datetime import datetime
@@ -11,6 +12,8 @@ from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 
+logger = logging.getLogger(__name__)
+
 
 class Scraper:
     """
@@ -18,16 +21,18 @@ class Scraper:
     Предоставляет удобные методы для работы со страницами
     """
     
-    def __init__(self, driver, wait):
+    def __init__(self, driver, wait, artifacts=None):
         """
         Инициализация Scraper
         
         Args:
             driver: Экземпляр Selenium WebDriver
             wait: Экземпляр WebDriverWait
+            artifacts: DebugArtifactManager для отладочных файлов (опционально)
         """
         self.driver = driver
         self.wait = wait
+        self.artifacts = artifacts
     
     def scroll_page(self, max_scrolls=10, pause=2):
         """
@@ -38,7 +43,7 @@ class Scraper:
             max_scrolls: Максимальное количество прокруток
             pause: Базовая пауза между прокрутками (секунды)
         """
-        print(f"Прокручиваем страницу (макс. {max_scrolls} раз)...")
+        logger.debug("Прокручиваем страницу (макс. %s раз)...", max_scrolls)
         
         for i in range(max_scrolls):
             # Случайная высота прокрутки для имитации человека
@@ -48,7 +53,7 @@ class Scraper:
             # Случайная пауза
             actual_pause = pause + random.uniform(-0.5, 1.5)
             time.sleep(max(actual_pause, 0.5))
-            print(f"   Прокрутка {i + 1}/{max_scrolls}")
+            logger.debug("Прокрутка %s/%s", i + 1, max_scrolls)
     
     def get_text_by_selector(self, selector, index=0, parent=None):
         """
@@ -104,7 +109,7 @@ class Scraper:
             return True
             
         except Exception as e:
-            print(f"Ошибка клика по {selector}: {e}")
+            logger.warning("Ошибка клика по %s: %s", selector, e)
             return False
     
     def wait_for_element(self, selector, timeout=None, condition="presence"):
@@ -133,10 +138,10 @@ class Scraper:
             return element
             
         except TimeoutException:
-            print(f"Таймаут ожидания элемента: {selector}")
+            logger.warning("Таймаут ожидания элемента: %s", selector)
             return None
         except Exception as e:
-            print(f"Ошибка ожидания элемента {selector}: {e}")
+            logger.warning("Ошибка ожидания элемента %s: %s", selector, e)
             return None
     
     def find_elements(self, selector, parent=None):
@@ -156,7 +161,7 @@ class Scraper:
             else:
                 return self.driver.find_elements(By.CSS_SELECTOR, selector)
         except Exception as e:
-            print(f"Ошибка поиска элементов {selector}: {e}")
+            logger.warning("Ошибка поиска элементов %s: %s", selector, e)
             return []
     
     def open_url(self, url, wait_time=3):
@@ -234,7 +239,7 @@ class Scraper:
         try:
             return self.driver.execute_script(script, *args)
         except Exception as e:
-            print(f"Ошибка выполнения скрипта: {e}")
+            logger.warning("Ошибка выполнения скрипта: %s", e)
             return None
     
     def get_current_url(self):
@@ -285,11 +290,11 @@ class Scraper:
             with open(filepath, 'w', encoding='utf-8') as f:
                 f.write(page_source)
             
-            print(f"HTML сохранен: {filepath}")
+            logger.info("HTML сохранен: %s", filepath)
             return str(filepath)
         
         except Exception as e:
-            print(f"Ошибка сохранения HTML: {e}")
+            logger.error("Ошибка сохранения HTML: %s", e)
             return None
     
     def save_screenshot(self, filename=None, output_dir="debug"):
@@ -316,23 +321,33 @@ class Scraper:
         try:
             # Делаем скриншот
             self.driver.save_screenshot(str(filepath))
-            print(f"Скриншот сохранен: {filepath}")
+            logger.info("Скриншот сохранен: %s", filepath)
             return str(filepath)
         
         except Exception as e:
-            print(f"Ошибка сохранения скриншота: {e}")
+            logger.error("Ошибка сохранения скриншота: %s", e)
             return None
     
-    def save_page_debug_info(self, prefix="debug"):
+    def save_page_debug_info(self, prefix="debug", car_id=None):
         """
         Сохранение полной отладочной информации (HTML + скриншот)
         
+        Если задан DebugArtifactManager, сохранение идет через него
+        (выборка, квоты, фоновая запись).
+        
         Args:
-            prefix: Префикс для имен файлов
+            prefix: Префикс для имен файлов (причина сохранения)
+            car_id: ID автомобиля (опционально)
             
         Returns:
-            dict: Пути к сохраненным файлам
+            dict или None: Пути к файлам (None, если сохранение пропущено)
         """
+        if self.artifacts is not None:
+            return self.artifacts.save(self.driver, prefix, car_id)
+
+        if car_id:
+            prefix = f"{prefix}_{car_id}"
+
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
         html_file = self.save_page_source(
@@ -354,9 +369,9 @@ class Scraper:
                 f.write(f"HTML file: {html_file}\n")
                 f.write(f"Screenshot: {screenshot_file}\n")
             
-            print(f"Отладочная информация сохранена в директории debug/")
+            logger.debug("Отладочная информация сохранена в директории debug/")
         except Exception as e:
-            print(f"Ошибка сохранения info файла: {e}")
+            logger.error("Ошибка сохранения info файла: %s", e)
             info_file = None
         
         return {
@@ -0,0 +1,253 @@
+"""
+Sharded catalog crawl
+Обход каталога марки частями (диапазонами страниц) в разных процессах
+или на разных машинах и объединение результатов
+"""
+
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+
+from encar_parser.config.catalog_settings import CATALOG_CONFIG, SHARD_CONFIG
+# План и объединение частей не требуют браузера (utils/shards.py),
+# здесь они реэкспортируются для core и main_linux
+from encar_parser.utils.shards import merge_shards, parse_shard_spec, plan_shards  # noqa: F401
+
+from .orchestrator import BRAND_DONE, BRAND_FAILED, BRAND_RUNNING, CrawlState
+from .parser import EncarParser
+
+logger = logging.getLogger(__name__)
+
+# Файл плана частей в директории марки (общий для всех частей)
+PLAN_FILENAME = "plan.json"
+
+
+def shard_dir(brand_key, output_dir=None):
+    """Директория частей марки (SHARD_CONFIG["output_dir"]/<марка>)"""
+    return Path(output_dir or Path(SHARD_CONFIG["output_dir"]) / brand_key)
+
+
+def load_shard_plan(brand_key, output_dir=None):
+    """
+    План частей марки, сохраненный write_shard_plan
+
+    Returns:
+        dict или None: План или None, если он не создан
+    """
+    path = shard_dir(brand_key, output_dir) / PLAN_FILENAME
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def write_shard_plan(
+    brand_key, shards, start_page=None, pages=None, headless=True, output_dir=None
+):
+    """
+    Расчет плана частей один раз для всех процессов/машин (--plan).
+    Без pages количество страниц берется из каталога - все части затем
+    читают один и тот же план, а не считают страницы каждая в свое время.
+
+    Args:
+        brand_key: Ключ марки
+        shards: Всего частей
+        start_page: Первая страница всего обхода (None = из конфига)
+        pages: Страниц во всем обходе (None = весь каталог)
+        headless: Запуск браузера в headless режиме (для подсчета страниц)
+        output_dir: Директория частей марки (None = SHARD_CONFIG["output_dir"]/<марка>)
+
+    Returns:
+        dict: {"brand", "shards", "start_page", "pages", "open_end", "plan", "created"}
+    """
+    start_page = start_page or CATALOG_CONFIG["start_page"]
+    open_end = pages is None
+
+    if pages is None:
+        parser = EncarParser(headless=headless, enable_translation=False)
+        try:
+            pages, _ = parser.get_catalog_params(brand_key, start_page=start_page, max_pages=0)
+        finally:
+            parser.close()
+
+    plan = {
+        "brand": brand_key,
+        "shards": shards,
+        "start_page": start_page,
+        "pages": pages,
+        # Каталог мог вырасти после подсчета - последняя часть забирает остаток
+        "open_end": open_end,
+        "plan": plan_shards(start_page, pages, shards),
+        "created": datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
+    }
+
+    path = shard_dir(brand_key, output_dir) / PLAN_FILENAME
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(plan, ensure_ascii=False, indent=2), encoding="utf-8")
+    logger.info("План частей %s: %s страниц, %s частей -> %s", brand_key, pages, shards, path)
+    return plan
+
+
+class ShardCrawler:
+    """
+    Обход одной части каталога марки собственным браузером:
+    - страницы части определяются общим планом: сохраненным write_shard_plan
+      (--plan) или рассчитанным из явного количества страниц (--pages)
+    - результаты дописываются в частичный JSONL-файл части
+    - состояние (ссылки, обработанные URL) сохраняется для продолжения
+      после остановки
+
+    Каталог во время обхода сдвигается, поэтому автомобиль может попасть
+    в соседние части - повторы удаляются при объединении (merge_shards).
+    """
+
+    def __init__(
+        self,
+        brand_key,
+        shard,
+        shards,
+        start_page=None,
+        pages=None,
+        headless=True,
+        output_dir=None,
+    ):
+        """
+        Args:
+            brand_key: Ключ марки
+            shard: Номер части (с 1)
+            shards: Всего частей
+            start_page: Первая страница всего обхода (None = из конфига)
+            pages: Страниц во всем обходе (None = из плана write_shard_plan)
+            headless: Запуск браузера в headless режиме
+            output_dir: Директория частей (None = SHARD_CONFIG["output_dir"]/<марка>)
+        """
+        self.brand_key = brand_key
+        self.shard = shard
+        self.shards = shards
+        self.start_page = start_page
+        self.pages = pages
+        self.headless = headless
+
+        self.name = f"shard_{shard}of{shards}"
+        self.output_dir = shard_dir(brand_key, output_dir)
+        self.results_path = self.output_dir / f"{self.name}.jsonl"
+        self.state = CrawlState(self.output_dir / f"{self.name}.state.json")
+
+    def _page_range(self):
+        """
+        Страницы этой части по общему плану
+
+        Returns:
+            tuple: (первая страница или None, количество страниц; 0 = до конца каталога)
+
+        Raises:
+            ValueError: Нет ни --pages, ни плана, или план рассчитан для
+                другого разбиения
+        """
+        if self.pages is not None:
+            start_page = self.start_page or CATALOG_CONFIG["start_page"]
+            plan = {
+                "shards": self.shards,
+                "start_page": start_page,
+                "open_end": False,
+                "plan": plan_shards(start_page, self.pages, self.shards),
+            }
+        else:
+            plan = load_shard_plan(self.brand_key, self.output_dir)
+            if plan is None:
+                raise ValueError(
+                    f"Нет плана частей для {self.brand_key}: "
+                    "сначала запустите --plan или задайте --pages"
+                )
+
+        if plan["shards"] != self.shards or (
+            self.start_page and plan["start_page"] != self.start_page
+        ):
+            raise ValueError(
+                f"План частей рассчитан для {plan['shards']} частей "
+                f"со страницы {plan['start_page']} - пересоздайте его (--plan)"
+            )
+
+        if self.shard > len(plan["plan"]):
+            return None, 0
+
+        first_page, count = plan["plan"][self.shard - 1]
+        if plan["open_end"] and self.shard == len(plan["plan"]):
+            count = 0
+        return first_page, count
+
+    def run(self):
+        """
+        Запуск обхода части
+
+        Returns:
+            dict: Состояние части ({"status", "pages", "links", "done", ...})
+        """
+        state = self.state.get(self.name)
+        if state["status"] == BRAND_DONE:
+            logger.info("Часть %s уже завершена", self.name)
+            return state
+
+        # План проверяется до запуска браузера (ошибка - сразу)
+        page_range = None if state["links"] else self._page_range()
+
+        parser = EncarParser(
+            headless=self.headless,
+            enable_translation=True,
+            preset_brand=self.brand_key.capitalize(),
+        )
+
+        try:
+            self.state.update(self.name, status=BRAND_RUNNING, brand=self.brand_key)
+
+            links = state["links"]
+            if not links:
+                first_page, count = page_range
+                if first_page is None:
+                    logger.warning("Для части %s нет страниц", self.name)
+                    self.state.update(self.name, status=BRAND_DONE, pages=None)
+                    return self.state.get(self.name)
+
+                # max_pages=None означал бы значение из конфига - 0 = до конца
+                links = parser.get_car_links(
+                    self.brand_key, start_page=first_page, max_pages=count
+                )
+                if not links:
+                    # Ошибка сети или капча на странице каталога
+                    raise RuntimeError("Не удалось получить ссылки каталога")
+                self.state.update(self.name, links=links, pages=[first_page, count])
+
+            done = set(state["done"])
+            pending = [car_url for car_url in links if car_url not in done]
+            logger.info(
+                "Часть %s (%s): автомобилей %s, осталось %s",
+                self.name,
+                self.brand_key,
+                len(links),
+                len(pending),
+            )
+
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.results_path, "a", encoding="utf-8") as results_file:
+
+                def on_result(car_url, car_data):
+                    self.state.record_result(self.name, car_url, car_data, results_file)
+
+                parser.parse_links(pending, on_result=on_result)
+                parser.retry_quarantined(set(pending), on_result=on_result)
+
+            # Неудачные автомобили повторяются при следующем запуске части
+            failed = len(self.state.get(self.name)["failed"])
+            self.state.update(
+                self.name,
+                status=BRAND_FAILED if failed else BRAND_DONE,
+                output=str(self.results_path),
+                error=f"Не удалось получить автомобилей: {failed}" if failed else None,
+            )
+        except Exception as e:
+            logger.error("Ошибка обхода части %s: %s", self.name, e)
+            self.state.update(self.name, status=BRAND_FAILED, error=str(e))
+        finally:
+            parser.close()
+
+        return self.state.get(self.name)
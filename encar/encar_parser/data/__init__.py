@@ -3,7 +3,15 @@ Data module for Encar Parser
 Содержит данные и модели
 """
 
+from .catalog_index import CatalogIndex
 from .models import CarData, CarOption
+from .price_history import PriceHistoryStore
 from .translation_cache import TRANSLATION_CACHE
 
-__all__ = ["TRANSLATION_CACHE", "CarData", "CarOption"]
+__all__ = [
+    "TRANSLATION_CACHE",
+    "CarData",
+    "CarOption",
+    "PriceHistoryStore",
+    "CatalogIndex",
+]
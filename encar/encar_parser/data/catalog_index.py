@@ -0,0 +1,425 @@
+"""
+Catalog index
+Локальный индекс результатов парсинга (SQLite) для поиска без чтения JSON
+"""
+
+import json
+import logging
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from encar_parser.config.catalog_settings import BRANDS
+from encar_parser.config.settings import INDEX_SETTINGS
+
+logger = logging.getLogger(__name__)
+
+# Опции хранятся битовой маской в одном INTEGER (63 бита без знакового)
+MAX_OPTION_BITS = 63
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    cars INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS options (
+    name TEXT PRIMARY KEY,
+    bit INTEGER NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS cars (
+    car_id INTEGER PRIMARY KEY,
+    brand TEXT,
+    model TEXT,
+    year INTEGER,
+    price INTEGER,
+    mileage INTEGER,
+    fuel TEXT,
+    options INTEGER NOT NULL DEFAULT 0,
+    parsed_at TEXT NOT NULL,
+    source TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS cars_brand_model ON cars (brand, model);
+CREATE INDEX IF NOT EXISTS cars_year ON cars (year);
+CREATE INDEX IF NOT EXISTS cars_price ON cars (price);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS cars_fts USING fts5 (
+    brand, model, configuration, fuel, color, region
+);
+"""
+
+# Порядок выдачи search()
+SEARCH_ORDER = {
+    "price": "price",
+    "-price": "price DESC",
+    "year": "year",
+    "-year": "year DESC",
+    "mileage": "mileage",
+    "new": "parsed_at DESC",
+}
+
+
+def _to_int(value):
+    """Число из строки ("12,345" -> 12345; None, если цифр нет)"""
+    digits = re.sub(r"\D", "", str(value or ""))
+    return int(digits) if digits else None
+
+
+def _to_year(value):
+    """Год выпуска из строки вида "19/05(2019년형)" или "2019" """
+    match = re.search(r"(19|20)\d\d", str(value or ""))
+    return int(match.group(0)) if match else None
+
+
+def _to_sortable_time(value):
+    """parsed_at ("%d/%m/%Y %H:%M:%S") в сортируемый вид (ISO)"""
+    try:
+        return datetime.strptime(value or "", "%d/%m/%Y %H:%M:%S").isoformat(sep=" ")
+    except ValueError:
+        return ""
+
+
+def _brand_key(brand):
+    """Ключ марки из BRANDS по названию из данных ("Hyundai", "현대" -> "hyundai")"""
+    brand = (brand or "").strip()
+    if brand.lower() in BRANDS:
+        return brand.lower()
+    for key, korean in BRANDS.items():
+        if brand == korean:
+            return key
+    return brand.lower() or None
+
+
+def _read_cars(path):
+    """
+    Автомобили из файла результатов (.json - список, .jsonl - по строке)
+
+    Returns:
+        list: Записи с ID (файлы состояния и прочие JSON дают пустой список)
+    """
+    with open(path, encoding="utf-8") as data_file:
+        if path.suffix == ".jsonl":
+            records = [json.loads(line) for line in data_file if line.strip()]
+        else:
+            records = json.load(data_file)
+
+    if not isinstance(records, list):
+        return []
+    return [car for car in records if isinstance(car, dict) and _to_int(car.get("id"))]
+
+
+def parse_search_terms(text):
+    """
+    Разбор строки поиска (одинаковый синтаксис для бота и CLI):
+    brand=hyundai model=쏘나타 year=2018-2021 price=-3000 mileage=-80000
+    option=sunroof option=smart_key; остальные слова - полнотекстовый поиск
+
+    Диапазоны: "a-b", "a-" (от), "-b" (до); цена - в 만원 (10 000 вон).
+
+    Returns:
+        dict: Аргументы для CatalogIndex.search
+    """
+    filters = {"options": []}
+    words = []
+
+    for term in (text or "").split():
+        name, sep, value = term.partition("=")
+        name = name.lower()
+        if not sep:
+            words.append(term)
+        elif name in ("year", "price", "mileage"):
+            low, _, high = value.partition("-") if "-" in value else (value, "", value)
+            filters[f"{name}_from"] = _to_int(low)
+            filters[f"{name}_to"] = _to_int(high)
+        elif name in ("option", "options"):
+            filters["options"].extend(filter(None, value.split(",")))
+        elif name in ("brand", "model", "fuel", "order"):
+            filters[name] = value
+        elif name == "limit":
+            filters["limit"] = _to_int(value)
+        else:
+            raise ValueError(f"Неизвестный фильтр: {name}")
+
+    if words:
+        filters["text"] = " ".join(words)
+    return {name: value for name, value in filters.items() if value not in (None, [])}
+
+
+class CatalogIndex:
+    """
+    Индекс результатов парсинга:
+    - файлы output (*.json, *.jsonl) добавляются инкрементально - неизмененные
+      (по mtime и размеру) не читаются повторно
+    - один автомобиль - одна строка (самая свежая по parsed_at)
+    - фильтры по марке, модели, году, цене, пробегу, опциям (битовая маска)
+      и полнотекстовый поиск (FTS5)
+    """
+
+    def __init__(self, db_path=None):
+        """
+        Args:
+            db_path: Путь к базе (по умолчанию INDEX_SETTINGS["db_path"])
+        """
+        self.db_path = Path(db_path or INDEX_SETTINGS["db_path"])
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Одно соединение на процесс (бот обращается из разных потоков)
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(_SCHEMA)
+
+        self.option_bits = {
+            row["name"]: row["bit"] for row in self.connection.execute("SELECT * FROM options")
+        }
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _option_mask(self, options, assign=False):
+        """
+        Битовая маска опций
+
+        Args:
+            options: Названия опций (для записи - dict {название: bool})
+            assign: Назначать биты новым опциям (при записи)
+
+        Returns:
+            int или None: Маска; None - опция неизвестна индексу (при поиске)
+        """
+        if isinstance(options, dict):
+            options = [name for name, value in options.items() if value]
+
+        mask = 0
+        for name in options:
+            bit = self.option_bits.get(name)
+            if bit is None:
+                if not assign:
+                    return None
+                if len(self.option_bits) >= MAX_OPTION_BITS:
+                    logger.warning("Опция %s не помещается в маску индекса", name)
+                    continue
+                bit = len(self.option_bits)
+                self.connection.execute("INSERT INTO options VALUES (?, ?)", (name, bit))
+                self.option_bits[name] = bit
+            mask |= 1 << bit
+        return mask
+
+    def _upsert(self, car_data, source):
+        """Запись автомобиля, если она новее сохраненной"""
+        car_id = _to_int(car_data.get("id"))
+        parsed_at = _to_sortable_time(car_data.get("parsed_at"))
+
+        row = self.connection.execute(
+            "SELECT parsed_at FROM cars WHERE car_id = ?", (car_id,)
+        ).fetchone()
+        if row is not None:
+            if row["parsed_at"] > parsed_at:
+                return False
+            self.connection.execute("DELETE FROM cars_fts WHERE rowid = ?", (car_id,))
+
+        self.connection.execute(
+            "INSERT OR REPLACE INTO cars VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                car_id,
+                _brand_key(car_data.get("brand")),
+                car_data.get("model") or None,
+                _to_year(car_data.get("year")),
+                _to_int(car_data.get("price")),
+                _to_int(car_data.get("mileage")),
+                car_data.get("fuel") or None,
+                self._option_mask(car_data.get("options") or {}, assign=True),
+                parsed_at,
+                source,
+                json.dumps(car_data, ensure_ascii=False),
+            ),
+        )
+        self.connection.execute(
+            "INSERT INTO cars_fts (rowid, brand, model, configuration, fuel, color, region) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                car_id,
+                car_data.get("brand") or "",
+                car_data.get("model") or "",
+                car_data.get("configuration") or "",
+                car_data.get("fuel") or "",
+                car_data.get("color") or "",
+                car_data.get("region") or "",
+            ),
+        )
+        return True
+
+    def ingest_file(self, path, force=False):
+        """
+        Добавление файла результатов в индекс
+
+        Args:
+            path: Путь к .json или .jsonl
+            force: Прочитать файл, даже если он не изменился
+
+        Returns:
+            int: Количество добавленных/обновленных автомобилей
+        """
+        path = Path(path)
+        stat = path.stat()
+        key = str(path.resolve())
+
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT mtime, size FROM files WHERE path = ?", (key,)
+            ).fetchone()
+            if not force and row and (row["mtime"], row["size"]) == (stat.st_mtime, stat.st_size):
+                return 0
+
+            try:
+                cars = _read_cars(path)
+            except (OSError, ValueError) as e:
+                logger.warning("Файл %s не добавлен в индекс: %s", path, e)
+                cars = []
+
+            with self.connection:
+                updated = sum(self._upsert(car_data, key) for car_data in cars)
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)",
+                    (key, stat.st_mtime, stat.st_size, len(cars)),
+                )
+
+        if cars:
+            logger.debug("Индекс: %s - автомобилей %s, обновлено %s", path, len(cars), updated)
+        return updated
+
+    def ingest_cars(self, cars, source):
+        """
+        Добавление автомобилей, которые не сохранены в output (например,
+        результаты пакетного режима бота)
+
+        Args:
+            cars: Данные автомобилей
+            source: Источник записи (вместо пути к файлу)
+
+        Returns:
+            int: Количество добавленных/обновленных автомобилей
+        """
+        cars = [car for car in cars if isinstance(car, dict) and _to_int(car.get("id"))]
+        with self.lock, self.connection:
+            return sum(self._upsert(car_data, source) for car_data in cars)
+
+    def sync(self, dirs=None):
+        """
+        Инкрементальное добавление всех файлов результатов из директорий
+
+        Args:
+            dirs: Директории (по умолчанию INDEX_SETTINGS["dirs"]), с поддиректориями
+
+        Returns:
+            dict: {"files": просмотрено файлов, "updated": обновлено автомобилей}
+        """
+        files = 0
+        updated = 0
+        for directory in dirs or INDEX_SETTINGS["dirs"]:
+            for path in sorted(Path(directory).rglob("*.json*")):
+                if path.suffix in (".json", ".jsonl"):
+                    files += 1
+                    updated += self.ingest_file(path)
+
+        logger.info("Индекс обновлен: файлов %s, автомобилей обновлено %s", files, updated)
+        return {"files": files, "updated": updated}
+
+    def _where(self, filters):
+        """
+        Условия WHERE по фильтрам search()
+
+        Returns:
+            tuple: (SQL-условие, параметры) или (None, None), если результат
+                заведомо пуст (неизвестная индексу опция)
+        """
+        clauses = []
+        params = []
+
+        if filters.get("brand"):
+            clauses.append("brand = ?")
+            params.append(_brand_key(filters["brand"]))
+        if filters.get("model"):
+            clauses.append("model LIKE ?")
+            params.append(f"%{filters['model']}%")
+        if filters.get("fuel"):
+            clauses.append("fuel LIKE ?")
+            params.append(f"%{filters['fuel']}%")
+
+        for name, scale in (("year", 1), ("price", 10000), ("mileage", 1)):
+            if filters.get(f"{name}_from") is not None:
+                clauses.append(f"{name} >= ?")
+                params.append(filters[f"{name}_from"] * scale)
+            if filters.get(f"{name}_to") is not None:
+                clauses.append(f"{name} <= ?")
+                params.append(filters[f"{name}_to"] * scale)
+
+        if filters.get("options"):
+            mask = self._option_mask(filters["options"])
+            if mask is None:
+                return None, None
+            clauses.append("options & ? = ?")
+            params.extend([mask, mask])
+
+        if filters.get("text"):
+            # Каждое слово - префиксный запрос, все слова обязательны
+            # (без слов - например, "/search -" - условие не добавляется:
+            # пустой MATCH - синтаксическая ошибка FTS5)
+            words = re.findall(r"\w+", filters["text"])
+            if words:
+                clauses.append("car_id IN (SELECT rowid FROM cars_fts WHERE cars_fts MATCH ?)")
+                params.append(" ".join(f'"{word}"*' for word in words))
+
+        return " AND ".join(clauses) or "1", params
+
+    def search(self, limit=20, offset=0, order="price", **filters):
+        """
+        Поиск автомобилей
+
+        Args:
+            limit: Максимум результатов
+            offset: Смещение (для постраничной выдачи)
+            order: Порядок: price, -price, year, -year, mileage, new
+            **filters: brand, model, fuel, year_from/year_to,
+                price_from/price_to (만원), mileage_from/mileage_to (км),
+                options (названия из CAR_OPTIONS - все обязательны), text
+
+        Returns:
+            list: Данные автомобилей (как в файлах результатов)
+        """
+        where, params = self._where(filters)
+        if where is None:
+            return []
+
+        with self.lock:
+            rows = self.connection.execute(
+                f"SELECT data FROM cars WHERE {where} "
+                f"ORDER BY {SEARCH_ORDER.get(order, 'price')} LIMIT ? OFFSET ?",
+                (*params, limit, offset),
+            ).fetchall()
+        return [json.loads(row["data"]) for row in rows]
+
+    def count(self, **filters):
+        """Количество автомобилей по фильтрам search() (limit/order не учитываются)"""
+        where, params = self._where(filters)
+        if where is None:
+            return 0
+
+        with self.lock:
+            return self.connection.execute(
+                f"SELECT COUNT(*) FROM cars WHERE {where}", params
+            ).fetchone()[0]
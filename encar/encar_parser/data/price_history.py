@@ -0,0 +1,290 @@
+"""
+Price history store
+История цен, пробега и статуса автомобилей между запусками (SQLite)
+"""
+
+import logging
+import re
+import sqlite3
+import time
+from pathlib import Path
+
+from encar_parser.config.settings import PRICE_HISTORY_SETTINGS
+
+logger = logging.getLogger(__name__)
+
+STATUS_ACTIVE = "active"
+STATUS_REMOVED = "removed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cars (
+    car_id INTEGER PRIMARY KEY,
+    brand TEXT,
+    model TEXT,
+    first_seen INTEGER NOT NULL,
+    last_seen INTEGER NOT NULL,
+    status TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS cars_brand ON cars (brand, status);
+
+CREATE TABLE IF NOT EXISTS observations (
+    car_id INTEGER NOT NULL,
+    observed_at INTEGER NOT NULL,
+    price INTEGER,
+    mileage INTEGER,
+    status TEXT NOT NULL,
+    PRIMARY KEY (car_id, observed_at)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS observations_time ON observations (observed_at);
+"""
+
+
+def _to_int(value):
+    """Число из строки вида "12345000" / "12,345" (None, если цифр нет)"""
+    digits = re.sub(r"\D", "", str(value or ""))
+    return int(digits) if digits else None
+
+
+class PriceHistoryStore:
+    """
+    Хранилище наблюдений (car_id, время, цена, пробег, статус):
+    - наблюдения только добавляются; новое пишется, если цена, пробег или
+      статус изменились (иначе обновляется last_seen автомобиля)
+    - наблюдения хранятся по (car_id, время), есть индекс по времени -
+      запросы по автомобилю и за период не читают всю таблицу
+
+    Время - Unix timestamp (секунды), цена - воны, пробег - км.
+    """
+
+    def __init__(self, db_path=None, record_unchanged=None):
+        """
+        Args:
+            db_path: Путь к файлу базы (по умолчанию PRICE_HISTORY_SETTINGS["db_path"])
+            record_unchanged: Писать наблюдение при каждом запуске, даже без
+                изменений (по умолчанию из настроек)
+        """
+        self.db_path = Path(db_path or PRICE_HISTORY_SETTINGS["db_path"])
+        self.record_unchanged = (
+            record_unchanged
+            if record_unchanged is not None
+            else PRICE_HISTORY_SETTINGS["record_unchanged"]
+        )
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(self.db_path))
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(_SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _last_observation(self, car_id):
+        return self.connection.execute(
+            "SELECT price, mileage, status FROM observations "
+            "WHERE car_id = ? ORDER BY observed_at DESC LIMIT 1",
+            (car_id,),
+        ).fetchone()
+
+    def record(self, cars_data, brand=None, observed_at=None):
+        """
+        Запись наблюдений по результатам парсинга
+
+        Args:
+            cars_data: Список данных автомобилей (id, price, mileage, brand, model)
+            brand: Марка (ключ из BRANDS) для всех автомобилей; None = из данных
+            observed_at: Время наблюдения (по умолчанию - сейчас)
+
+        Returns:
+            int: Количество добавленных наблюдений
+        """
+        observed_at = int(observed_at or time.time())
+        added = 0
+
+        with self.connection:
+            for car_data in cars_data:
+                car_id = _to_int(car_data.get("id"))
+                if car_id is None:
+                    continue
+
+                price = _to_int(car_data.get("price"))
+                mileage = _to_int(car_data.get("mileage"))
+                car_brand = brand or (car_data.get("brand") or "").lower() or None
+
+                self.connection.execute(
+                    "INSERT INTO cars (car_id, brand, model, first_seen, last_seen, status) "
+                    "VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (car_id) DO UPDATE SET "
+                    "brand = COALESCE(excluded.brand, brand), "
+                    "model = COALESCE(excluded.model, model), "
+                    "last_seen = MAX(last_seen, excluded.last_seen), "
+                    "status = excluded.status",
+                    (
+                        car_id,
+                        car_brand,
+                        car_data.get("model") or None,
+                        observed_at,
+                        observed_at,
+                        STATUS_ACTIVE,
+                    ),
+                )
+
+                last = self._last_observation(car_id)
+                if (
+                    not self.record_unchanged
+                    and last is not None
+                    and (last["price"], last["mileage"], last["status"])
+                    == (price, mileage, STATUS_ACTIVE)
+                ):
+                    continue
+
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO observations VALUES (?, ?, ?, ?, ?)",
+                    (car_id, observed_at, price, mileage, STATUS_ACTIVE),
+                )
+                added += 1
+
+        logger.debug("История цен: добавлено наблюдений %s", added)
+        return added
+
+    def mark_removed(self, brand, seen_ids, observed_at=None):
+        """
+        Отметка снятых с продажи: активные автомобили марки, которых нет
+        в полном (без фильтров) обходе каталога
+
+        Args:
+            brand: Марка (ключ из BRANDS)
+            seen_ids: ID всех автомобилей, найденных в каталоге
+            observed_at: Время наблюдения (по умолчанию - сейчас)
+
+        Returns:
+            int: Количество снятых автомобилей
+        """
+        observed_at = int(observed_at or time.time())
+
+        with self.connection:
+            self.connection.execute("CREATE TEMP TABLE IF NOT EXISTS seen (car_id INTEGER PRIMARY KEY)")
+            self.connection.execute("DELETE FROM seen")
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO seen VALUES (?)", ((int(car_id),) for car_id in seen_ids)
+            )
+
+            removed = [
+                row["car_id"]
+                for row in self.connection.execute(
+                    "SELECT car_id FROM cars WHERE brand = ? AND status = ? "
+                    "AND car_id NOT IN (SELECT car_id FROM seen)",
+                    (brand, STATUS_ACTIVE),
+                )
+            ]
+
+            for car_id in removed:
+                last = self._last_observation(car_id)
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO observations VALUES (?, ?, ?, ?, ?)",
+                    (
+                        car_id,
+                        observed_at,
+                        last["price"] if last else None,
+                        last["mileage"] if last else None,
+                        STATUS_REMOVED,
+                    ),
+                )
+            self.connection.executemany(
+                "UPDATE cars SET status = ? WHERE car_id = ?",
+                ((STATUS_REMOVED, car_id) for car_id in removed),
+            )
+
+        if removed:
+            logger.info("История цен: снято с продажи %s (%s)", len(removed), brand)
+        return len(removed)
+
+    def get_history(self, car_id):
+        """
+        Наблюдения автомобиля по времени
+
+        Returns:
+            list: [{"observed_at", "price", "mileage", "status"}, ...]
+        """
+        rows = self.connection.execute(
+            "SELECT observed_at, price, mileage, status FROM observations "
+            "WHERE car_id = ? ORDER BY observed_at",
+            (int(car_id),),
+        )
+        return [dict(row) for row in rows]
+
+    def price_changes(self, brand=None, hours=24, now=None):
+        """
+        Изменения цены за последние hours часов
+
+        Args:
+            brand: Марка (None = все)
+            hours: Период (часы)
+            now: Текущее время (по умолчанию - сейчас)
+
+        Returns:
+            list: [{"car_id", "brand", "model", "observed_at", "old_price",
+                "price", "change"}, ...] - сначала новые
+        """
+        now = int(now or time.time())
+        since = now - int(hours * 3600)
+        rows = self.connection.execute(
+            """
+            WITH history AS (
+                SELECT o.car_id, c.brand, c.model, o.observed_at, o.price,
+                    LAG(o.price) OVER (
+                        PARTITION BY o.car_id ORDER BY o.observed_at
+                    ) AS old_price
+                FROM observations o JOIN cars c ON c.car_id = o.car_id
+                WHERE o.car_id IN (
+                    SELECT car_id FROM observations
+                    WHERE observed_at BETWEEN :since AND :now
+                )
+                AND (:brand IS NULL OR c.brand = :brand)
+            )
+            SELECT car_id, brand, model, observed_at, old_price, price,
+                price - old_price AS change
+            FROM history
+            WHERE observed_at BETWEEN :since AND :now AND price != old_price
+            ORDER BY observed_at DESC
+            """,
+            {"since": since, "now": now, "brand": brand},
+        )
+        return [dict(row) for row in rows]
+
+    def days_on_market(self, car_id, now=None):
+        """
+        Дней в продаже: от первого наблюдения до снятия (или до сейчас)
+
+        Returns:
+            float или None: Количество дней или None, если автомобиля нет
+        """
+        row = self.connection.execute(
+            "SELECT first_seen, last_seen, status FROM cars WHERE car_id = ?",
+            (int(car_id),),
+        ).fetchone()
+        if row is None:
+            return None
+
+        end = row["last_seen"] if row["status"] == STATUS_REMOVED else int(now or time.time())
+        return round((end - row["first_seen"]) / 86400, 1)
+
+    def get_stats(self):
+        """
+        Размер хранилища
+
+        Returns:
+            dict: {"cars", "active", "observations"}
+        """
+        cars, active = self.connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(status = ?), 0) FROM cars", (STATUS_ACTIVE,)
+        ).fetchone()
+        observations = self.connection.execute("SELECT COUNT(*) FROM observations").fetchone()[0]
+        return {"cars": cars, "active": active, "observations": observations}
@@ -3,9 +3,14 @@ Encar Parser - Main Entry Point
 Парсер данных автомобилей с сайта Encar.com
 """
 
+import argparse
 from datetime import datetime
 
+from encar_parser.config.settings import METRICS_SETTINGS
 from encar_parser.core.parser import EncarParser
+from encar_parser.utils.log_config import setup_logging
+from encar_parser.utils.metrics import start_metrics_server
+from encar_parser.utils.profiling import PROFILE_MODES, configure_profiling
 
 
 def print_menu():
@@ -17,6 +22,7 @@ def print_menu():
     print("1. Обычный запуск (20 авто) - ОТКЛЮЧЕНО")
     print("2. Парсинг одного автомобиля")
     print("3. Полный запуск (настраиваемый)")
+    print("4. Все марки (параллельный обход)")
     print("0. Выход")
     print("=" * 50)
 
@@ -107,11 +113,164 @@ def mode_full_run():
         start_page=start_page,
         max_pages=max_pages,
         filename=filename,
+        delta=True if args.delta else None,
     )
 
 
+def mode_all_brands():
+    """Обход нескольких марок общим пулом браузеров"""
+    from encar_parser.config.catalog_settings import ORCHESTRATOR_CONFIG
+    from encar_parser.core.orchestrator import CatalogOrchestrator
+
+    orchestrator = CatalogOrchestrator(headless=True)
+
+    print("\n" + "=" * 60)
+    print("ОБХОД НЕСКОЛЬКИХ МАРОК (параметры из config)")
+    print("=" * 60)
+    print(f"Марок: {len(orchestrator.brands)}, браузеров: {orchestrator.workers}")
+    print(f"Состояние: {ORCHESTRATOR_CONFIG['state_file']}")
+    print("=" * 60)
+
+    result = orchestrator.run()
+    if result["merged"]:
+        print(f"\nОбщий файл: {result['merged']}")
+
+
+def run_shard():
+    """Обход одной части каталога марки (--shard I/N)"""
+    from encar_parser.config.catalog_settings import CATALOG_CONFIG
+    from encar_parser.core.sharding import ShardCrawler, parse_shard_spec
+
+    shard, shards = parse_shard_spec(args.shard)
+    crawler = ShardCrawler(
+        args.brand or CATALOG_CONFIG["default_brand"],
+        shard,
+        shards,
+        start_page=args.start_page,
+        pages=args.pages,
+    )
+    try:
+        state = crawler.run()
+    except ValueError as e:
+        print(f"\nОшибка: {e}")
+        exit(1)
+    print(f"\nЧасть {shard}/{shards}: {state['status']}, страницы: {state.get('pages')}")
+    print(f"Результаты: {crawler.results_path}")
+
+
+def run_plan():
+    """Расчет плана частей для всех --shard (--plan N)"""
+    from encar_parser.config.catalog_settings import CATALOG_CONFIG
+    from encar_parser.core.sharding import write_shard_plan
+
+    plan = write_shard_plan(
+        args.brand or CATALOG_CONFIG["default_brand"],
+        args.plan,
+        start_page=args.start_page,
+        pages=args.pages,
+    )
+    print(f"\nСтраниц: {plan['pages']}, частей: {plan['shards']}")
+    for index, (first_page, count) in enumerate(plan["plan"], start=1):
+        print(f"  {index}/{plan['shards']}: страницы {first_page}-{first_page + count - 1}")
+
+
+def run_search():
+    """Поиск по индексу результатов (--search "brand=kia year=2019- ...")"""
+    from encar_parser.data.catalog_index import CatalogIndex, parse_search_terms
+
+    filters = parse_search_terms(args.search)
+    with CatalogIndex() as index:
+        index.sync()
+        total = index.count(**filters)
+        cars = index.search(**filters)
+
+    print(f"\nНайдено: {total} (показано {len(cars)})")
+    for car_data in cars:
+        print(
+            f"  {car_data.get('id')}: {car_data.get('brand', '')} {car_data.get('model', '')}"
+            f" | {car_data.get('year', '')} | {car_data.get('price', '')} ₩"
+            f" | {car_data.get('mileage', '')} км"
+        )
+
+
+def run_index():
+    """Обновление индекса результатов (--index)"""
+    from encar_parser.data.catalog_index import CatalogIndex
+
+    with CatalogIndex() as index:
+        result = index.sync()
+    print(f"\nФайлов: {result['files']}, обновлено автомобилей: {result['updated']}")
+
+
+def run_merge():
+    """Объединение частей (--merge-shards)"""
+    from encar_parser.core.sharding import merge_shards
+
+    summary = merge_shards(args.merge_shards)
+    print(
+        f"\nЗаписей: {summary['records']}, уникальных: {summary['unique']}, "
+        f"повторов: {summary['duplicates']}"
+    )
+    if summary["output"]:
+        print(f"Общий файл: {summary['output']}")
+
+
 parser = argparse.ArgumentParser()
-parser.add_argument("--mode", type=int, choices=range(0, 4), help="Режим работы: 0-3")
+parser.add_argument("--mode", type=int, choices=range(0, 5), help="Режим работы: 0-4")
+parser.add_argument(
+    "--metrics-port",
+    type=int,
+    default=METRICS_SETTINGS["port"],
+    help="Порт эндпоинта /metrics (0 = отключен)",
+)
+parser.add_argument(
+    "--quiet", action="store_true", help="Без отладочных сообщений (уровень INFO)"
+)
+parser.add_argument("--log-json", action="store_true", help="Логи в формате JSON")
+parser.add_argument(
+    "--profile",
+    nargs="?",
+    const="cprofile",
+    choices=PROFILE_MODES,
+    help="Профилирование запусков: cprofile (по умолчанию) или sample",
+)
+parser.add_argument(
+    "--delta",
+    action="store_true",
+    help="Режим 3: только автомобили, измененные после прошлого запуска",
+)
+parser.add_argument(
+    "--shard", help="Обход части каталога: номер/всего частей, например 2/4"
+)
+parser.add_argument(
+    "--plan",
+    type=int,
+    metavar="N",
+    help="Рассчитать план из N частей для --shard (один раз, до запуска частей)",
+)
+parser.add_argument("--brand", help="Марка для --shard/--plan (по умолчанию из config)")
+parser.add_argument(
+    "--start-page", type=int, help="Первая страница всего обхода для --shard/--plan"
+)
+parser.add_argument(
+    "--pages",
+    type=int,
+    help="Страниц во всем обходе для --shard/--plan (без --pages --shard берет план из --plan)",
+)
+parser.add_argument(
+    "--index", action="store_true", help="Обновить индекс результатов для поиска"
+)
+parser.add_argument(
+    "--search",
+    metavar="QUERY",
+    help='Поиск по индексу: "brand=kia year=2019- price=-3000 option=sunroof"',
+)
+parser.add_argument(
+    "--merge-shards",
+    nargs="+",
+    metavar="PATH",
+    help="Объединить частичные JSONL-файлы (файлы или директории) без повторов",
+)
 args = parser.parse_args()
 
 def run_mode(choice):
@@ -126,6 +285,8 @@ def run_mode(choice):
             mode_single_car()
         elif choice == "3":
             mode_full_run()
+        elif choice == "4":
+            mode_all_brands()
         else:
             print("Неверный выбор. Попробуйте снова.")
     except KeyboardInterrupt:
@@ -138,14 +299,34 @@ def run_mode(choice):
 
 def main():
     """Главная функция"""
+    setup_logging(
+        verbose=False if args.quiet else None,
+        json_format=True if args.log_json else None,
+    )
+
+    if args.metrics_port:
+        start_metrics_server(args.metrics_port, host=METRICS_SETTINGS["host"])
+
+    if args.profile:
+        configure_profiling(args.profile)
 
-    if args.mode is not None:
+    if args.search:
+        run_search()
+    elif args.index:
+        run_index()
+    elif args.merge_shards:
+        run_merge()
+    elif args.plan:
+        run_plan()
+    elif args.shard:
+        run_shard()
+    elif args.mode is not None:
         choice = str(args.mode)
         run_mode(choice)
     else:
         while True:
             print_menu()
-            choice = input("\nВведите номер (0-3): ").strip()
+            choice = input("\nВведите номер (0-4): ").strip()
             run_mode(choice)
 
 
@@ -3,9 +3,14 @@ Encar Parser - Main Entry Point
 Парсер данных автомобилей с сайта Encar.com
 """
 
+import argparse
 from datetime import datetime
 
+from encar_parser.config.settings import METRICS_SETTINGS
 from encar_parser.core.parser import EncarParser
+from encar_parser.utils.log_config import setup_logging
+from encar_parser.utils.metrics import start_metrics_server
+from encar_parser.utils.profiling import PROFILE_MODES, configure_profiling
 
 
 def print_menu():
@@ -17,6 +22,7 @@ def print_menu():
     print("1. Обычный запуск (20 авто) - ОТКЛЮЧЕНО")
     print("2. Парсинг одного автомобиля")
     print("3. Полный запуск (настраиваемый)")
+    print("4. Все марки (параллельный обход)")
     print("0. Выход")
     print("=" * 50)
 
@@ -110,11 +116,48 @@ def mode_full_run():
     )
 
 
+def mode_all_brands():
+    """Обход нескольких марок общим пулом браузеров"""
+    from encar_parser.config.catalog_settings import ORCHESTRATOR_CONFIG
+    from encar_parser.core.orchestrator import CatalogOrchestrator
+
+    orchestrator = CatalogOrchestrator(headless=False)
+
+    print("\n" + "=" * 60)
+    print("ОБХОД НЕСКОЛЬКИХ МАРОК (параметры из config)")
+    print("=" * 60)
+    print(f"Марок: {len(orchestrator.brands)}, браузеров: {orchestrator.workers}")
+    print(f"Состояние: {ORCHESTRATOR_CONFIG['state_file']}")
+    print("=" * 60)
+
+    result = orchestrator.run()
+    if result["merged"]:
+        print(f"\nОбщий файл: {result['merged']}")
+
+
 def main():
     """Главная функция"""
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="cprofile",
+        choices=PROFILE_MODES,
+        help="Профилирование запусков: cprofile (по умолчанию) или sample",
+    )
+    args = arg_parser.parse_args()
+
+    setup_logging()
+
+    if METRICS_SETTINGS["port"]:
+        start_metrics_server(METRICS_SETTINGS["port"], host=METRICS_SETTINGS["host"])
+
+    if args.profile:
+        configure_profiling(args.profile)
+
     while True:
         print_menu()
-        choice = input("\nВведите номер (0-3): ").strip()
+        choice = input("\nВведите номер (0-4): ").strip()
 
         try:
             if choice == "0":
@@ -127,6 +170,8 @@ def main():
                 mode_single_car()
             elif choice == "3":
                 mode_full_run()
+            elif choice == "4":
+                mode_all_brands()
             else:
                 print("Неверный выбор. Попробуйте снова.")
         except KeyboardInterrupt:
@@ -3,8 +3,16 @@ Services module for Encar Parser
 Содержит бизнес-логику для различных операций парсинга
 """
 
+from .catalog_probe import CATALOG_CACHE, fetch_catalog_page
 from .image_extractor import ImageExtractor
 from .options_extractor import OptionsExtractor
 from .translator import is_english, translate_text
 
-__all__ = ["translate_text", "is_english", "ImageExtractor", "OptionsExtractor"]
+__all__ = [
+    "translate_text",
+    "is_english",
+    "ImageExtractor",
+    "OptionsExtractor",
+    "fetch_catalog_page",
+    "CATALOG_CACHE",
+]
@@ -3,9 +3,14 @@ Translation service
 Сервис перевода с корейского на английский
 """
 
+import logging
+
 from deep_translator import GoogleTranslator
 
 from encar_parser.data.translation_cache import TRANSLATION_CACHE
+from encar_parser.utils.metrics import METRICS
+
+logger = logging.getLogger(__name__)
 
 
 def is_english(text):
@@ -54,25 +59,27 @@ def translate_text(text, view_log=False):
 
     # Проверяем кэш готовых переводов
     if clean_text in TRANSLATION_CACHE:
+        METRICS.inc("translation_cache_hits_total")
         cached_translation = TRANSLATION_CACHE[clean_text]
         if view_log:
-            print(f"Cache: '{clean_text}' -> '{cached_translation}'")
+            logger.debug("Cache: '%s' -> '%s'", clean_text, cached_translation)
         return cached_translation
 
     # Используем API переводчик
+    METRICS.inc("translation_cache_misses_total")
     try:
         translator = GoogleTranslator(source="ko", target="en")
         api_translation = translator.translate(clean_text)
 
         if api_translation and api_translation.strip():
             if view_log:
-                print(f"API: '{clean_text}' -> '{api_translation}'")
+                logger.debug("API: '%s' -> '%s'", clean_text, api_translation)
             return api_translation
         else:
             if view_log:
-                print(f"Empty API translation for: '{clean_text}'")
+                logger.debug("Empty API translation for: '%s'", clean_text)
             return clean_text
 
     except Exception as e:
-        print(f"Translation error for '{clean_text}': {e}")
+        logger.warning("Translation error for '%s': %s", clean_text, e)
         return clean_text
@@ -2,8 +2,59 @@
 Captcha detection and handling
 Обнаружение и обработка капчи
 """
+import logging
 import time
 
+from encar_parser.config.settings import CAPTCHA_SETTINGS
+
+logger = logging.getLogger(__name__)
+
+# Проверка всех признаков капчи за один вызов WebDriver.
+# Сначала дешевые признаки навигации (URL, заголовок, HTTP-статус из
+# Navigation Timing), затем селекторы: querySelector останавливается
+# на первом совпадении, широкие селекторы стоят в конце списка.
+CAPTCHA_PROBE_JS = """
+var selectors = arguments[0], settings = arguments[1];
+var url = location.href.toLowerCase();
+for (var i = 0; i < settings.url_keywords.length; i++) {
+    if (url.indexOf(settings.url_keywords[i]) !== -1) {
+        return {type: "url", value: location.href};
+    }
+}
+var title = (document.title || "").toLowerCase();
+for (var i = 0; i < settings.title_keywords.length; i++) {
+    if (title.indexOf(settings.title_keywords[i]) !== -1) {
+        return {type: "title", value: document.title};
+    }
+}
+var nav = performance.getEntriesByType ? performance.getEntriesByType("navigation")[0] : null;
+if (nav && nav.responseStatus && settings.blocked_statuses.indexOf(nav.responseStatus) !== -1) {
+    return {type: "status", value: nav.responseStatus};
+}
+if (!settings.dom_probe) {
+    return null;
+}
+for (var i = 0; i < selectors.length; i++) {
+    var element = document.querySelector(selectors[i]);
+    if (element && (element.offsetWidth || element.offsetHeight || element.getClientRects().length)) {
+        return {type: "selector", value: selectors[i]};
+    }
+}
+return null;
+"""
+
+# Количество элементов по каждому селектору (для отладки)
+CAPTCHA_COUNT_JS = """
+var result = {};
+arguments[0].forEach(function (selector) {
+    var count = document.querySelectorAll(selector).length;
+    if (count) {
+        result[selector] = count;
+    }
+});
+return result;
+"""
+
 
 class CaptchaHandler:
     """
@@ -16,8 +67,12 @@ class CaptchaHandler:
             scraper: Экземпляр класса Scraper
         """
         self.scraper = scraper
+        self.settings = CAPTCHA_SETTINGS
+        
+        # Последнее совпадение JS-проверки: {"type": ..., "value": ...}
+        self.last_match = None
         
-        # Селекторы различных типов капчи
+        # Селекторы различных типов капчи (от точных к широким)
         self.captcha_selectors = [
             # Google reCAPTCHA
             "iframe[src*='recaptcha']",
@@ -42,7 +97,31 @@ class CaptchaHandler:
     
     def check_captcha(self):
         """
-        Проверка наличия капчи на странице
+        Проверка наличия капчи на странице одним JS-вызовом
+        
+        Returns:
+            bool: True если капча обнаружена
+        """
+        # Совпадение прошлой проверки не должно пережить новую
+        self.last_match = None
+        try:
+            match = self.scraper.driver.execute_script(
+                CAPTCHA_PROBE_JS, self.captcha_selectors, self.settings
+            )
+        except Exception as e:
+            logger.debug("JS-проверка капчи недоступна (%s), проверяем селекторами", e)
+            return self._check_captcha_selectors()
+        
+        self.last_match = match
+        if match:
+            logger.warning("Обнаружена капча (%s): %s", match["type"], match["value"])
+            return True
+        return False
+    
+    def _check_captcha_selectors(self):
+        """
+        Проверка капчи через find_elements по каждому селектору
+        (запасной вариант, если JS недоступен)
         
         Returns:
             bool: True если капча обнаружена
@@ -53,17 +132,20 @@ class CaptchaHandler:
                 # Проверяем, видим ли элемент
                 try:
                     if elements[0].is_displayed():
-                        print(f"Обнаружена капча: {selector}")
+                        logger.warning("Обнаружена капча: %s", selector)
+                        self.last_match = {"type": "selector", "value": selector}
                         return True
                 except:
                     # Если не можем проверить видимость, считаем что капча есть
-                    print(f"Возможно обнаружена капча: {selector}")
+                    logger.warning("Возможно обнаружена капча: %s", selector)
+                    self.last_match = {"type": "selector", "value": selector}
                     return True
         
         # Дополнительная проверка через URL
         current_url = self.scraper.get_current_url()
         if 'captcha' in current_url.lower() or 'verify' in current_url.lower():
-            print(f"Обнаружена капча в URL: {current_url}")
+            logger.warning("Обнаружена капча в URL: %s", current_url)
+            self.last_match = {"type": "url", "value": current_url}
             return True
         
         return False
@@ -78,11 +160,10 @@ class CaptchaHandler:
         Returns:
             bool: True если капча решена, False если истекло время
         """
-        print("\n" + "="*60)
-        print("ОБНАРУЖЕНА КАПЧА!")
-        print("Пожалуйста, решите капчу вручную в браузере.")
-        print(f"Ожидание: {timeout} секунд")
-        print("="*60)
+        logger.warning(
+            "Обнаружена капча! Решите ее вручную в браузере (ожидание: %s секунд)",
+            timeout,
+        )
         
         start_time = time.time()
         check_interval = 2  # Проверяем каждые 2 секунды
@@ -93,17 +174,17 @@ class CaptchaHandler:
             
             # Показываем прогресс
             if elapsed % 10 == 0:
-                print(f"Осталось времени: {remaining} секунд...")
+                logger.info("Осталось времени: %s секунд...", remaining)
             
             # Проверяем, исчезла ли капча
             if not self.check_captcha():
-                print("Капча решена! Продолжаем парсинг.")
+                logger.info("Капча решена! Продолжаем парсинг.")
                 time.sleep(2)  # Небольшая пауза после решения
                 return True
             
             time.sleep(check_interval)
         
-        print("Время ожидания истекло!")
+        logger.warning("Время ожидания истекло!")
         return False
     
     def handle_captcha(self, auto_solve=False, timeout=120):
@@ -123,8 +204,10 @@ class CaptchaHandler:
         
         if auto_solve:
             # Здесь можно интегрировать сервисы типа 2captcha, anti-captcha
-            print("Автоматическое решение капчи не реализовано")
-            print("Переключаемся на ручной режим...")
+            logger.warning(
+                "Автоматическое решение капчи не реализовано, "
+                "переключаемся на ручной режим"
+            )
         
         # Ручное решение
         return self.wait_for_manual_solve(timeout=timeout)
@@ -150,23 +233,22 @@ class CaptchaHandler:
         Returns:
             dict: Информация о сохраненных файлах
         """
-        print("Сохраняем отладочную информацию о капче...")
+        logger.info("Сохраняем отладочную информацию о капче...")
         
         # Сохраняем HTML и скриншот
-        debug_info = self.scraper.save_page_debug_info(prefix="captcha")
+        debug_info = self.scraper.save_page_debug_info(prefix="captcha") or {}
         
         # Пробуем найти элементы капчи
-        captcha_found = []
-        for selector in self.captcha_selectors:
-            elements = self.scraper.find_elements(selector)
-            if elements:
-                captcha_found.append({
-                    "selector": selector,
-                    "count": len(elements)
-                })
+        counts = self.scraper.execute_script(CAPTCHA_COUNT_JS, self.captcha_selectors) or {}
+        captcha_found = [
+            {"selector": selector, "count": count} for selector, count in counts.items()
+        ]
+        
+        if self.last_match:
+            debug_info["captcha_match"] = self.last_match
         
         if captcha_found:
-            print(f"Найдено элементов капчи: {captcha_found}")
+            logger.info("Найдено элементов капчи: %s", captcha_found)
             debug_info["captcha_elements"] = captcha_found
         
         return debug_info
\ No newline at end of file
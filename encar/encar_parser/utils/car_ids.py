@@ -0,0 +1,73 @@
+"""
+Car ID collection
+Упорядоченный набор ID автомобилей из каталога
+"""
+
+CAR_DETAIL_URL = "https://fem.encar.com/cars/detail/{car_id}?carid={car_id}"
+
+
+def car_detail_url(car_id):
+    """URL страницы автомобиля по ID"""
+    return CAR_DETAIL_URL.format(car_id=car_id)
+
+
+def parse_impression_id(data_impression):
+    """
+    ID автомобиля из атрибута data-impression ("<id>|...")
+
+    Returns:
+        int или None: ID или None, если значение не похоже на ID
+    """
+    car_id = (data_impression or "").partition("|")[0].strip()
+    return int(car_id) if car_id.isdigit() else None
+
+
+class CarIdCollector:
+    """
+    Упорядоченное множество ID автомобилей (порядок - как в каталоге).
+    Проверка на повтор за O(1), URL строятся только при обращении.
+    """
+
+    def __init__(self, car_ids=None):
+        """
+        Args:
+            car_ids: Начальные ID (опционально)
+        """
+        self._ids = {}
+        if car_ids:
+            self.update(car_ids)
+
+    def add(self, car_id):
+        """
+        Добавление ID
+
+        Returns:
+            bool: True если ID новый
+        """
+        car_id = int(car_id)
+        if car_id in self._ids:
+            return False
+        self._ids[car_id] = None
+        return True
+
+    def update(self, car_ids):
+        """
+        Добавление нескольких ID
+
+        Returns:
+            list: Новые ID в исходном порядке
+        """
+        return [int(car_id) for car_id in car_ids if self.add(car_id)]
+
+    def urls(self):
+        """Генератор URL страниц автомобилей"""
+        return (car_detail_url(car_id) for car_id in self._ids)
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, car_id):
+        return int(car_id) in self._ids
@@ -0,0 +1,188 @@
+"""
+Debug artifact storage with sampling, quotas and rotation
+Хранилище отладочных файлов (HTML, скриншоты) с выборкой и квотами
+"""
+
+import base64
+import gzip
+import logging
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from encar_parser.config.settings import DEBUG_SETTINGS
+
+logger = logging.getLogger(__name__)
+
+
+class DebugArtifactManager:
+    """
+    Сохранение отладочной информации страницы:
+    - выборка: не больше max_per_reason сохранений на каждую причину за
+      окно sample_window секунд (счетчики общие для процесса - см.
+      DEBUG_ARTIFACTS; после окна долгоживущий бот снова сохраняет файлы)
+    - квоты: общий размер и количество файлов в директории
+    - ротация: при превышении квот удаляются самые старые файлы
+    - сжатие HTML (gzip)
+    - запись на диск в фоновом потоке, чтобы не блокировать парсинг
+    """
+
+    def __init__(self, settings=None):
+        """
+        Args:
+            settings: Настройки (по умолчанию DEBUG_SETTINGS)
+        """
+        self.settings = {**DEBUG_SETTINGS, **(settings or {})}
+        self.output_dir = Path(self.settings["dir"])
+
+        self.saved = Counter()
+        self.skipped = Counter()
+        self.lock = threading.Lock()
+        self.window_start = time.monotonic()
+
+        self._executor = None
+        if self.settings["async"]:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="debug-artifacts"
+            )
+
+    def _should_save(self, reason):
+        """Проверка выборки: первые N сохранений на причину в текущем окне"""
+        with self.lock:
+            window = self.settings.get("sample_window")
+            if window and time.monotonic() - self.window_start >= window:
+                self.saved.clear()
+                self.window_start = time.monotonic()
+
+            if self.saved[reason] >= self.settings["max_per_reason"]:
+                self.skipped[reason] += 1
+                return False
+            self.saved[reason] += 1
+            return True
+
+    def save(self, driver, reason, car_id=None):
+        """
+        Сохранение HTML, скриншота и info-файла текущей страницы
+
+        Снимок страницы делается в текущем потоке (WebDriver не потокобезопасен),
+        декодирование, сжатие и запись - в фоновом.
+
+        Args:
+            driver: Экземпляр WebDriver
+            reason: Причина сохранения (используется для выборки)
+            car_id: ID автомобиля (для имени файла)
+
+        Returns:
+            dict или None: Пути к файлам или None, если сохранение пропущено
+        """
+        if not self._should_save(reason):
+            logger.debug("Debug для '%s' пропущен (лимит выборки)", reason)
+            return None
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        prefix = f"{reason}_{car_id}" if car_id else reason
+        base = self.output_dir / f"{prefix}_{timestamp}"
+
+        try:
+            snapshot = {
+                "url": driver.current_url,
+                "html": driver.page_source,
+                "screenshot": driver.get_screenshot_as_base64(),
+            }
+        except Exception as e:
+            logger.warning("Не удалось снять debug страницы: %s", e)
+            return None
+
+        html_suffix = ".html.gz" if self.settings["compress_html"] else ".html"
+        paths = {
+            "html": f"{base}{html_suffix}",
+            "screenshot": f"{base}.png",
+            "info": f"{base}_info.txt",
+            "url": snapshot["url"],
+        }
+
+        if self._executor:
+            self._executor.submit(self._write, snapshot, paths, timestamp)
+        else:
+            self._write(snapshot, paths, timestamp)
+
+        return paths
+
+    def _write(self, snapshot, paths, timestamp):
+        """Запись файлов и применение квот (выполняется в фоне)"""
+        try:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+
+            html = snapshot["html"].encode("utf-8")
+            if self.settings["compress_html"]:
+                html = gzip.compress(html)
+            Path(paths["html"]).write_bytes(html)
+
+            Path(paths["screenshot"]).write_bytes(
+                base64.b64decode(snapshot["screenshot"])
+            )
+
+            Path(paths["info"]).write_text(
+                f"URL: {snapshot['url']}\n"
+                f"Timestamp: {timestamp}\n"
+                f"HTML file: {paths['html']}\n"
+                f"Screenshot: {paths['screenshot']}\n",
+                encoding="utf-8",
+            )
+
+            logger.info("Отладочная информация сохранена: %s", paths["html"])
+            self._enforce_quota()
+
+        except Exception as e:
+            logger.error("Ошибка сохранения debug информации: %s", e)
+
+    def _enforce_quota(self):
+        """Удаление самых старых файлов при превышении квот"""
+        files = sorted(
+            (path for path in self.output_dir.iterdir() if path.is_file()),
+            key=lambda path: path.stat().st_mtime,
+        )
+
+        max_bytes = self.settings["max_total_mb"] * 1024 * 1024
+        max_files = self.settings["max_files"]
+        total_size = sum(path.stat().st_size for path in files)
+
+        removed = 0
+        while files and (total_size > max_bytes or len(files) > max_files):
+            oldest = files.pop(0)
+            total_size -= oldest.stat().st_size
+            oldest.unlink(missing_ok=True)
+            removed += 1
+
+        if removed:
+            logger.info("Ротация debug: удалено старых файлов: %s", removed)
+
+    def get_summary(self):
+        """
+        Статистика сохранений
+
+        Returns:
+            dict: {"saved": {...}, "skipped": {...}} по причинам
+        """
+        with self.lock:
+            return {"saved": dict(self.saved), "skipped": dict(self.skipped)}
+
+    def flush(self):
+        """Ожидание записи уже поставленных в очередь файлов"""
+        if self._executor:
+            # Один фоновый поток - задачи выполняются по порядку
+            self._executor.submit(lambda: None).result()
+
+    def close(self):
+        """Ожидание завершения фоновых записей"""
+        if self._executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+# Общее хранилище процесса: выборка по причинам работает и тогда, когда
+# EncarParser создается на каждый автомобиль (бот)
+DEBUG_ARTIFACTS = DebugArtifactManager()
@@ -0,0 +1,89 @@
+"""
+Logging configuration
+Настройка логирования парсера (текст или JSON, уровни по модулям)
+"""
+
+import json
+import logging
+from datetime import datetime, timezone
+
+from encar_parser.config.settings import LOGGING_SETTINGS, SETTINGS
+
+# Корневой логгер пакета: все модули используют logging.getLogger(__name__)
+PACKAGE_LOGGER = "encar_parser"
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Стандартные атрибуты LogRecord, которые не попадают в extra
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Форматирование записей в одну JSON-строку
+    (удобно для разбора логов и отправки в агрегаторы)
+    """
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+
+        # Поля, переданные через extra={...}
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def setup_logging(verbose=None, json_format=None, levels=None, log_file=None):
+    """
+    Настройка логирования пакета encar_parser
+
+    Args:
+        verbose: Подробный вывод (DEBUG); None = SETTINGS["verbose"].
+            Без verbose отладочные сообщения отбрасываются до форматирования,
+            поэтому не тратят время на горячих путях
+        json_format: JSON вместо текста; None = LOGGING_SETTINGS["format"]
+        levels: Уровни для отдельных модулей {"encar_parser.core.scraper": "WARNING"}
+        log_file: Дополнительный файл для логов; None = LOGGING_SETTINGS["file"]
+
+    Returns:
+        logging.Logger: Настроенный логгер пакета
+    """
+    if verbose is None:
+        verbose = SETTINGS.get("verbose", False)
+    if json_format is None:
+        json_format = LOGGING_SETTINGS.get("format") == "json"
+    if levels is None:
+        levels = LOGGING_SETTINGS.get("levels", {})
+    if log_file is None:
+        log_file = LOGGING_SETTINGS.get("file")
+
+    formatter = JsonFormatter() if json_format else logging.Formatter(TEXT_FORMAT)
+
+    handlers = [logging.StreamHandler()]
+    if log_file:
+        handlers.append(logging.FileHandler(log_file, encoding="utf-8"))
+
+    package_logger = logging.getLogger(PACKAGE_LOGGER)
+    package_logger.setLevel(logging.DEBUG if verbose else logging.INFO)
+    package_logger.propagate = False
+
+    for handler in list(package_logger.handlers):
+        package_logger.removeHandler(handler)
+    for handler in handlers:
+        handler.setFormatter(formatter)
+        package_logger.addHandler(handler)
+
+    for name, level in levels.items():
+        logging.getLogger(name).setLevel(level)
+
+    return package_logger
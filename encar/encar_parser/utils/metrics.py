@@ -0,0 +1,230 @@
+"""
+Process metrics in Prometheus text format
+Метрики процесса в текстовом формате Prometheus
+"""
+
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+# Границы бакетов гистограмм длительностей (секунды)
+DEFAULT_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+
+METRIC_PREFIX = "encar_"
+
+
+class MetricsRegistry:
+    """
+    Потокобезопасный реестр счетчиков, gauge-метрик и гистограмм.
+    Один экземпляр на процесс (METRICS), общий для всех парсеров.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """
+        Args:
+            buckets: Границы бакетов гистограмм
+        """
+        self.buckets = tuple(buckets)
+        self.lock = threading.Lock()
+        self.started_at = time.time()
+
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+        self.help = {}
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(labels.items()))
+
+    def describe(self, name, text):
+        """Описание метрики (строка # HELP)"""
+        self.help[name] = text
+
+    def inc(self, name, value=1, **labels):
+        """Увеличение счетчика"""
+        key = self._key(name, labels)
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def set_gauge(self, name, value, **labels):
+        """Установка значения gauge"""
+        with self.lock:
+            self.gauges[self._key(name, labels)] = value
+
+    def add_gauge(self, name, delta, **labels):
+        """Изменение gauge на delta"""
+        key = self._key(name, labels)
+        with self.lock:
+            self.gauges[key] = self.gauges.get(key, 0) + delta
+
+    def observe(self, name, value, **labels):
+        """Добавление значения в гистограмму"""
+        key = self._key(name, labels)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+                self.histograms[key] = histogram
+
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    histogram["buckets"][i] += 1
+            histogram["sum"] += value
+            histogram["count"] += 1
+
+    def get_counter(self, name, **labels):
+        """Текущее значение счетчика"""
+        with self.lock:
+            return self.counters.get(self._key(name, labels), 0)
+
+    def render(self):
+        """
+        Формирование текста в формате Prometheus exposition
+
+        Returns:
+            str: Текст метрик
+        """
+        uptime = time.time() - self.started_at
+        lines = []
+
+        def header(name, kind):
+            full_name = METRIC_PREFIX + name
+            if name in self.help:
+                lines.append(f"# HELP {full_name} {self.help[name]}")
+            lines.append(f"# TYPE {full_name} {kind}")
+
+        with self.lock:
+            counters = dict(self.counters)
+            gauges = dict(self.gauges)
+            histograms = {
+                key: {**value, "buckets": list(value["buckets"])}
+                for key, value in self.histograms.items()
+            }
+
+        gauges[("uptime_seconds", ())] = round(uptime, 3)
+        parsed = counters.get(("parser_successful_total", ()), 0)
+        gauges[("cars_per_second", ())] = round(parsed / uptime, 4) if uptime else 0
+        hits = counters.get(("translation_cache_hits_total", ()), 0)
+        lookups = hits + counters.get(("translation_cache_misses_total", ()), 0)
+        if lookups:
+            gauges[("translation_cache_hit_ratio", ())] = round(hits / lookups, 4)
+
+        for kind, metrics in (("counter", counters), ("gauge", gauges)):
+            for name in sorted({key[0] for key in metrics}):
+                header(name, kind)
+                for (metric_name, labels), value in sorted(metrics.items()):
+                    if metric_name == name:
+                        lines.append(f"{METRIC_PREFIX}{name}{_labels(labels)} {value}")
+
+        for name in sorted({key[0] for key in histograms}):
+            header(name, "histogram")
+            for (metric_name, labels), histogram in sorted(histograms.items()):
+                if metric_name != name:
+                    continue
+                for bound, count in zip(self.buckets, histogram["buckets"]):
+                    bucket_labels = labels + (("le", str(bound)),)
+                    lines.append(f"{METRIC_PREFIX}{name}_bucket{_labels(bucket_labels)} {count}")
+                inf_labels = labels + (("le", "+Inf"),)
+                lines.append(f"{METRIC_PREFIX}{name}_bucket{_labels(inf_labels)} {histogram['count']}")
+                lines.append(f"{METRIC_PREFIX}{name}_sum{_labels(labels)} {round(histogram['sum'], 6)}")
+                lines.append(f"{METRIC_PREFIX}{name}_count{_labels(labels)} {histogram['count']}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels):
+    """Форматирование меток {a="b",...}"""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def _escape(value):
+    """Экранирование значения метки"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+METRICS = MetricsRegistry()
+METRICS.describe("parser_stage_duration_seconds", "Duration of parser stages")
+METRICS.describe("parser_successful_total", "Cars parsed successfully")
+METRICS.describe("parser_failed_total", "Cars that failed to parse")
+METRICS.describe("parser_captcha_detected_total", "Captcha pages detected")
+METRICS.describe("translation_cache_hits_total", "Translations served from TRANSLATION_CACHE")
+METRICS.describe("translation_cache_misses_total", "Translations requested from the API")
+METRICS.describe("translation_cache_hit_ratio", "Share of translations served from cache")
+METRICS.describe("cars_per_second", "Successfully parsed cars per second since process start")
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """HTTP-обработчик /metrics"""
+
+    registry = METRICS
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+
+        body = self.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Не засоряем stdout запросами скрапера
+        pass
+
+
+def start_metrics_server(port, host="0.0.0.0", registry=METRICS):
+    """
+    Запуск HTTP-эндпоинта /metrics в фоновом потоке
+
+    Проверка: curl http://localhost:<port>/metrics
+
+    Args:
+        port: Порт
+        host: Адрес для прослушивания
+        registry: Реестр метрик
+
+    Returns:
+        ThreadingHTTPServer: Запущенный сервер (для shutdown())
+    """
+    handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry})
+    server = ThreadingHTTPServer((host, port), handler)
+
+    thread = threading.Thread(
+        target=server.serve_forever, name="metrics-server", daemon=True
+    )
+    thread.start()
+
+    logger.info("Метрики доступны: http://%s:%s/metrics", host, port)
+    return server
+
+
+def write_metrics_textfile(filepath, registry=METRICS):
+    """
+    Запись метрик в файл для textfile-коллектора node_exporter
+    (атомарно, через временный файл)
+
+    Args:
+        filepath: Путь к .prom файлу
+        registry: Реестр метрик
+
+    Returns:
+        str: Путь к файлу
+    """
+    path = Path(filepath)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_text(registry.render(), encoding="utf-8")
+    tmp_path.replace(path)
+    return str(path)
@@ -0,0 +1,113 @@
+"""
+Captcha quarantine
+Очередь автомобилей, отложенных из-за капчи (вместо ожидания ручного решения)
+"""
+
+import logging
+import threading
+from collections import Counter
+from datetime import datetime
+
+from encar_parser.utils.file_handler import save_to_json
+
+logger = logging.getLogger(__name__)
+
+
+class CaptchaQuarantine:
+    """
+    Потокобезопасная очередь URL, на которых сработала капча.
+    Парсер не ждет решения капчи, а откладывает URL и продолжает работу;
+    отложенные URL можно повторить позже или сохранить в отчет.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries = {}
+        self.total = 0
+
+    def add(self, car_url, match=None):
+        """
+        Добавление URL в карантин
+
+        Args:
+            car_url: URL страницы автомобиля
+            match: Признак капчи из CaptchaHandler.last_match
+        """
+        with self.lock:
+            entry = self.entries.get(car_url)
+            if entry is None:
+                entry = {"url": car_url, "attempts": 0, "first_seen": _now()}
+                self.entries[car_url] = entry
+                self.total += 1
+
+            entry["attempts"] += 1
+            entry["last_seen"] = _now()
+            if match or "reason" not in entry:
+                entry["reason"] = match["type"] if match else "unknown"
+
+        logger.warning("Автомобиль отложен из-за капчи: %s", car_url)
+
+    def release(self, car_url):
+        """Удаление URL из карантина (после успешного повтора)"""
+        with self.lock:
+            self.entries.pop(car_url, None)
+
+    def get_urls(self, max_attempts=None):
+        """
+        URL для повторной попытки
+
+        Args:
+            max_attempts: Пропускать URL с большим числом попыток
+
+        Returns:
+            list: URL в порядке добавления
+        """
+        with self.lock:
+            return [
+                url
+                for url, entry in self.entries.items()
+                if max_attempts is None or entry["attempts"] < max_attempts
+            ]
+
+    def get_summary(self):
+        """
+        Сводка по карантину
+
+        Returns:
+            dict: Количество отложенных URL, причины и сами записи
+        """
+        with self.lock:
+            entries = [dict(entry) for entry in self.entries.values()]
+            return {
+                "pending": len(entries),
+                "total": self.total,
+                "reasons": dict(Counter(entry["reason"] for entry in entries)),
+                "cars": entries,
+            }
+
+    def save(self, filename=None, output_dir="output"):
+        """
+        Сохранение отложенных автомобилей для повторного запуска
+
+        Args:
+            filename: Имя файла (по умолчанию quarantine_<timestamp>.json)
+            output_dir: Директория для сохранения
+
+        Returns:
+            str или None: Путь к файлу или None, если карантин пуст
+        """
+        summary = self.get_summary()
+        if not summary["cars"]:
+            return None
+
+        if filename is None:
+            filename = f"quarantine_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        return save_to_json(summary, filename, output_dir)
+
+
+def _now():
+    return datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+
+
+# Общий карантин процесса (все EncarParser и потоки пула)
+QUARANTINE = CaptchaQuarantine()
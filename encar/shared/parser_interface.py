@@ -3,46 +3,105 @@
 """
 
 import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
 
 from encar_parser.core.parser import EncarParser
+from encar_parser.utils.car_ids import car_detail_url
+from encar_parser.utils.file_handler import save_to_csv, save_to_json
+from encar_parser.utils.metrics import METRICS
+from encar_parser.utils.retry import RetryableError, RetryManager
+
+# Пул потоков парсера: каждый поток держит свой Chrome, поэтому размер
+# пула ограничивает количество одновременно запущенных браузеров
+PARSE_POOL_SIZE = int(os.getenv("PARSER_WORKERS", "2"))
+_parse_pool = ThreadPoolExecutor(
+    max_workers=PARSE_POOL_SIZE, thread_name_prefix="encar-parser"
+)
+METRICS.set_gauge("parser_pool_size", PARSE_POOL_SIZE)
+METRICS.set_gauge("parser_pool_active", 0)
+METRICS.set_gauge("parser_pool_queued", 0)
+
+
+async def _run_in_pool(func, *args):
+    """
+    Выполнение задачи в пуле парсера с учетом метрик очереди и загрузки
+    """
 
+    def _tracked():
+        METRICS.add_gauge("parser_pool_queued", -1)
+        METRICS.add_gauge("parser_pool_active", 1)
+        try:
+            return func(*args)
+        finally:
+            METRICS.add_gauge("parser_pool_active", -1)
+
+    METRICS.add_gauge("parser_pool_queued", 1)
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(_parse_pool, _tracked)
 
-async def parse_car_by_url(car_url: str, preset_brand: str = None) -> dict:  # type: ignore
+
+async def parse_car_by_url(
+    car_url: str, preset_brand: str = None, fields=None, retry: RetryManager = None  # type: ignore
+) -> dict:
     """
     Асинхронная обертка для парсера
 
+    При ошибке этапа, для которого разрешен повтор, задача после задержки
+    снова ставится в конец очереди пула (поток на время задержки свободен)
+
     Args:
         car_url: URL автомобиля
         preset_brand: Предустановленная марка (опционально)
+        fields: Набор этапов парсинга (None = все, см. PARSE_FIELDS)
+        retry: Менеджер повторов (общий бюджет для пакета); None = свой
 
     Returns:
         dict: Данные автомобиля
     """
-    # Запускаем парсер в executor для неблокирующего выполнения
-    loop = asyncio.get_event_loop()
-    result = await loop.run_in_executor(None, _parse_car_sync, car_url, preset_brand)
-    return result
+    if retry is None:
+        retry = RetryManager()
 
+    while True:
+        try:
+            # Запускаем парсер в executor для неблокирующего выполнения
+            return await _run_in_pool(_parse_car_sync, car_url, preset_brand, fields)
+        except RetryableError as e:
+            delay = retry.schedule(car_url, e.stage)
+            if delay is None:
+                raise
+            await asyncio.sleep(delay)
 
-def _parse_car_sync(car_url: str, preset_brand: str = None) -> dict:  # type: ignore
+
+def _parse_car_sync(car_url: str, preset_brand: str = None, fields=None) -> dict:  # type: ignore
     """
     Синхронная функция парсинга
     """
     parser = None
     try:
-        # Создаем парсер (headless для серверного режима)
+        # Создаем парсер (headless для серверного режима); парсер закрывается
+        # после одного автомобиля, поэтому при капче Chrome не перезапускается
         parser = EncarParser(
-            headless=True, enable_translation=True, preset_brand=preset_brand
+            headless=True, enable_translation=True, preset_brand=preset_brand, one_shot=True
         )
 
         # Парсим автомобиль
-        car_data = parser.parse_car_page(car_url)
-
+        car_data = parser.parse_car_page(car_url, fields=fields)
+
+        if not car_data and car_url in parser.quarantined_urls:
+            raise Exception("Encar показал капчу, автомобиль отложен - повторите позже")
+        if not car_data and parser.last_failure:
+            raise RetryableError(
+                f"Ошибка парсинга: {parser.last_failure['error']}",
+                parser.last_failure["stage"],
+            )
         if not car_data:
             raise Exception("Не удалось получить данные автомобиля")
 
         return car_data
 
+    except RetryableError:
+        raise
     except Exception as e:
         raise Exception(f"Ошибка парсинга: {str(e)}")
 
@@ -51,16 +110,101 @@ def _parse_car_sync(car_url: str, preset_brand: str = None) -> dict:  # type: ig
             parser.close()
 
 
-async def parse_car_by_id(car_id: str, preset_brand: str = None) -> dict:  # type: ignore
+async def parse_car_by_id(
+    car_id: str, preset_brand: str = None, fields=None, retry: RetryManager = None  # type: ignore
+) -> dict:
     """
     Парсинг по ID автомобиля
 
     Args:
         car_id: ID автомобиля
         preset_brand: Предустановленная марка
+        fields: Набор этапов парсинга (None = все, см. PARSE_FIELDS)
+        retry: Менеджер повторов (None = свой)
 
     Returns:
         dict: Данные автомобиля
     """
-    car_url = f"https://fem.encar.com/cars/detail/{car_id}?carid={car_id}"
-    return await parse_car_by_url(car_url, preset_brand)
+    car_url = car_detail_url(car_id)
+    return await parse_car_by_url(car_url, preset_brand, fields, retry)
+
+
+async def parse_cars_by_ids(car_ids, preset_brand: str = None, fields=None):  # type: ignore
+    """
+    Пакетный парсинг: распределяет ID по пулу парсера и отдает результаты
+    по мере готовности
+
+    Args:
+        car_ids: Список ID автомобилей
+        preset_brand: Предустановленная марка
+        fields: Набор этапов парсинга (None = все, см. PARSE_FIELDS)
+
+    Yields:
+        tuple: (car_id, данные или None, ошибка или None)
+    """
+
+    # Один бюджет повторов на весь пакет
+    retry = RetryManager()
+
+    async def _parse_one(car_id):
+        try:
+            return car_id, await parse_car_by_id(car_id, preset_brand, fields, retry), None
+        except Exception as e:
+            return car_id, None, e
+
+    for task in asyncio.as_completed([_parse_one(car_id) for car_id in car_ids]):
+        yield await task
+
+
+def save_batch_results(cars_data: list, filename: str, output_dir: str = "output") -> dict:
+    """
+    Сохранение результатов пакетного парсинга в JSON и CSV
+
+    Args:
+        cars_data: Список данных автомобилей
+        filename: Имя файла без расширения
+        output_dir: Директория для сохранения
+
+    Returns:
+        dict: Пути к файлам {"json": ..., "csv": ...}
+    """
+    return {
+        "json": save_to_json(cars_data, f"{filename}.json", output_dir),
+        "csv": save_to_csv(cars_data, f"{filename}.csv", output_dir),
+    }
+
+
+async def parse_car_options_by_id(car_id: str) -> dict:
+    """
+    Получение только опций автомобиля (без парсинга основной страницы)
+
+    Args:
+        car_id: ID автомобиля
+
+    Returns:
+        dict: Словарь опций
+    """
+    return await _run_in_pool(_parse_options_sync, car_id)
+
+
+def _parse_options_sync(car_id: str) -> dict:
+    """
+    Синхронная функция получения опций
+    """
+    parser = None
+    try:
+        parser = EncarParser(headless=True, enable_translation=True, one_shot=True)
+
+        options = parser.parse_car_options(car_id)
+
+        if options is None:
+            raise Exception("Не удалось получить опции автомобиля")
+
+        return options
+
+    except Exception as e:
+        raise Exception(f"Ошибка получения опций: {str(e)}")
+
+    finally:
+        if parser:
+            parser.close()
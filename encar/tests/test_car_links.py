@@ -0,0 +1,71 @@
+"""
+Тесты извлечения ID автомобилей из сообщений и файлов пакетного режима
+"""
+
+from encar_bot.utils.car_links import extract_car_id, extract_car_ids
+
+DEALER_CSV = """carid,model,price,mileage,year,phone
+40647630,Sonata DN8,25000000,123456,20210315,01012345678
+39912345,Avante CN7,18500000,45000,20200101,01098765432
+40647630,Sonata DN8,25000000,123456,20210315,01012345678
+"""
+
+URL_CSV = """Model;Price;Mileage;URL
+Grandeur;31000000;88000;https://fem.encar.com/cars/detail/38800001?carid=38800001
+K5;22000000;510000;"http://www.encar.com/dc/dc_cardetailview.do?carid=38800002"
+"""
+
+
+def test_extract_car_id_from_link():
+    assert extract_car_id("https://fem.encar.com/cars/detail/40647630?carid=40647630") == "40647630"
+    assert extract_car_id("https://fem.encar.com/cars/detail/40647630") == "40647630"
+    assert extract_car_id("25000000") is None
+
+
+def test_csv_reads_only_id_column():
+    assert extract_car_ids(DEALER_CSV) == ["40647630", "39912345"]
+
+
+def test_csv_url_column_with_semicolons():
+    assert extract_car_ids(URL_CSV) == ["38800001", "38800002"]
+
+
+def test_csv_with_bom_header():
+    assert extract_car_ids("\ufeffid,price\n40647630,25000000\n") == ["40647630"]
+
+
+def test_csv_without_id_column_ignores_numbers():
+    text = "model,price,mileage\nSonata,25000000,123456\nK5,22000000,510000\n"
+    assert extract_car_ids(text) == []
+
+
+def test_plain_lines_of_ids():
+    text = "40647630\n 39912345 \n\"38800001\",\n"
+    assert extract_car_ids(text) == ["40647630", "39912345", "38800001"]
+
+
+def test_message_with_numbers_is_not_batch():
+    text = "Цена 25000000, пробег 123456, телефон 01012345678"
+    assert extract_car_ids(text) == []
+
+
+def test_links_inside_text():
+    text = (
+        "Посмотрите https://fem.encar.com/cars/detail/40647630?carid=40647630, "
+        "и еще https://fem.encar.com/cars/detail/39912345 (цена 18500000)"
+    )
+    assert extract_car_ids(text) == ["40647630", "39912345"]
+
+
+def test_several_ids_on_one_line():
+    assert extract_car_ids("40647630, 39912345") == ["40647630", "39912345"]
+    assert extract_car_ids("40647630 39912345;38800001") == ["40647630", "39912345", "38800001"]
+
+
+def test_headerless_csv_of_ids():
+    text = "40647630,39912345,38800001\n38800002,40647630\n"
+    assert extract_car_ids(text) == ["40647630", "39912345", "38800001", "38800002"]
+
+
+def test_line_mixing_ids_and_other_numbers_is_ignored():
+    assert extract_car_ids("40647630 25000000 км") == []
@@ -11,6 +11,15 @@ class BotConfig:
 
     token: str
     admin_ids: list[int] = None  # type: ignore
+    batch_max_cars: int = 50  # Максимум автомобилей в пакетном режиме
+    storage_path: str = "data/bot.sqlite3"  # База FSM, задач и кэша результатов
+    result_cache_ttl: int = 6 * 3600  # Время жизни кэша результатов (секунды)
+    image_check: bool = True  # Проверять URL изображений перед отправкой
+    image_resize: bool = False  # Скачивать и уменьшать изображения (нужен Pillow)
+    metrics_port: int = 0  # Порт эндпоинта /metrics (0 = отключен)
+    profile_mode: str = ""  # Профилирование парсера: "", "cprofile" или "sample"
+    index_path: str = "output/catalog_index.sqlite3"  # Индекс результатов для /search
+    index_sync_interval: int = 600  # Как часто добавлять в индекс новые файлы (секунды)
 
     def __post_init__(self):
         if self.admin_ids is None:
@@ -27,4 +36,26 @@ def load_config() -> BotConfig:
     admin_ids_str = os.getenv("ADMIN_IDS", "")
     admin_ids = [int(id.strip()) for id in admin_ids_str.split(",") if id.strip()]
 
-    return BotConfig(token=token, admin_ids=admin_ids)
+    batch_max_cars = int(os.getenv("BATCH_MAX_CARS", "50"))
+    storage_path = os.getenv("BOT_STORAGE_PATH", "data/bot.sqlite3")
+    result_cache_ttl = int(os.getenv("RESULT_CACHE_TTL", str(6 * 3600)))
+    image_check = os.getenv("IMAGE_CHECK", "1") == "1"
+    image_resize = os.getenv("IMAGE_RESIZE", "0") == "1"
+    metrics_port = int(os.getenv("METRICS_PORT", "0"))
+    profile_mode = os.getenv("PARSER_PROFILE", "").strip().lower()
+    index_path = os.getenv("CATALOG_INDEX_PATH", "output/catalog_index.sqlite3")
+    index_sync_interval = int(os.getenv("INDEX_SYNC_INTERVAL", "600"))
+
+    return BotConfig(
+        token=token,
+        admin_ids=admin_ids,
+        batch_max_cars=batch_max_cars,
+        storage_path=storage_path,
+        result_cache_ttl=result_cache_ttl,
+        image_check=image_check,
+        image_resize=image_resize,
+        metrics_port=metrics_port,
+        profile_mode=profile_mode,
+        index_path=index_path,
+        index_sync_interval=index_sync_interval,
+    )
@@ -0,0 +1,188 @@
+"""
+Хэндлеры пакетной обработки (много ссылок за раз)
+"""
+
+import asyncio
+import logging
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+from aiogram import F, Router, types
+from aiogram.filters import Command, StateFilter
+from aiogram.fsm.context import FSMContext
+from aiogram.types import FSInputFile
+
+from encar_bot.config import BotConfig
+from encar_bot.states import ParserStates
+from encar_bot.storage import JobStore
+from encar_bot.utils.car_links import extract_car_ids
+from encar_bot.utils.formatters import format_batch_summary, format_car_short
+from encar_bot.utils.jobs import run_batch_jobs
+from encar_parser.data.catalog_index import CatalogIndex
+from shared.parser_interface import save_batch_results
+
+batch_router = Router()
+logger = logging.getLogger(__name__)
+
+# Поля для пакетного режима (опции не нужны, см. CARD_FIELDS)
+BATCH_FIELDS = {"summary", "details", "images"}
+
+# Допустимые файлы со списком ссылок
+BATCH_FILE_EXTENSIONS = {".txt", ".csv"}
+BATCH_FILE_MAX_SIZE = 1024 * 1024  # 1 МБ
+
+# Как часто обновлять сообщение с прогрессом
+PROGRESS_EVERY = 5
+
+
+async def run_batch(
+    message: types.Message,
+    car_ids: list[str],
+    config: BotConfig,
+    job_store: JobStore,
+    catalog_index: CatalogIndex = None,
+):
+    """
+    Пакетная обработка списка ID: результаты отправляются по мере готовности,
+    в конце - сводный JSON и CSV
+
+    Файлы сохраняются во временный каталог и в output не попадают, поэтому
+    результаты сразу добавляются в индекс /search.
+    """
+    if len(car_ids) > config.batch_max_cars:
+        await message.answer(
+            f"⚠️ Найдено {len(car_ids)} автомобилей, "
+            f"будут обработаны первые {config.batch_max_cars}.",
+            parse_mode="HTML",
+        )
+        car_ids = car_ids[: config.batch_max_cars]
+
+    total = len(car_ids)
+    status_msg = await message.answer(
+        f"📦 Пакетная обработка: {total} автомобилей\n⏳ Готово: 0/{total}",
+        parse_mode="HTML",
+    )
+
+    cars_data = []
+    failed_ids = []
+    done = 0
+
+    async for car_id, car_data, error in run_batch_jobs(
+        job_store, message.chat.id, car_ids, fields=BATCH_FIELDS
+    ):
+        done += 1
+
+        if car_data:
+            cars_data.append(car_data)
+            await message.answer(format_car_short(car_data), parse_mode="HTML")
+        else:
+            failed_ids.append(car_id)
+            logger.error(f"Ошибка пакетного парсинга car_id={car_id}: {error}")
+
+        if done % PROGRESS_EVERY == 0 or done == total:
+            try:
+                await status_msg.edit_text(
+                    f"📦 Пакетная обработка: {total} автомобилей\n"
+                    f"⏳ Готово: {done}/{total}",
+                    parse_mode="HTML",
+                )
+            except Exception as e:
+                logger.warning(f"Не удалось обновить прогресс: {e}")
+
+    await message.answer(
+        format_batch_summary(total, len(cars_data), failed_ids), parse_mode="HTML"
+    )
+
+    if not cars_data:
+        return
+
+    if catalog_index is not None:
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(None, catalog_index.ingest_cars, cars_data, "bot:batch")
+        except Exception as e:
+            logger.error(f"Не удалось добавить результаты пакета в индекс: {e}")
+
+    # Сводные файлы
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = f"batch_{message.chat.id}_{timestamp}"
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        files = save_batch_results(cars_data, filename, output_dir=tmp_dir)
+
+        for path in files.values():
+            if path:
+                await message.answer_document(FSInputFile(path))
+
+
+@batch_router.message(Command("batch"))
+async def cmd_batch(message: types.Message, state: FSMContext):
+    """Обработчик команды /batch"""
+    await state.set_state(ParserStates.waiting_for_batch)
+    await message.answer(
+        "📦 <b>Пакетный режим</b>\n\n"
+        "Отправьте несколько ссылок одним сообщением "
+        "или файл <code>.txt</code>/<code>.csv</code> со ссылками или ID.",
+        parse_mode="HTML",
+    )
+
+
+@batch_router.message(ParserStates.waiting_for_batch, F.text)
+async def process_batch_text(
+    message: types.Message,
+    state: FSMContext,
+    config: BotConfig,
+    job_store: JobStore,
+    catalog_index: CatalogIndex,
+):
+    """Обработчик списка ссылок в пакетном режиме"""
+    car_ids = extract_car_ids(message.text)  # type: ignore
+
+    if not car_ids:
+        await message.answer(
+            "❌ Не найдено ни одной ссылки или ID автомобиля.", parse_mode="HTML"
+        )
+        return
+
+    await run_batch(message, car_ids, config, job_store, catalog_index)
+    await state.set_state(ParserStates.waiting_for_link)
+
+
+@batch_router.message(
+    StateFilter(ParserStates.waiting_for_link, ParserStates.waiting_for_batch),
+    F.document,
+)
+async def process_batch_file(
+    message: types.Message,
+    state: FSMContext,
+    config: BotConfig,
+    job_store: JobStore,
+    catalog_index: CatalogIndex,
+):
+    """Обработчик файла со ссылками"""
+    document = message.document
+
+    if Path(document.file_name or "").suffix.lower() not in BATCH_FILE_EXTENSIONS:  # type: ignore
+        await message.answer(
+            "⚠️ Поддерживаются только файлы .txt и .csv", parse_mode="HTML"
+        )
+        return
+
+    if (document.file_size or 0) > BATCH_FILE_MAX_SIZE:  # type: ignore
+        await message.answer("⚠️ Файл слишком большой (максимум 1 МБ)", parse_mode="HTML")
+        return
+
+    content = await message.bot.download(document)  # type: ignore
+    text = content.read().decode("utf-8", errors="ignore")  # type: ignore
+
+    car_ids = extract_car_ids(text)
+    if not car_ids:
+        await message.answer(
+            "❌ В файле не найдено ни одной ссылки или ID автомобиля.",
+            parse_mode="HTML",
+        )
+        return
+
+    await run_batch(message, car_ids, config, job_store, catalog_index)
+    await state.set_state(ParserStates.waiting_for_link)
@@ -6,22 +6,48 @@ import logging
 
 from aiogram import F, Router, types
 from aiogram.fsm.context import FSMContext
-from aiogram.types import InputMediaPhoto
 
+from encar_bot.config import BotConfig
+from encar_bot.handlers.batch import run_batch
 from encar_bot.keyboards import get_car_link_keyboard
 from encar_bot.states import ParserStates
-from encar_bot.utils.formatters import format_car_images, format_car_info
-from encar_bot.utils.parser import extract_car_id, run_encar_parser
+from encar_bot.storage import JobStore
+from encar_bot.utils.car_links import extract_car_id, extract_car_ids
+from encar_bot.utils.formatters import (
+    format_car_images,
+    format_car_info,
+    format_car_options,
+)
+from encar_bot.utils.images import ImagePipeline
+from encar_bot.utils.jobs import get_car_data
+from encar_bot.utils.parser import run_encar_options_parser
+from encar_parser.data.catalog_index import CatalogIndex
 
 parser_router = Router()
 logger = logging.getLogger(__name__)
 
+# Для карточки опции не нужны - они загружаются по кнопке
+CARD_FIELDS = {"summary", "details", "images"}
+
 
 @parser_router.message(ParserStates.waiting_for_link, F.text)
-async def process_link(message: types.Message, state: FSMContext):
+async def process_link(
+    message: types.Message,
+    state: FSMContext,
+    config: BotConfig,
+    job_store: JobStore,
+    image_pipeline: ImagePipeline,
+    catalog_index: CatalogIndex,
+):
     """Обработчик ссылок на автомобили"""
     url = message.text.strip()  # type: ignore
 
+    # Несколько ссылок в одном сообщении - пакетный режим
+    car_ids = extract_car_ids(url)
+    if len(car_ids) > 1:
+        await run_batch(message, car_ids, config, job_store, catalog_index)
+        return
+
     # Валидация URL
     if not url.startswith("http"):
         await message.answer(
@@ -50,7 +76,9 @@ async def process_link(message: types.Message, state: FSMContext):
 
     try:
         # ЗАПУСК ПАРСЕРА
-        car_data = await run_encar_parser(car_id)
+        car_data = await get_car_data(
+            job_store, message.chat.id, car_id, fields=CARD_FIELDS
+        )
 
         # Форматирование текста
         formatted_message = format_car_info(car_data)
@@ -61,16 +89,12 @@ async def process_link(message: types.Message, state: FSMContext):
         # Отправка изображений (если есть)
         images = format_car_images(car_data)
         if images:
-            media_group = [InputMediaPhoto(media=url) for url in images[:10]]
-            try:
-                await message.answer_media_group(media_group)  # type: ignore
-            except Exception as e:
-                logger.error(f"Ошибка отправки изображений: {e}")
+            await image_pipeline.send(message, images)
 
         # Кнопка со ссылкой
         await message.answer(
             "✅ Готово! Отправьте ещё одну ссылку для парсинга.",
-            reply_markup=get_car_link_keyboard(url),
+            reply_markup=get_car_link_keyboard(url, car_id),
         )
 
     except Exception as e:
@@ -87,6 +111,33 @@ async def process_link(message: types.Message, state: FSMContext):
         )
 
 
+@parser_router.callback_query(F.data.startswith("options:"))
+async def show_options(callback: types.CallbackQuery, job_store: JobStore):
+    """Обработчик кнопки "Показать опции" """
+    car_id = callback.data.partition(":")[2]  # type: ignore
+
+    await callback.answer("⏳ Получаю опции...")
+
+    try:
+        cached = job_store.get_result(car_id, {"options"})
+        if cached and cached.get("options") is not None:
+            options = cached["options"]
+        else:
+            # При ошибке парсер бросает исключение - в кэш ничего не пишется
+            options = await run_encar_options_parser(car_id)
+            job_store.update_result_options(car_id, options)
+        await callback.message.answer(  # type: ignore
+            format_car_options(options), parse_mode="HTML"
+        )
+
+    except Exception as e:
+        logger.error(f"Ошибка получения опций car_id={car_id}: {e}", exc_info=True)
+        await callback.message.answer(  # type: ignore
+            f"❌ Не удалось получить опции:\n<code>{str(e)}</code>",
+            parse_mode="HTML",
+        )
+
+
 @parser_router.message()
 async def handle_other_messages(message: types.Message):
     """Обработчик остальных сообщений"""
@@ -1,21 +1,30 @@
 from aiogram import types
 
 
-def get_car_link_keyboard(url: str) -> types.InlineKeyboardMarkup:
+def get_car_link_keyboard(url: str, car_id: str = None) -> types.InlineKeyboardMarkup:  # type: ignore
     """
     Создает клавиатуру со ссылкой на автомобиль
 
     Args:
         url: Ссылка на автомобиль
+        car_id: ID автомобиля (если задан, добавляется кнопка опций)
 
     Returns:
         Inline клавиатура
     """
-    return types.InlineKeyboardMarkup(
-        inline_keyboard=[
+    inline_keyboard = [
+        [types.InlineKeyboardButton(
+            text="🔗 Открыть на Encar",
+            url=url
+        )]
+    ]
+
+    if car_id:
+        inline_keyboard.append(
             [types.InlineKeyboardButton(
-                text="🔗 Открыть на Encar",
-                url=url
+                text="📋 Показать опции",
+                callback_data=f"options:{car_id}"
             )]
-        ]
-    )
+        )
+
+    return types.InlineKeyboardMarkup(inline_keyboard=inline_keyboard)
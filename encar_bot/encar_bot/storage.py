@@ -0,0 +1,344 @@
+"""
+Персистентное хранилище бота на SQLite
+FSM-состояния, задачи парсинга и кэш результатов переживают перезапуск
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StateType, StorageKey
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS fsm (
+    key TEXT PRIMARY KEY,
+    state TEXT,
+    data TEXT NOT NULL DEFAULT '{}'
+);
+
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    chat_id INTEGER NOT NULL,
+    car_id TEXT NOT NULL,
+    fields TEXT NOT NULL,
+    status TEXT NOT NULL,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status);
+CREATE INDEX IF NOT EXISTS jobs_updated ON jobs (updated_at);
+
+CREATE TABLE IF NOT EXISTS results (
+    car_id TEXT PRIMARY KEY,
+    fields TEXT NOT NULL,
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS file_ids (
+    url TEXT PRIMARY KEY,
+    file_id TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+# Статусы задач
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+# Как часто удалять старые завершенные задачи (каждые N новых задач)
+JOB_PRUNE_EVERY = 100
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    """Открытие базы (одно соединение на процесс, WAL для быстрых записей)"""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+    conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _fields_key(fields) -> str:
+    """Набор этапов парсинга в строку для хранения"""
+    return ",".join(sorted(fields)) if fields else ""
+
+
+def _fields_set(fields_key: str) -> Optional[set]:
+    """Обратное преобразование (пустая строка = все этапы)"""
+    return set(fields_key.split(",")) if fields_key else None
+
+
+class SQLiteStorage(BaseStorage):
+    """
+    FSM-хранилище aiogram поверх SQLite (замена MemoryStorage)
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Путь к файлу базы
+        """
+        self.conn = _connect(path)
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def _key(key: StorageKey) -> str:
+        return ":".join(
+            str(part)
+            for part in (
+                key.bot_id,
+                key.chat_id,
+                key.user_id,
+                key.thread_id,
+                key.business_connection_id,
+                key.destiny,
+            )
+        )
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        value = state.state if isinstance(state, State) else state
+        with self.lock:
+            self.conn.execute(
+                "INSERT INTO fsm (key, state) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET state = excluded.state",
+                (self._key(key), value),
+            )
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT state FROM fsm WHERE key = ?", (self._key(key),)
+            ).fetchone()
+        return row["state"] if row else None
+
+    async def set_data(self, key: StorageKey, data: Dict[str, Any]) -> None:
+        with self.lock:
+            self.conn.execute(
+                "INSERT INTO fsm (key, data) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET data = excluded.data",
+                (self._key(key), json.dumps(data, ensure_ascii=False)),
+            )
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT data FROM fsm WHERE key = ?", (self._key(key),)
+            ).fetchone()
+        return json.loads(row["data"]) if row else {}
+
+    async def close(self) -> None:
+        with self.lock:
+            self.conn.close()
+
+
+class JobStore:
+    """
+    Хранилище задач парсинга и кэш результатов
+    """
+
+    def __init__(
+        self,
+        path: str = None,  # type: ignore
+        result_ttl: int = 6 * 3600,
+        storage: SQLiteStorage = None,  # type: ignore
+    ):
+        """
+        Args:
+            path: Путь к файлу базы (если storage не задан)
+            result_ttl: Время жизни кэшированного результата (секунды);
+                завершенные задачи старше него удаляются
+            storage: FSM-хранилище, соединение и блокировка которого
+                используются (одно соединение на файл базы)
+        """
+        if storage is not None:
+            self.conn = storage.conn
+            self.lock = storage.lock
+        else:
+            self.conn = _connect(path)
+            self.lock = threading.Lock()
+        self.owns_connection = storage is None
+        self.result_ttl = result_ttl
+        self.created_jobs = 0
+
+    def create_job(self, chat_id: int, car_id: str, fields=None) -> int:
+        """
+        Регистрация новой задачи
+
+        Returns:
+            int: ID задачи
+        """
+        now = time.time()
+        with self.lock:
+            cursor = self.conn.execute(
+                "INSERT INTO jobs (chat_id, car_id, fields, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (chat_id, car_id, _fields_key(fields), JOB_PENDING, now, now),
+            )
+            self.created_jobs += 1
+            should_prune = self.created_jobs % JOB_PRUNE_EVERY == 0
+
+        if should_prune:
+            self.prune_jobs()
+        return cursor.lastrowid  # type: ignore
+
+    def prune_jobs(self) -> int:
+        """
+        Удаление завершенных задач старше result_ttl
+
+        Returns:
+            int: Количество удаленных задач
+        """
+        with self.lock:
+            cursor = self.conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?",
+                (JOB_DONE, JOB_FAILED, time.time() - self.result_ttl),
+            )
+        return cursor.rowcount
+
+    def set_job_status(self, job_id: int, status: str, error: str = None):  # type: ignore
+        """Обновление статуса задачи"""
+        with self.lock:
+            self.conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE id = ?",
+                (status, error, time.time(), job_id),
+            )
+
+    def get_unfinished_jobs(self) -> list[dict]:
+        """
+        Задачи, не завершенные к моменту остановки бота
+
+        Returns:
+            list: Словари с полями id, chat_id, car_id, fields
+        """
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT id, chat_id, car_id, fields FROM jobs "
+                "WHERE status IN (?, ?) ORDER BY id",
+                (JOB_PENDING, JOB_RUNNING),
+            ).fetchall()
+
+        return [
+            {
+                "id": row["id"],
+                "chat_id": row["chat_id"],
+                "car_id": row["car_id"],
+                "fields": _fields_set(row["fields"]),
+            }
+            for row in rows
+        ]
+
+    def save_result(self, car_id: str, car_data: dict, fields=None):
+        """Сохранение результата парсинга в кэш"""
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO results (car_id, fields, data, updated_at) "
+                "VALUES (?, ?, ?, ?)",
+                (
+                    car_id,
+                    _fields_key(fields),
+                    json.dumps(car_data, ensure_ascii=False),
+                    time.time(),
+                ),
+            )
+
+    def get_result(self, car_id: str, fields=None) -> Optional[dict]:
+        """
+        Получение свежего результата из кэша
+
+        Args:
+            car_id: ID автомобиля
+            fields: Требуемые этапы (None = все). Результат подходит, только
+                если при его получении были выполнены все требуемые этапы
+
+        Returns:
+            dict или None: Данные автомобиля
+        """
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT fields, data, updated_at FROM results WHERE car_id = ?",
+                (car_id,),
+            ).fetchone()
+
+        if not row or time.time() - row["updated_at"] > self.result_ttl:
+            return None
+
+        cached_fields = _fields_set(row["fields"])
+        if cached_fields is not None and (fields is None or not set(fields) <= cached_fields):
+            return None
+
+        return json.loads(row["data"])
+
+    def update_result_options(self, car_id: str, options: dict):
+        """Добавление опций (полученных по запросу) к кэшированному результату"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT fields, data FROM results WHERE car_id = ?", (car_id,)
+            ).fetchone()
+            if not row:
+                return
+
+            fields = _fields_set(row["fields"])
+            if fields is not None:
+                fields.add("options")
+
+            data = json.loads(row["data"])
+            data["options"] = options
+            self.conn.execute(
+                "UPDATE results SET fields = ?, data = ? WHERE car_id = ?",
+                (_fields_key(fields), json.dumps(data, ensure_ascii=False), car_id),
+            )
+
+    def get_file_ids(self, urls: list[str]) -> dict:
+        """
+        Telegram file_id ранее отправленных изображений
+
+        Args:
+            urls: URL изображений
+
+        Returns:
+            dict: URL -> file_id (только найденные)
+        """
+        if not urls:
+            return {}
+
+        placeholders = ",".join("?" * len(urls))
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT url, file_id FROM file_ids WHERE url IN ({placeholders})",
+                list(urls),
+            ).fetchall()
+        return {row["url"]: row["file_id"] for row in rows}
+
+    def save_file_ids(self, file_ids: dict):
+        """Сохранение соответствий URL -> file_id"""
+        now = time.time()
+        with self.lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO file_ids (url, file_id, updated_at) VALUES (?, ?, ?)",
+                [(url, file_id, now) for url, file_id in file_ids.items()],
+            )
+
+    def delete_file_ids(self, urls: list[str]):
+        """Удаление устаревших file_id"""
+        with self.lock:
+            self.conn.executemany(
+                "DELETE FROM file_ids WHERE url = ?", [(url,) for url in urls]
+            )
+
+    def close(self):
+        """Закрытие соединения (общее соединение закрывает FSM-хранилище)"""
+        if not self.owns_connection:
+            return
+        with self.lock:
+            self.conn.close()
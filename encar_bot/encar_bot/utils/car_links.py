@@ -0,0 +1,106 @@
+"""
+Извлечение ID автомобилей Encar из ссылок, сообщений и файлов
+"""
+
+import csv
+import io
+import re
+from typing import Optional
+
+# Голый ID - строка целиком (цены, пробег и телефоны внутри строк не ID)
+CAR_ID_PATTERN = re.compile(r"\d{6,}")
+# Ссылки ищутся в исходном тексте, а не в токенах после разбиения
+URL_PATTERN = re.compile(r"https?://[^\s\"'<>,;]+")
+# Колонки CSV, значения которых - ID или ссылки
+CSV_ID_COLUMNS = ("carid", "car_id", "id", "url", "link")
+# Символы, окружающие ID в строке ("40647630", 40647630;)
+LINE_STRIP_CHARS = " \t\"',;"
+# Разделители нескольких ID в одной строке
+ID_SEPARATORS = re.compile(r"[\s,;]+")
+
+
+def extract_car_id(url: str) -> Optional[str]:
+    """Извлекает ID автомобиля из ссылки Encar"""
+    patterns = [
+        r"carid=(\d+)",
+        r"/detail/(\d+)",
+        r"/(\d+)\?",
+    ]
+
+    for pattern in patterns:
+        match = re.search(pattern, url)
+        if match:
+            return match.group(1)
+
+    return None
+
+
+def _extract_from_value(value: str) -> list[str]:
+    """
+    ID из одного значения: строка только из ID (через пробелы, запятые
+    или точки с запятой) - все эти ID, иначе ссылки внутри
+    """
+    tokens = [
+        token.strip(LINE_STRIP_CHARS)
+        for token in ID_SEPARATORS.split(value.strip(LINE_STRIP_CHARS))
+    ]
+    if tokens and all(CAR_ID_PATTERN.fullmatch(token) for token in tokens):
+        return tokens
+
+    car_ids = []
+    for match in URL_PATTERN.finditer(value):
+        car_id = extract_car_id(match.group(0))
+        if car_id:
+            car_ids.append(car_id)
+    return car_ids
+
+
+def _csv_id_columns(text: str) -> Optional[tuple[csv.Dialect, list[int]]]:
+    """
+    Колонки с ID в CSV с заголовком
+
+    Returns:
+        (диалект, индексы колонок) или None, если текст не CSV с колонкой ID
+    """
+    header = text.lstrip("\ufeff").split("\n", 1)[0]
+    try:
+        dialect = csv.Sniffer().sniff(header, delimiters=",;\t")
+    except csv.Error:
+        return None
+
+    names = next(csv.reader([header], dialect), [])
+    columns = [
+        index
+        for index, name in enumerate(names)
+        if name.strip().lower().replace(" ", "_") in CSV_ID_COLUMNS
+    ]
+    return (dialect, columns) if columns else None
+
+
+def extract_car_ids(text: str) -> list[str]:
+    """
+    Извлекает все ID автомобилей из текста (сообщения или файла)
+
+    - ссылки Encar - в любом месте текста
+    - голые числовые ID - только если строка состоит из одних ID
+    - CSV с заголовком - значения колонок carid/id/url (остальные колонки,
+      например цена и пробег, не читаются)
+
+    Порядок сохраняется, дубликаты удаляются.
+    """
+    car_ids = []
+
+    csv_columns = _csv_id_columns(text)
+    if csv_columns:
+        dialect, columns = csv_columns
+        rows = csv.reader(io.StringIO(text.lstrip("\ufeff")), dialect)
+        next(rows, None)
+        for row in rows:
+            for index in columns:
+                if index < len(row):
+                    car_ids.extend(_extract_from_value(row[index]))
+    else:
+        for line in text.splitlines():
+            car_ids.extend(_extract_from_value(line))
+
+    return list(dict.fromkeys(car_ids))
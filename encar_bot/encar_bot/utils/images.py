@@ -0,0 +1,268 @@
+"""
+Подготовка изображений для отправки в Telegram
+Проверка URL, уменьшение и кэш file_id уже загруженных фото
+(file_id сохраняются в SQLite, поэтому переживают перезапуск бота)
+"""
+
+import asyncio
+import io
+import logging
+from collections import OrderedDict
+from typing import Optional
+
+import aiohttp
+from aiogram.types import BufferedInputFile, InputMediaPhoto
+
+logger = logging.getLogger(__name__)
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# Ограничения Telegram для фото
+TELEGRAM_PHOTO_MAX_BYTES = 10 * 1024 * 1024
+
+
+class ImagePipeline:
+    """
+    Пайплайн изображений для media group
+    """
+
+    def __init__(
+        self,
+        check_urls: bool = True,
+        resize: bool = False,
+        max_side: int = 1280,
+        timeout: float = 5,
+        max_connections: int = 20,
+        cache_size: int = 10000,
+        file_id_store=None,
+    ):
+        """
+        Args:
+            check_urls: Проверять доступность URL перед отправкой
+            resize: Скачивать и уменьшать изображения (нужен Pillow)
+            max_side: Максимальная сторона после уменьшения (пиксели)
+            timeout: Таймаут одного запроса (секунды)
+            max_connections: Размер пула соединений
+            cache_size: Максимум file_id в кэше в памяти
+            file_id_store: Персистентное хранилище file_id (JobStore) или None
+        """
+        if resize and Image is None:
+            logger.warning("Pillow не установлен - уменьшение изображений отключено")
+            resize = False
+
+        self.check_urls = check_urls
+        self.resize = resize
+        self.max_side = max_side
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.max_connections = max_connections
+        self.cache_size = cache_size
+        self.file_id_store = file_id_store
+
+        self.file_ids: OrderedDict[str, str] = OrderedDict()
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Общая сессия с пулом соединений (создается при первом запросе)"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=self.timeout,
+                connector=aiohttp.TCPConnector(limit=self.max_connections),
+            )
+        return self._session
+
+    async def close(self):
+        """Закрытие сессии"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+
+    def get_file_ids(self, urls: list[str]) -> dict:
+        """
+        file_id ранее отправленных изображений: сначала из памяти,
+        затем из персистентного хранилища
+
+        Returns:
+            dict: URL -> file_id (только найденные)
+        """
+        found = {}
+        for url in urls:
+            file_id = self.file_ids.get(url)
+            if file_id:
+                self.file_ids.move_to_end(url)
+                found[url] = file_id
+
+        missing = [url for url in urls if url not in found]
+        if missing and self.file_id_store is not None:
+            stored = self.file_id_store.get_file_ids(missing)
+            for url, file_id in stored.items():
+                self._cache_file_id(url, file_id)
+            found.update(stored)
+
+        return found
+
+    def _cache_file_id(self, url: str, file_id: str):
+        """Запоминание file_id в памяти (LRU)"""
+        self.file_ids[url] = file_id
+        self.file_ids.move_to_end(url)
+        while len(self.file_ids) > self.cache_size:
+            self.file_ids.popitem(last=False)
+
+    def forget(self, urls: list[str]):
+        """Удаление file_id (например, если Telegram их больше не принимает)"""
+        for url in urls:
+            self.file_ids.pop(url, None)
+        if self.file_id_store is not None:
+            self.file_id_store.delete_file_ids(urls)
+
+    async def _is_available(self, session: aiohttp.ClientSession, url: str) -> bool:
+        """Проверка URL: HEAD (GET, если сервер не поддерживает HEAD)"""
+        try:
+            async with session.head(url, allow_redirects=True) as response:
+                if response.status == 405:
+                    async with session.get(url) as get_response:
+                        return self._is_valid_response(get_response)
+                return self._is_valid_response(response)
+        except Exception as e:
+            logger.warning(f"Изображение недоступно {url}: {e}")
+            return False
+
+    @staticmethod
+    def _is_valid_response(response: aiohttp.ClientResponse) -> bool:
+        """Ответ похож на изображение, которое Telegram сможет принять"""
+        if response.status != 200:
+            return False
+        if not response.content_type.startswith("image/"):
+            return False
+        length = response.content_length
+        return length is None or length <= TELEGRAM_PHOTO_MAX_BYTES
+
+    async def _download_resized(self, session: aiohttp.ClientSession, url: str):
+        """
+        Скачивание и уменьшение изображения
+
+        Returns:
+            BufferedInputFile или None при ошибке
+        """
+        try:
+            async with session.get(url) as response:
+                if not self._is_valid_response(response):
+                    return None
+                content = await response.read()
+
+            data = await asyncio.to_thread(self._resize_bytes, content)
+            filename = url.rsplit("/", 1)[-1].split("?")[0] or "photo.jpg"
+            return BufferedInputFile(data, filename=filename)
+
+        except Exception as e:
+            logger.warning(f"Не удалось подготовить изображение {url}: {e}")
+            return None
+
+    def _resize_bytes(self, content: bytes) -> bytes:
+        """Уменьшение до max_side и перекодирование в JPEG"""
+        image = Image.open(io.BytesIO(content))  # type: ignore
+        image.thumbnail((self.max_side, self.max_side))
+
+        output = io.BytesIO()
+        image.convert("RGB").save(output, format="JPEG", quality=85, optimize=True)
+        return output.getvalue()
+
+    async def _prepare_one(self, session, url: str):
+        """Медиа для одного URL или None, если изображение нужно пропустить"""
+        if self.resize:
+            return await self._download_resized(session, url)
+        if self.check_urls and not await self._is_available(session, url):
+            return None
+        return url
+
+    async def prepare(self, urls: list[str]) -> list[tuple[str, InputMediaPhoto]]:
+        """
+        Подготовка media group: кэшированные фото отправляются по file_id,
+        остальные проверяются параллельно, недоступные отбрасываются
+
+        Args:
+            urls: Список URL изображений
+
+        Returns:
+            list: Пары (исходный URL, InputMediaPhoto) в исходном порядке
+        """
+        media = self.get_file_ids(urls)
+        pending = [url for url in urls if url not in media]
+
+        if pending and not (self.check_urls or self.resize):
+            media.update((url, url) for url in pending)
+        elif pending:
+            session = await self._get_session()
+            prepared = await asyncio.gather(
+                *(self._prepare_one(session, url) for url in pending)
+            )
+            for url, item in zip(pending, prepared):
+                if item is not None:
+                    media[url] = item
+
+        skipped = len(urls) - len(media)
+        if skipped:
+            logger.info(f"Пропущено недоступных изображений: {skipped}")
+
+        return [(url, InputMediaPhoto(media=media[url])) for url in urls if url in media]
+
+    def remember(self, urls: list[str], messages: list):
+        """
+        Заполнение кэша file_id из ответа answer_media_group / answer_photo
+
+        Args:
+            urls: URL в порядке отправки
+            messages: Сообщения, которые вернул Telegram
+        """
+        file_ids = {
+            url: sent.photo[-1].file_id
+            for url, sent in zip(urls, messages)
+            if sent.photo
+        }
+
+        for url, file_id in file_ids.items():
+            self._cache_file_id(url, file_id)
+        if file_ids and self.file_id_store is not None:
+            self.file_id_store.save_file_ids(file_ids)
+
+    async def send(self, message, urls: list[str]) -> bool:
+        """
+        Отправка media group с переиспользованием file_id
+        (если осталось одно фото - отдельным сообщением)
+
+        Если Telegram отклонил группу, в которой были кэшированные file_id,
+        они удаляются из кэша и отправка повторяется по URL.
+
+        Args:
+            message: Сообщение, в ответ на которое отправляются фото
+            urls: URL изображений
+
+        Returns:
+            bool: True если изображения отправлены
+        """
+        for attempt in range(2):
+            prepared = await self.prepare(urls)
+            if not prepared:
+                return False
+
+            sent_urls = [url for url, _ in prepared]
+            cached = [url for url in sent_urls if url in self.file_ids]
+
+            try:
+                # Media group - от 2 до 10 фото, одно отправляется отдельно
+                if len(prepared) == 1:
+                    sent = [await message.answer_photo(prepared[0][1].media)]
+                else:
+                    sent = await message.answer_media_group([media for _, media in prepared])
+                self.remember(sent_urls, sent)
+                return True
+            except Exception as e:
+                if attempt == 0 and cached:
+                    logger.warning(f"Сброс кэша file_id после ошибки отправки: {e}")
+                    self.forget(cached)
+                    continue
+                logger.error(f"Ошибка отправки изображений: {e}")
+                return False
+
+        return False
@@ -0,0 +1,110 @@
+"""
+Задачи парсинга с учетом персистентного кэша результатов
+"""
+
+import asyncio
+import logging
+
+from encar_bot.storage import JOB_DONE, JOB_FAILED, JOB_RUNNING, JobStore
+from encar_bot.utils.formatters import format_car_info
+from encar_bot.utils.parser import run_batch_parser, run_encar_parser
+
+logger = logging.getLogger(__name__)
+
+
+async def get_car_data(job_store: JobStore, chat_id: int, car_id: str, fields=None) -> dict:
+    """
+    Данные автомобиля из кэша или через парсер (с записью задачи)
+
+    Args:
+        job_store: Хранилище задач
+        chat_id: Чат, для которого выполняется задача
+        car_id: ID автомобиля
+        fields: Набор этапов парсинга (None = все)
+
+    Returns:
+        dict: Данные автомобиля
+    """
+    cached = job_store.get_result(car_id, fields)
+    if cached:
+        logger.info(f"Результат car_id={car_id} взят из кэша")
+        return cached
+
+    job_id = job_store.create_job(chat_id, car_id, fields)
+    job_store.set_job_status(job_id, JOB_RUNNING)
+
+    try:
+        car_data = await run_encar_parser(car_id, fields=fields)
+    except Exception as e:
+        job_store.set_job_status(job_id, JOB_FAILED, str(e))
+        raise
+
+    job_store.save_result(car_id, car_data, fields)
+    job_store.set_job_status(job_id, JOB_DONE)
+    return car_data
+
+
+async def run_batch_jobs(job_store: JobStore, chat_id: int, car_ids: list[str], fields=None):
+    """
+    Пакетная обработка: сначала отдаются кэшированные результаты,
+    остальные ID распределяются по пулу парсера
+
+    Yields:
+        tuple: (car_id, данные или None, ошибка или None)
+    """
+    to_parse = {}
+
+    for car_id in car_ids:
+        cached = job_store.get_result(car_id, fields)
+        if cached:
+            yield car_id, cached, None
+        else:
+            job_id = job_store.create_job(chat_id, car_id, fields)
+            job_store.set_job_status(job_id, JOB_RUNNING)
+            to_parse[car_id] = job_id
+
+    if not to_parse:
+        return
+
+    async for car_id, car_data, error in run_batch_parser(list(to_parse), fields=fields):
+        if car_data:
+            job_store.save_result(car_id, car_data, fields)
+            job_store.set_job_status(to_parse[car_id], JOB_DONE)
+        else:
+            job_store.set_job_status(to_parse[car_id], JOB_FAILED, str(error))
+
+        yield car_id, car_data, error
+
+
+async def resume_unfinished_jobs(bot, job_store: JobStore):
+    """
+    Повторный запуск задач, прерванных перезапуском бота.
+    Результаты отправляются в исходные чаты.
+    """
+    jobs = job_store.get_unfinished_jobs()
+    if not jobs:
+        return
+
+    logger.info(f"Возобновление незавершенных задач: {len(jobs)}")
+
+    async def _resume(job):
+        try:
+            car_data = job_store.get_result(job["car_id"], job["fields"])
+            if not car_data:
+                job_store.set_job_status(job["id"], JOB_RUNNING)
+                car_data = await run_encar_parser(job["car_id"], fields=job["fields"])
+                job_store.save_result(job["car_id"], car_data, job["fields"])
+
+            job_store.set_job_status(job["id"], JOB_DONE)
+            await bot.send_message(
+                job["chat_id"],
+                "♻️ Бот был перезапущен, результат по вашему запросу:\n\n"
+                + format_car_info(car_data),
+                parse_mode="HTML",
+            )
+
+        except Exception as e:
+            logger.error(f"Ошибка возобновления задачи {job['id']}: {e}")
+            job_store.set_job_status(job["id"], JOB_FAILED, str(e))
+
+    await asyncio.gather(*(_resume(job) for job in jobs))
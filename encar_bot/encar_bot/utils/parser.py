@@ -2,38 +2,52 @@
 Утилиты для парсинга - интеграция с Encar парсером
 """
 
-import re
-from typing import Optional
-
 # Импорт интерфейса парсера
-from shared.parser_interface import parse_car_by_id
+from shared.parser_interface import (
+    parse_car_by_id,
+    parse_car_options_by_id,
+    parse_cars_by_ids,
+)
 
 
-def extract_car_id(url: str) -> Optional[str]:
-    """Извлекает ID автомобиля из ссылки Encar"""
-    patterns = [
-        r"carid=(\d+)",
-        r"/detail/(\d+)",
-        r"/(\d+)\?",
-    ]
+async def run_encar_parser(car_id: str, preset_brand: str = None, fields=None) -> dict:  # type: ignore
+    """
+    Запускает настоящий парсер Encar
 
-    for pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            return match.group(1)
+    Args:
+        car_id: ID автомобиля
+        preset_brand: Предустановленная марка
+        fields: Набор этапов парсинга (None = все)
 
-    return None
+    Returns:
+        Словарь с данными автомобиля
+    """
+    return await parse_car_by_id(car_id, preset_brand, fields)
 
 
-async def run_encar_parser(car_id: str, preset_brand: str = None) -> dict:  # type: ignore
+async def run_encar_options_parser(car_id: str) -> dict:
     """
-    Запускает настоящий парсер Encar
+    Запускает получение опций автомобиля по запросу
 
     Args:
         car_id: ID автомобиля
-        preset_brand: Предустановленная марка
 
     Returns:
-        Словарь с данными автомобиля
+        Словарь опций
+    """
+    return await parse_car_options_by_id(car_id)
+
+
+async def run_batch_parser(car_ids: list[str], fields=None):
+    """
+    Запускает пакетный парсинг через пул парсера
+
+    Args:
+        car_ids: Список ID автомобилей
+        fields: Набор этапов парсинга (None = все)
+
+    Yields:
+        tuple: (car_id, данные или None, ошибка или None) по мере готовности
     """
-    return await parse_car_by_id(car_id, preset_brand)
+    async for result in parse_cars_by_ids(car_ids, fields=fields):
+        yield result
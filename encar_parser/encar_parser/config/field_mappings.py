@@ -29,6 +29,13 @@ CAR_DATA = {
     "options": {},
 }
 
+# Этапы парсинга страницы автомобиля, которые можно запросить через fields
+# summary - основные данные (всегда извлекаются, содержат ID и модель)
+# details - данные из модального окна "Детали"
+# images - изображения из слайдера
+# options - опции (открывают отдельную вкладку, самый дорогой этап)
+PARSE_FIELDS = {"summary", "details", "images", "options"}
+
 # Опции автомобиля (по умолчанию все False)
 CAR_OPTIONS = {
     # Внешние опции
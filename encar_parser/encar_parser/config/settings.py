@@ -17,7 +17,7 @@ SETTINGS = {
     # Параметры слайдера
     "slider_clicks": 5,  # Количество кликов по слайдеру
     # Настройки вывода
-    "verbose": True,  # Подробный вывод логов
+    "verbose": True,  # Подробный вывод логов (DEBUG, включая каждый элемент)
     "save_screenshots": False,  # Сохранять скриншоты при ошибках
     "debug_on_error_only": True,  # Сохранять debug только при ошибках
     "debug_save_all": False,  # Сохранять для всех страниц (для отладки)
@@ -39,6 +39,106 @@ TRANSLATION_SETTINGS = {
     "use_cache": True,
 }
 
+# Контроль состояния драйвера (см. core/driver_supervisor.py)
+DRIVER_HEALTH_SETTINGS = {
+    "max_pages": 300,  # Перезапуск после N страниц на один драйвер (0 = без ограничения)
+    "max_rss_mb": 2048,  # Перезапуск при превышении памяти Chrome, МБ (нужен psutil)
+    "max_cpu_percent": 0,  # Перезапуск при загрузке CPU выше, % (0 = не проверять)
+    "check_every": 10,  # Проверять память/CPU каждые N страниц
+}
+
+# Настройки отладочных файлов (см. utils/debug_artifacts.py)
+DEBUG_SETTINGS = {
+    "dir": "debug",  # Директория для HTML/скриншотов
+    "max_per_reason": 5,  # Максимум сохранений на одну причину за окно выборки
+    "sample_window": 3600,  # Окно выборки (секунды): затем счетчики сбрасываются
+    "max_total_mb": 200,  # Квота на размер директории (МБ)
+    "max_files": 500,  # Квота на количество файлов
+    "compress_html": True,  # Сжимать HTML (gzip)
+    "async": True,  # Записывать файлы в фоновом потоке
+}
+
+# Настройки обнаружения капчи (см. utils/captcha_handler.py)
+CAPTCHA_SETTINGS = {
+    "dom_probe": True,  # Искать элементы капчи в DOM (False = только URL/заголовок/статус)
+    "url_keywords": ["captcha", "verify"],  # Признаки капчи в URL
+    "title_keywords": ["captcha", "verify", "보안문자", "access denied"],  # В заголовке
+    "blocked_statuses": [403, 429],  # HTTP-статусы ответа страницы
+    # Реакция на капчу: "quarantine" - отложить URL и продолжить,
+    # "wait" - ждать ручного решения, "auto" - quarantine в headless режиме
+    "on_captcha": "auto",
+    "wait_timeout": 120,  # Ожидание ручного решения (секунды)
+    "rotate_driver": True,  # Перезапускать браузер после капчи (новая сессия)
+    "retry_attempts": 1,  # Повторов отложенных URL в конце парсинга каталога
+}
+
+# Политики повторных попыток по этапам (см. utils/retry.py)
+RETRY_SETTINGS = {
+    "budget": 100,  # Максимум повторов за запуск (None = без ограничения)
+    "policies": {
+        # Страница не открылась (таймаут, ошибка WebDriver)
+        "navigation": {"max_retries": None, "base_delay": 5, "max_delay": 60, "jitter": 0.5},
+        # Модальное окно не открылось, критичные поля не извлечены
+        "modal": {"max_retries": 1, "base_delay": 3, "max_delay": 30, "jitter": 0.5},
+        # Страница опций не загрузилась (повтор сразу, на том же автомобиле)
+        "options": {"max_retries": 2, "base_delay": 1, "max_delay": 10, "jitter": 0.5},
+        # Драйвер упал и был перезапущен во время парсинга автомобиля
+        "driver": {"max_retries": 1, "base_delay": 1, "max_delay": 5, "jitter": 0.5},
+    },
+}
+
+# Адаптивный темп запросов (см. utils/rate_limiter.py)
+RATE_LIMIT_SETTINGS = {
+    "enabled": True,
+    "initial_delay": None,  # Начальная пауза (None = SETTINGS["request_delay"])
+    "min_delay": 0.5,  # Минимальная пауза между страницами (секунды)
+    "max_delay": 120,  # Максимальная пауза (секунды)
+    "speedup_step": 0.05,  # Уменьшение паузы после успешной страницы (секунды)
+    "backoff_factor": 2,  # Во сколько раз увеличивать паузу при капче/ошибках
+    "error_window": 20,  # Окно последних страниц для расчета доли ошибок
+    "error_threshold": 0.3,  # Доля ошибок, при которой темп снижается
+}
+
+# Настройки профилирования (см. utils/profiling.py)
+PROFILE_SETTINGS = {
+    "mode": "",  # "" = выключено, "cprofile" или "sample"
+    "dir": "profiles",  # Директория для профилей
+    "interval": 0.005,  # Интервал сэмплирования (секунды)
+}
+
+# Настройки логирования (см. utils/log_config.py)
+LOGGING_SETTINGS = {
+    "format": "text",  # text или json
+    "file": "",  # Дополнительный файл для логов ("" = только консоль)
+    # Уровни для отдельных модулей, например:
+    # {"encar_parser.core.scraper": "WARNING"}
+    "levels": {},
+}
+
+# Настройки метрик (Prometheus)
+METRICS_SETTINGS = {
+    "port": 0,  # Порт HTTP-эндпоинта /metrics (0 = отключен)
+    "host": "0.0.0.0",
+    "textfile": "",  # Путь к .prom файлу для node_exporter ("" = не писать)
+}
+
+# История цен между запусками (см. data/price_history.py)
+PRICE_HISTORY_SETTINGS = {
+    "enabled": True,  # Записывать наблюдения после parse_catalog
+    "db_path": "output/price_history.sqlite3",
+    "record_unchanged": False,  # Писать наблюдение и без изменений цены/пробега
+    # Снятыми с продажи считаются автомобили, которых нет в полном обходе
+    # каталога - только если найдено не меньше этой доли от количества
+    "min_coverage": 0.9,
+}
+
+# Индекс результатов для поиска (см. data/catalog_index.py)
+INDEX_SETTINGS = {
+    "enabled": True,  # Добавлять результаты parse_catalog в индекс
+    "db_path": "output/catalog_index.sqlite3",
+    "dirs": ["output"],  # Директории с результатами (с поддиректориями)
+}
+
 # Настройки сохранения файлов
 FILE_SETTINGS = {
     "output_dir": "output",
@@ -5,6 +5,16 @@ Core module for Encar Parser
 
 from .parser import EncarParser
 from .driver_setup import setup_chrome_driver
+from .orchestrator import CatalogOrchestrator
 from .scraper import Scraper
+from .sharding import ShardCrawler, merge_shards, write_shard_plan
 
-__all__ = ["EncarParser", "setup_chrome_driver", "Scraper"]
+__all__ = [
+    "EncarParser",
+    "setup_chrome_driver",
+    "Scraper",
+    "CatalogOrchestrator",
+    "ShardCrawler",
+    "merge_shards",
+    "write_shard_plan",
+]
@@ -2,6 +2,7 @@
 WebDriver setup and configuration for Ubuntu Server
 Настройка WebDriver для Ubuntu сервера с анти-капча мерами
 """
+import logging
 import os
 import platform
 from selenium import webdriver
@@ -9,6 +10,8 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support.wait import WebDriverWait
 
+logger = logging.getLogger(__name__)
+
 
 def setup_chrome_driver(headless=True, window_size="1920,1080"):
     """
@@ -94,18 +97,18 @@ def setup_chrome_driver(headless=True, window_size="1920,1080"):
         # Попытка использовать системный chromedriver
         if os.path.exists("/usr/bin/chromedriver"):
             service = Service("/usr/bin/chromedriver")
-            print("Используется системный ChromeDriver: /usr/bin/chromedriver")
+            logger.info("Используется системный ChromeDriver: /usr/bin/chromedriver")
         elif os.path.exists("/usr/local/bin/chromedriver"):
             service = Service("/usr/local/bin/chromedriver")
-            print("Используется ChromeDriver: /usr/local/bin/chromedriver")
+            logger.info("Используется ChromeDriver: /usr/local/bin/chromedriver")
         else:
             # Используем webdriver-manager для автоустановки
             try:
                 from webdriver_manager.chrome import ChromeDriverManager
                 service = Service(ChromeDriverManager().install())
-                print("ChromeDriver установлен через webdriver-manager")
+                logger.info("ChromeDriver установлен через webdriver-manager")
             except ImportError:
-                print("⚠️ webdriver-manager не найден, используется системный driver")
+                logger.warning("webdriver-manager не найден, используется системный driver")
         
         # Создаем драйвер
         if service:
@@ -143,11 +146,11 @@ def setup_chrome_driver(headless=True, window_size="1920,1080"):
         )
         
         wait = WebDriverWait(driver, 15)
-        print("✅ Chrome WebDriver успешно инициализирован (Ubuntu Server)")
+        logger.info("Chrome WebDriver успешно инициализирован (Ubuntu Server)")
         return driver, wait
         
     except Exception as e:
-        print(f"❌ Ошибка инициализации WebDriver: {e}")
+        logger.error("Ошибка инициализации WebDriver: %s", e)
         print("\n📋 Убедитесь что установлены:")
         print("   - Google Chrome или Chromium")
         print("   - ChromeDriver")
@@ -0,0 +1,152 @@
+"""
+Driver health supervisor
+Контроль состояния Chrome: память, CPU, количество страниц на драйвер
+"""
+
+import logging
+
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
+
+from encar_parser.config.settings import DRIVER_HEALTH_SETTINGS
+from encar_parser.utils.metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Ошибки страницы, после которых драйвер остается рабочим
+_PAGE_ERRORS = (TimeoutException, NoSuchElementException, StaleElementReferenceException)
+
+
+class DriverSupervisor:
+    """
+    Следит за драйвером и решает, когда его перезапустить:
+    - после max_pages открытых страниц
+    - при превышении max_rss_mb суммарной памяти chromedriver + Chrome
+    - сразу после ошибки WebDriver (упавшая вкладка, потерянная сессия)
+
+    RSS/CPU считаются по дереву процессов chromedriver (нужен psutil);
+    без psutil работают только ограничения по страницам и ошибкам.
+    """
+
+    def __init__(self, driver, settings=None):
+        """
+        Args:
+            driver: Экземпляр WebDriver
+            settings: Настройки (по умолчанию DRIVER_HEALTH_SETTINGS)
+        """
+        self.settings = {**DRIVER_HEALTH_SETTINGS, **(settings or {})}
+        self.recycles = 0
+
+        if psutil is None and self.settings["max_rss_mb"]:
+            logger.debug("psutil не установлен - контроль памяти Chrome отключен")
+
+        self.attach(driver)
+
+    def attach(self, driver):
+        """Начало наблюдения за новым драйвером"""
+        self.driver = driver
+        self.pages_served = 0
+        self._processes = {}
+
+    def page_served(self):
+        """Учет открытой страницы"""
+        self.pages_served += 1
+
+    def _process_tree(self):
+        """Процессы chromedriver и всех его потомков (Chrome, рендереры)"""
+        try:
+            root = psutil.Process(self.driver.service.process.pid)  # type: ignore
+            processes = [root] + root.children(recursive=True)
+        except Exception:
+            return []
+
+        # Сохраняем объекты Process: cpu_percent считается между вызовами
+        alive = {}
+        for process in processes:
+            alive[process.pid] = self._processes.get(process.pid, process)
+        self._processes = alive
+        return list(alive.values())
+
+    def sample(self):
+        """
+        Текущее состояние драйвера
+
+        Returns:
+            dict: {"pages": ..., "rss_mb": ..., "cpu_percent": ...}
+                (rss_mb и cpu_percent = None без psutil)
+        """
+        usage = {"pages": self.pages_served, "rss_mb": None, "cpu_percent": None}
+        if psutil is None:
+            return usage
+
+        rss = 0
+        cpu = 0.0
+        for process in self._process_tree():
+            try:
+                rss += process.memory_info().rss
+                cpu += process.cpu_percent(interval=None)
+            except psutil.Error:
+                continue
+
+        usage["rss_mb"] = round(rss / 1024 / 1024, 1)
+        usage["cpu_percent"] = round(cpu, 1)
+
+        METRICS.set_gauge("driver_rss_mb", usage["rss_mb"])
+        METRICS.set_gauge("driver_cpu_percent", usage["cpu_percent"])
+        return usage
+
+    def check(self):
+        """
+        Проверка, пора ли перезапустить драйвер
+
+        Returns:
+            str или None: Причина перезапуска или None
+        """
+        max_pages = self.settings["max_pages"]
+        if max_pages and self.pages_served >= max_pages:
+            return f"обслужено страниц: {self.pages_served}"
+
+        every = self.settings["check_every"]
+        if not every or self.pages_served % every:
+            return None
+
+        usage = self.sample()
+        max_rss = self.settings["max_rss_mb"]
+        if max_rss and usage["rss_mb"] and usage["rss_mb"] > max_rss:
+            return f"память Chrome {usage['rss_mb']} МБ"
+
+        max_cpu = self.settings["max_cpu_percent"]
+        if max_cpu and usage["cpu_percent"] and usage["cpu_percent"] > max_cpu:
+            return f"загрузка CPU {usage['cpu_percent']}%"
+
+        return None
+
+    @staticmethod
+    def is_driver_failure(error):
+        """
+        Ошибка WebDriver, после которой драйвер нужно перезапустить
+        (таймауты и отсутствие элементов к ним не относятся)
+
+        Args:
+            error: Исключение
+
+        Returns:
+            bool: True если драйвер, вероятно, неработоспособен
+        """
+        return isinstance(error, WebDriverException) and not isinstance(error, _PAGE_ERRORS)
+
+    def recycled(self, driver, reason):
+        """Учет перезапуска драйвера"""
+        self.recycles += 1
+        METRICS.inc("driver_recycles_total")
+        logger.info("Драйвер перезапущен (%s)", reason)
+        self.attach(driver)
@@ -0,0 +1,356 @@
+"""
+Multi-brand catalog crawl orchestrator
+Обход каталогов нескольких марок общим пулом браузеров
+"""
+
+import json
+import logging
+import queue
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from encar_parser.config.catalog_settings import BRANDS, ORCHESTRATOR_CONFIG
+from encar_parser.utils.file_handler import save_to_json
+
+from .parser import EncarParser
+
+logger = logging.getLogger(__name__)
+
+BRAND_PENDING = "pending"
+BRAND_RUNNING = "running"
+BRAND_DONE = "done"
+BRAND_FAILED = "failed"
+
+# Как часто сохранять состояние во время обхода марки (автомобилей)
+STATE_SAVE_EVERY = 10
+
+
+class CrawlState:
+    """
+    Состояние обхода по маркам в JSON-файле: найденные ссылки,
+    обработанные и неудачные URL и статус марки. Позволяет продолжить обход
+    после остановки, не открывая заново каталог и готовые автомобили
+    (неудачные автомобили при продолжении повторяются).
+    """
+
+    def __init__(self, filepath):
+        """
+        Args:
+            filepath: Путь к файлу состояния
+        """
+        self.path = Path(filepath)
+        self.lock = threading.Lock()
+        self.brands = {}
+
+        if self.path.exists():
+            self.brands = json.loads(self.path.read_text(encoding="utf-8"))["brands"]
+            logger.info("Загружено состояние обхода: %s", self.path)
+
+    def get(self, brand_key):
+        """
+        Состояние марки (создается при первом обращении)
+
+        Returns:
+            dict: {"status", "count", "links", "done", "failed", ...}
+        """
+        with self.lock:
+            state = self.brands.setdefault(
+                brand_key,
+                {"status": BRAND_PENDING, "count": None, "links": [], "done": []},
+            )
+            # Файлы состояния прошлых версий без списка неудачных
+            state.setdefault("failed", [])
+            return state
+
+    def update(self, brand_key, **values):
+        """Обновление полей марки и сохранение файла"""
+        self.get(brand_key)
+        with self.lock:
+            self.brands[brand_key].update(values)
+        self.save()
+
+    def mark_done(self, brand_key, car_url):
+        """
+        Отметка обработанного URL - только после записи результата
+        (файл сохраняется периодически)
+        """
+        with self.lock:
+            state = self.brands[brand_key]
+            if car_url in state["failed"]:
+                state["failed"].remove(car_url)
+            state["done"].append(car_url)
+            should_save = len(state["done"]) % STATE_SAVE_EVERY == 0
+        if should_save:
+            self.save()
+
+    def mark_failed(self, brand_key, car_url):
+        """Отметка неудачного URL (остается в обработке при продолжении)"""
+        with self.lock:
+            failed = self.brands[brand_key]["failed"]
+            if car_url not in failed:
+                failed.append(car_url)
+        self.save()
+
+    def record_result(self, brand_key, car_url, car_data, results_file):
+        """
+        Запись результата автомобиля в JSONL и отметка в состоянии:
+        сначала запись на диск, потом отметка (сбой между ними не теряет
+        автомобиль - он будет обработан повторно)
+
+        Args:
+            brand_key: Ключ марки (или части обхода)
+            car_url: URL автомобиля
+            car_data: Данные автомобиля или None (неудача)
+            results_file: Открытый файл результатов
+        """
+        if not car_data:
+            self.mark_failed(brand_key, car_url)
+            return
+
+        results_file.write(json.dumps(car_data, ensure_ascii=False) + "\n")
+        results_file.flush()
+        self.mark_done(brand_key, car_url)
+
+    def save(self):
+        """Атомарная запись состояния (через временный файл)"""
+        with self.lock:
+            data = json.dumps({"brands": self.brands}, ensure_ascii=False, indent=2)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_text(data, encoding="utf-8")
+        tmp_path.replace(self.path)
+
+
+class CatalogOrchestrator:
+    """
+    Обход каталогов нескольких марок:
+    - марки упорядочиваются по размеру каталога или приоритету
+    - N браузеров разбирают марки из общей очереди (RATE_LIMITER общий)
+    - по каждой марке - отдельный файл результатов, в конце - общий файл
+    - состояние сохраняется, повторный запуск продолжает с места остановки
+    """
+
+    def __init__(self, brands=None, workers=None, headless=True, settings=None):
+        """
+        Args:
+            brands: Ключи марок (None = ORCHESTRATOR_CONFIG["brands"] или все BRANDS)
+            workers: Количество браузеров (None = из конфига)
+            headless: Запуск браузеров в headless режиме
+            settings: Переопределение ORCHESTRATOR_CONFIG
+        """
+        self.settings = {**ORCHESTRATOR_CONFIG, **(settings or {})}
+        self.brands = list(brands or self.settings["brands"] or BRANDS)
+        self.workers = workers or self.settings["workers"]
+        self.headless = headless
+
+        unknown = [brand for brand in self.brands if brand not in BRANDS]
+        if unknown:
+            raise ValueError(f"Марки не найдены в списке BRANDS: {unknown}")
+
+        self.output_dir = Path(self.settings["output_dir"])
+        self.state = CrawlState(self.settings["state_file"])
+        self.queue = queue.Queue()
+
+    def _order_brands(self, parser):
+        """
+        Порядок обхода марок
+
+        Args:
+            parser: Парсер для подсчета автомобилей в каталогах
+
+        Returns:
+            list: Незавершенные марки в порядке обхода
+        """
+        brands = [
+            brand
+            for brand in self.brands
+            if self.state.get(brand)["status"] != BRAND_DONE
+        ]
+
+        # Размер каталога нужен для обоих режимов (при равном приоритете).
+        # 0 от get_catalog_count - "не удалось определить" (капча, нет счетчика):
+        # сохраняется None, и марка пересчитывается при следующем запуске
+        for brand in brands:
+            if self.state.get(brand)["count"] is None:
+                try:
+                    count = parser.get_catalog_count(brand) or None
+                except Exception as e:
+                    logger.error("Не удалось получить размер каталога %s: %s", brand, e)
+                    count = None
+                self.state.update(brand, count=count)
+
+        def size(brand):
+            return self.state.get(brand)["count"] or 0
+
+        priorities = self.settings["priorities"]
+        if self.settings["order"] == "priority":
+            key = lambda brand: (priorities.get(brand, 0), size(brand))
+        else:
+            key = size
+
+        ordered = sorted(brands, key=key, reverse=True)
+        logger.info(
+            "Порядок обхода: %s",
+            ", ".join(f"{brand} ({self.state.get(brand)['count']})" for brand in ordered),
+        )
+        return ordered
+
+    def _results_path(self, brand_key):
+        return self.output_dir / f"{brand_key}.jsonl"
+
+    def _load_results(self, brand_key):
+        """Результаты марки из JSONL (включая прошлые запуски, без повторов)"""
+        path = self._results_path(brand_key)
+        if not path.exists():
+            return []
+
+        results = {}
+        with open(path, encoding="utf-8") as results_file:
+            for line in results_file:
+                if line.strip():
+                    car_data = json.loads(line)
+                    results[car_data.get("id") or car_data.get("url")] = car_data
+        return list(results.values())
+
+    def _crawl_brand(self, parser, brand_key):
+        """Обход одной марки с продолжением по сохраненному состоянию"""
+        state = self.state.get(brand_key)
+        self.state.update(brand_key, status=BRAND_RUNNING)
+        parser.preset_brand = brand_key.capitalize()
+
+        links = state["links"]
+        if not links:
+            links = parser.get_car_links(brand_key, max_pages=self.settings["max_pages"])
+            # Пустой список - ошибка сети или капча на странице каталога
+            # (или пустой каталог): марка не считается обойденной
+            if not links:
+                self.state.update(
+                    brand_key, status=BRAND_FAILED, error="Не удалось получить ссылки каталога"
+                )
+                logger.error("Марка %s: ссылки каталога не получены", brand_key)
+                return
+
+            max_cars = self.settings["max_cars_per_brand"]
+            if max_cars:
+                links = links[:max_cars]
+            self.state.update(
+                brand_key, links=links, page_size=parser.page_sizes.get(brand_key)
+            )
+
+        done = set(state["done"])
+        pending = [car_url for car_url in links if car_url not in done]
+        logger.info(
+            "Марка %s: автомобилей %s, осталось %s", brand_key, len(links), len(pending)
+        )
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        with open(self._results_path(brand_key), "a", encoding="utf-8") as results_file:
+
+            def on_result(car_url, car_data):
+                self.state.record_result(brand_key, car_url, car_data, results_file)
+
+            parser.parse_links(pending, on_result=on_result)
+            parser.retry_quarantined(set(pending), on_result=on_result)
+
+        output = save_to_json(
+            self._load_results(brand_key), f"{brand_key}_data.json", str(self.output_dir)
+        )
+
+        # Марка с неудачными автомобилями не завершена - повторный запуск их повторит
+        failed = len(self.state.get(brand_key)["failed"])
+        if failed:
+            self.state.update(
+                brand_key,
+                status=BRAND_FAILED,
+                output=output,
+                error=f"Не удалось получить автомобилей: {failed}",
+            )
+        else:
+            self.state.update(brand_key, status=BRAND_DONE, output=output, error=None)
+
+    def _worker(self, parser):
+        """Поток пула: берет марки из очереди, пока они есть"""
+        while True:
+            try:
+                brand_key = self.queue.get_nowait()
+            except queue.Empty:
+                return
+
+            try:
+                self._crawl_brand(parser, brand_key)
+            except Exception as e:
+                logger.error("Ошибка обхода марки %s: %s", brand_key, e)
+                self.state.update(brand_key, status=BRAND_FAILED, error=str(e))
+
+    def merge(self, filename=None):
+        """
+        Общий файл по всем маркам (без повторов по ID)
+
+        Args:
+            filename: Имя файла (по умолчанию all_brands_<timestamp>.json)
+
+        Returns:
+            str или None: Путь к файлу
+        """
+        merged = {}
+        for brand_key in self.brands:
+            for car_data in self._load_results(brand_key):
+                merged[car_data.get("id") or car_data.get("url")] = car_data
+
+        if not merged:
+            logger.warning("Нет данных для общего файла")
+            return None
+
+        if filename is None:
+            filename = f"all_brands_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        return save_to_json(list(merged.values()), filename, str(self.output_dir))
+
+    def run(self):
+        """
+        Запуск обхода
+
+        Returns:
+            dict: {"brands": {марка: статус и количество}, "merged": путь}
+        """
+        parsers = []
+
+        try:
+            # Браузеры запускаются по одному: если очередной не запустился,
+            # уже созданные закрываются в finally
+            for _ in range(self.workers):
+                parsers.append(EncarParser(headless=self.headless, enable_translation=True))
+
+            for brand_key in self._order_brands(parsers[0]):
+                self.queue.put(brand_key)
+
+            threads = [
+                threading.Thread(
+                    target=self._worker, args=(parser,), name=f"orchestrator-{i}"
+                )
+                for i, parser in enumerate(parsers)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            merged = self.merge()
+        finally:
+            for parser in parsers:
+                parser.close()
+
+        summary = {
+            brand_key: {
+                "status": self.state.get(brand_key)["status"],
+                "count": self.state.get(brand_key)["count"],
+                "done": len(self.state.get(brand_key)["done"]),
+                "failed": len(self.state.get(brand_key)["failed"]),
+            }
+            for brand_key in self.brands
+        }
+        for brand_key, info in summary.items():
+            logger.info("%s: %s", brand_key, info)
+
+        return {"brands": summary, "merged": merged}
@@ -3,37 +3,69 @@ Main parser class for Encar website
 Основной класс парсера сайта Encar
 """
 
+import logging
+import queue
 import re
+import threading
 import time
+from collections import deque
 from datetime import datetime
+from itertools import islice
 
 from encar_parser.config.catalog_settings import (
     BRANDS,
     CATALOG_CONFIG,
     build_catalog_url,
+    build_search_query,
+)
+from encar_parser.config.field_mappings import (
+    CAR_DATA,
+    FIELD_MAPPING,
+    FIELDS_TRANSLATE,
+    PARSE_FIELDS,
 )
-from encar_parser.config.field_mappings import CAR_DATA, FIELD_MAPPING, FIELDS_TRANSLATE
 from encar_parser.config.selectors import (
     CAR_LINK_SELECTORS,
     EXTRA_BUTTON_SELECTORS,
     MODAL_SELECTORS,
 )
-from encar_parser.config.settings import SETTINGS
+from encar_parser.config.settings import (
+    CAPTCHA_SETTINGS,
+    FILE_SETTINGS,
+    INDEX_SETTINGS,
+    METRICS_SETTINGS,
+    PRICE_HISTORY_SETTINGS,
+    SETTINGS,
+)
+from encar_parser.data.catalog_index import CatalogIndex
+from encar_parser.data.price_history import PriceHistoryStore
+from encar_parser.services.catalog_probe import CATALOG_CACHE, fetch_catalog_page
 from encar_parser.services.image_extractor import ImageExtractor
 from encar_parser.services.options_extractor import OptionsExtractor
 from encar_parser.services.translator import translate_text
 from encar_parser.utils.captcha_handler import CaptchaHandler
+from encar_parser.utils.car_ids import CarIdCollector, car_detail_url, parse_impression_id
+from encar_parser.utils.debug_artifacts import DEBUG_ARTIFACTS
 from encar_parser.utils.file_handler import save_to_json
+from encar_parser.utils.high_water import DeltaWalk, HighWaterMarks
 from encar_parser.utils.logger import ParserLogger
+from encar_parser.utils.metrics import METRICS, write_metrics_textfile
+from encar_parser.utils.profiling import profile_run
+from encar_parser.utils.quarantine import QUARANTINE
+from encar_parser.utils.rate_limiter import RATE_LIMITER
+from encar_parser.utils.retry import RetryManager
 
 from .driver_setup import setup_chrome_driver
+from .driver_supervisor import DriverSupervisor
 from .scraper import Scraper
 
+logger = logging.getLogger(__name__)
+
 
 class EncarParser:
     """Основной класс парсера Encar"""
 
-    def __init__(self, headless=True, enable_translation=True, preset_brand=None):
+    def __init__(self, headless=True, enable_translation=True, preset_brand=None, one_shot=False):
         """
         Инициализация парсера
 
@@ -41,38 +73,272 @@ class EncarParser:
             headless: Запуск браузера в headless режиме
             enable_translation: Включить перевод данных
             preset_brand: Предустановленная марка автомобиля
+            one_shot: Парсер на один автомобиль (бот): при капче браузер
+                не перезапускается и URL не попадает в общий карантин
+                (повторять его некому)
         """
-        print("Инициализация парсера...")
+        logger.info("Инициализация парсера...")
 
         # Настройка драйвера
+        self.headless = headless
         self.driver, self.wait = setup_chrome_driver(headless=headless)
+        self.supervisor = DriverSupervisor(self.driver)
 
         # Инициализация вспомогательных классов
-        self.scraper = Scraper(self.driver, self.wait)
+        self.debug_artifacts = DEBUG_ARTIFACTS
+        self.scraper = Scraper(self.driver, self.wait, artifacts=self.debug_artifacts)
         self.image_extractor = ImageExtractor(self.scraper)
         self.options_extractor = OptionsExtractor(self.scraper)
         self.captcha_handler = CaptchaHandler(self.scraper)
         self.logger = ParserLogger()
+        self.rate_limiter = RATE_LIMITER
+        self.quarantine = QUARANTINE
+        self.retry = RetryManager()
 
         # Настройки
         self.enable_translation = enable_translation
         self.preset_brand = preset_brand
+        self.one_shot = one_shot
         self.settings = SETTINGS
 
         # Данные
         self.cars_data = []
         self.processed_urls = set()
+        self.quarantined_urls = []
+
+        # Подобранный размер страницы каталога по маркам (get_page_size)
+        self.page_sizes = {}
+
+        # ModifiedDate автомобилей из поискового API и учет последнего обхода
+        # каталога по маркам (для обхода только изменений, см. iter_car_ids)
+        self.modified_dates = {}
+        self.delta_walks = {}
+
+        # ID и количество автомобилей полного обхода каталога марки без
+        # фильтров (для отметки снятых с продажи в истории цен)
+        self.full_catalog_ids = {}
+
+        # Этап и ошибка последнего неудачного parse_car_page (для повторов)
+        self.last_failure = None
 
         if preset_brand:
-            print(f"Предустановленная марка: {preset_brand}")
+            logger.info("Предустановленная марка: %s", preset_brand)
+
+    def _rotate_driver(self, reason="капча"):
+        """
+        Перезапуск браузера (новая сессия и cookies)
+
+        Args:
+            reason: Причина перезапуска (для логов)
+        """
+        logger.info("Перезапуск драйвера: %s...", reason)
+        try:
+            self.driver.quit()
+        except Exception as e:
+            logger.debug("Ошибка закрытия драйвера: %s", e)
+
+        self.driver, self.wait = setup_chrome_driver(headless=self.headless)
+        self.scraper.driver = self.driver
+        self.scraper.wait = self.wait
+        self.supervisor.recycled(self.driver, reason)
+
+    def _check_driver_health(self):
+        """Плановый перезапуск драйвера до того, как он начнет деградировать"""
+        reason = self.supervisor.check()
+        if not reason:
+            return
+
+        try:
+            self._rotate_driver(reason)
+        except Exception as e:
+            logger.error("Не удалось перезапустить драйвер: %s", e)
+
+    def _should_quarantine(self):
+        """Откладывать ли URL при капче вместо ожидания ручного решения"""
+        mode = CAPTCHA_SETTINGS.get("on_captcha", "auto")
+        if mode == "auto":
+            return self.headless
+        return mode == "quarantine"
+
+    def _quarantine_car(self, car_url):
+        """
+        Перенос URL с капчей в карантин: парсер не ждет решения,
+        а меняет сессию браузера и переходит к следующему автомобилю
+
+        Парсер на один автомобиль (one_shot) только отмечает URL -
+        повтор решает вызывающий код.
+        """
+        if self.one_shot:
+            logger.warning("Автомобиль отложен из-за капчи: %s", car_url)
+        else:
+            self.quarantine.add(car_url, self.captcha_handler.last_match)
+        if car_url not in self.quarantined_urls:
+            self.quarantined_urls.append(car_url)
+        self.logger.increment("quarantined")
+
+        if not self.one_shot and CAPTCHA_SETTINGS.get("rotate_driver", True):
+            try:
+                self._rotate_driver()
+            except Exception as e:
+                logger.error("Не удалось перезапустить драйвер: %s", e)
 
     def close(self):
         """Закрытие драйвера"""
         if self.driver:
             self.driver.quit()
-            print("Драйвер закрыт")
+            logger.debug("Драйвер закрыт")
+
+        # Дожидаемся фоновой записи отладочных файлов (хранилище общее - не закрываем)
+        self.debug_artifacts.flush()
+
+    def probe_catalog(self, brand_key, page=1, items_per_page=None):
+        """
+        Количество автомобилей и ссылки одной страницы каталога за один шаг.
+        Сначала через поисковый API (без браузера), при ошибке - загрузкой
+        страницы. Результат кэшируется на CATALOG_CONFIG["count_cache_ttl"].
+
+        Args:
+            brand_key: Ключ марки из config
+            page: Страница каталога
+            items_per_page: Размер страницы (None = CATALOG_CONFIG["items_per_page"])
+
+        Returns:
+            dict: {"count": количество автомобилей (0 = не определено),
+                "car_ids": ID автомобилей на странице,
+                "page_size": размер страницы, которой соответствуют car_ids}
+        """
+        if items_per_page is None:
+            items_per_page = CATALOG_CONFIG["items_per_page"]
+
+        # Запрос включает марку, тип и фильтры CATALOG_CONFIG["filters"]
+        cache_key = (
+            build_search_query(brand_key),
+            page,
+            CATALOG_CONFIG["sort_by"],
+            items_per_page,
+        )
+        cached = CATALOG_CACHE.get(cache_key)
+        if cached is not None:
+            logger.debug("Каталог %s (стр. %s) взят из кэша", brand_key, page)
+            return cached
+
+        result = None
+        if CATALOG_CONFIG.get("use_search_api", True):
+            try:
+                self.rate_limiter.acquire()
+                with self.logger.span("catalog_api"):
+                    result = fetch_catalog_page(
+                        brand_key, page=page, items_per_page=items_per_page
+                    )
+                result["page_size"] = items_per_page
+            except Exception as e:
+                logger.warning("Поисковый API недоступен, открываем каталог: %s", e)
+
+        if result is None:
+            # В браузере - стандартный размер страницы: открываем ту,
+            # с которой начинается запрошенная
+            browser_page_size = CATALOG_CONFIG["items_per_page"]
+            browser_page = (page - 1) * items_per_page // browser_page_size + 1
+            catalog_url = build_catalog_url(brand_key, page=browser_page)
+
+            with self.logger.span("rate_limit_wait"):
+                self.rate_limiter.acquire()
+            with self.logger.span("catalog_params"):
+                self.scraper.open_url(catalog_url, wait_time=5)
+                self.scraper.scroll_page(
+                    max_scrolls=self.settings.get("max_scrolls", 2),
+                    pause=self.settings.get("scroll_pause", 2),
+                )
+
+            cars_count_text = self.scraper.get_text_by_selector(".allcount")
+            page_ids = CarIdCollector()
+            with self.logger.span("catalog_page_links"):
+                self._collect_page_ids(page_ids)
+
+            result = {
+                "count": int(re.sub(r"\D", "", cars_count_text)) if cars_count_text else 0,
+                "car_ids": list(page_ids),
+                "page_size": browser_page_size,
+            }
+
+        if result["count"]:
+            CATALOG_CACHE.set(cache_key, result)
+        return result
+
+    def get_catalog_count(self, brand_key, page=1, items_per_page=None):
+        """
+        Общее количество автомобилей марки в каталоге
+
+        Args:
+            brand_key: Ключ марки из config
+            page: Страница каталога, которая используется для подсчета
+            items_per_page: Размер страницы (None = из конфига)
+
+        Returns:
+            int: Количество автомобилей (0, если не удалось определить)
+        """
+        return self.probe_catalog(brand_key, page=page, items_per_page=items_per_page)["count"]
+
+    def get_page_size(self, brand_key):
+        """
+        Наибольший размер страницы, который принимает поисковый API для марки.
+        Размеры из CATALOG_CONFIG["page_size_candidates"] пробуются по убыванию;
+        при ошибках (или без API) - CATALOG_CONFIG["items_per_page"].
+        Первая страница подобранного размера сохраняется в кэше каталога.
+
+        Args:
+            brand_key: Ключ марки из config
+
+        Returns:
+            int: Размер страницы
+        """
+        if brand_key in self.page_sizes:
+            return self.page_sizes[brand_key]
+
+        page_size = CATALOG_CONFIG["items_per_page"]
+
+        if CATALOG_CONFIG.get("auto_page_size") and CATALOG_CONFIG.get("use_search_api", True):
+            for candidate in sorted(CATALOG_CONFIG["page_size_candidates"], reverse=True):
+                if candidate <= page_size:
+                    break
+
+                try:
+                    with self.logger.span("rate_limit_wait"):
+                        self.rate_limiter.acquire()
+                    with self.logger.span("catalog_page_size"):
+                        result = fetch_catalog_page(brand_key, page=1, items_per_page=candidate)
+                except Exception as e:
+                    logger.debug("Размер страницы %s не принят: %s", candidate, e)
+                    continue
+
+                received = len(result["car_ids"])
+                if received >= min(candidate, result["count"]):
+                    page_size = candidate
+                    CATALOG_CACHE.set(
+                        (
+                            build_search_query(brand_key),
+                            1,
+                            CATALOG_CONFIG["sort_by"],
+                            candidate,
+                        ),
+                        {**result, "page_size": candidate},
+                    )
+                    break
+
+                # API молча ограничивает размер - берем фактический, если он больше
+                if received > page_size:
+                    page_size = received
+                    break
+
+        self.page_sizes[brand_key] = page_size
+        self.logger.set_run_info("page_sizes", dict(self.page_sizes))
+        METRICS.set_gauge("catalog_page_size", page_size, brand=brand_key)
+        logger.info("Размер страницы каталога %s: %s", brand_key, page_size)
+        return page_size
 
-    def get_catalog_params(self, brand_key=None, start_page=None, max_pages=None):
+    def get_catalog_params(
+        self, brand_key=None, start_page=None, max_pages=None, page_size=None
+    ):
         """
         Получение параметров каталога
 
@@ -80,6 +346,7 @@ class EncarParser:
             brand_key: Ключ марки из config
             start_page: Стартовая страница (None = из конфига)
             max_pages: Максимум страниц (None = из конфига)
+            page_size: Размер страницы (None = CATALOG_CONFIG["items_per_page"])
         """
         # Используем настройки из конфига
         if brand_key is None:
@@ -91,25 +358,18 @@ class EncarParser:
         if max_pages is None:
             max_pages = CATALOG_CONFIG["max_pages"]
 
-        # Строим URL со стартовой страницей
-        catalog_url = build_catalog_url(brand_key, page=start_page)
-
-        self.scraper.open_url(catalog_url, wait_time=5)
-        self.scraper.scroll_page(
-            max_scrolls=self.settings.get("max_scrolls", 2),
-            pause=self.settings.get("scroll_pause", 2),
-        )
+        # Вычисляем количество страниц
+        items_per_page = page_size or CATALOG_CONFIG["items_per_page"]
 
         # Получаем общее количество автомобилей
-        cars_count_text = self.scraper.get_text_by_selector(".allcount")
-        cars_count = int(re.sub(r"\D", "", cars_count_text)) if cars_count_text else 0
+        cars_count = self.get_catalog_count(
+            brand_key, page=start_page, items_per_page=items_per_page
+        )
 
         if cars_count == 0:
-            print("Не удалось определить количество автомобилей")
+            logger.warning("Не удалось определить количество автомобилей")
             return 0, start_page
 
-        # Вычисляем количество страниц
-        items_per_page = CATALOG_CONFIG["items_per_page"]
         total_pages = cars_count // items_per_page
         if cars_count % items_per_page != 0:
             total_pages += 1
@@ -120,65 +380,232 @@ class EncarParser:
         else:
             pages_to_parse = total_pages - start_page + 1
 
-        print(f"Всего автомобилей: {cars_count}")
-        print(f"Всего страниц: {total_pages}")
-        print(f"Начало с страницы: {start_page}")
-        print(f"Страниц для парсинга: {pages_to_parse}")
+        logger.info(
+            "Всего автомобилей: %s, страниц: %s, начало со страницы: %s, "
+            "страниц для парсинга: %s",
+            cars_count,
+            total_pages,
+            start_page,
+            pages_to_parse,
+        )
 
         return pages_to_parse, start_page
 
-    def get_car_links(self, brand_key=None, start_page=None, max_pages=None):
+    def iter_car_ids(
+        self, brand_key=None, start_page=None, max_pages=None, collector=None, since=None
+    ):
         """
-        Получение ссылок на автомобили
+        Обход страниц каталога с выдачей новых ID по мере загрузки страниц
+        (парсинг автомобилей можно начинать, не дожидаясь конца обхода)
 
         Args:
             brand_key: Ключ марки
             start_page: Стартовая страница
             max_pages: Максимум страниц
+            collector: CarIdCollector для накопления ID (None = новый)
+            since: Отметка ModifiedDate прошлого запуска - обход останавливается
+                на первой странице с автомобилями старше нее (каталог
+                отсортирован по ModifiedDate; страницы без дат из API
+                листаются дальше)
+
+        Yields:
+            int: ID автомобилей, которых еще не было в collector
         """
         if brand_key is None:
             brand_key = CATALOG_CONFIG["default_brand"]
+        if start_page is None:
+            start_page = CATALOG_CONFIG["start_page"]
+        if max_pages is None:
+            max_pages = CATALOG_CONFIG["max_pages"]
+        if collector is None:
+            collector = CarIdCollector()
+
+        walk = DeltaWalk()
+        self.delta_walks[brand_key] = walk
+
+        # start_page/max_pages заданы в страницах стандартного размера,
+        # поэтому подобранный размер - только при обходе каталога целиком
+        page_size = CATALOG_CONFIG["items_per_page"]
+        if start_page == 1 and not max_pages:
+            page_size = self.get_page_size(brand_key)
 
         pages_count, start_page = self.get_catalog_params(
-            brand_key, start_page=start_page, max_pages=max_pages
+            brand_key, start_page=start_page, max_pages=max_pages, page_size=page_size
         )
 
         if pages_count == 0:
-            print("Не удалось получить информацию о страницах")
-            return []
+            logger.warning("Не удалось получить информацию о страницах")
+            return
 
-        car_links = []
+        if since and CATALOG_CONFIG["sort_by"] != "ModifiedDate":
+            logger.warning("Обход изменений работает только при сортировке ModifiedDate")
+            since = None
 
         for i in range(pages_count):
             page = start_page + i
+            new_ids = []
+
+            # Первая страница уже получена при подсчете (get_catalog_params)
+            if i == 0:
+                probe = self.probe_catalog(brand_key, page=page, items_per_page=page_size)
+                logger.info("Страница %s (1/%s) взята из проверки каталога", page, pages_count)
+                self.modified_dates.update(probe.get("modified", {}))
+                new_ids = collector.update(probe["car_ids"])
+
+            if i > 0 or probe["page_size"] != page_size:
+                logger.info("Страница %s (%s/%s)", page, i + 1, pages_count)
+                # Даты изменения есть только в ответе API
+                if page_size == CATALOG_CONFIG["items_per_page"] and not since:
+                    new_ids += self._load_catalog_page(brand_key, page, collector)
+                else:
+                    new_ids += self._fetch_catalog_page_ids(
+                        brand_key, page, page_size, collector
+                    )
+
+            fresh_ids = new_ids
+            if since:
+                fresh_ids = [
+                    car_id
+                    for car_id in new_ids
+                    if self.modified_dates.get(car_id, since) >= since
+                ]
+
+            # Выданные ID учитываются для отметки (обход может быть прерван
+            # на max_cars - тогда он не завершен)
+            for car_id in fresh_ids:
+                walk.record(car_id)
+                yield car_id
+
+            if len(fresh_ids) < len(new_ids):
+                logger.info(
+                    "Дошли до отметки %s на странице %s - остальные без изменений",
+                    since,
+                    page,
+                )
+                walk.complete = True
+                return
 
-            page_url = build_catalog_url(brand_key, page=page)
+        # Весь каталог пройден (ограничение max_pages - не конец каталога)
+        walk.complete = not max_pages
+
+        if start_page == 1 and not max_pages and not CATALOG_CONFIG.get("filters"):
+            self.full_catalog_ids[brand_key] = (
+                list(collector),
+                self.get_catalog_count(brand_key, items_per_page=page_size),
+            )
+
+    def _load_catalog_page(self, brand_key, page, collector):
+        """
+        Загрузка страницы каталога в браузере
 
-            print(f"Открыта страница: {page} ({i + 1}/{pages_count})")
+        Args:
+            brand_key: Ключ марки
+            page: Номер страницы (стандартного размера)
+            collector: CarIdCollector, в который добавляются ID
+
+        Returns:
+            list: Новые ID в порядке на странице
+        """
+        page_url = build_catalog_url(brand_key, page=page)
+
+        logger.info("Открыта страница: %s", page)
+        with self.logger.span("rate_limit_wait"):
+            self.rate_limiter.acquire()
+        with self.logger.span("catalog_page_load"):
             self.scraper.open_url(page_url, wait_time=5)
             self.scraper.scroll_page(
                 max_scrolls=self.settings.get("max_scrolls", 2),
                 pause=self.settings.get("scroll_pause", 2),
             )
 
-            # Ищем ссылки
-            for selector in CAR_LINK_SELECTORS:
-                elements = self.scraper.find_elements(selector)
-                print(f"  Селектор '{selector}': найдено {len(elements)} элементов")
+        # Ищем ссылки
+        with self.logger.span("catalog_page_links"):
+            return self._collect_page_ids(collector)
 
-                for element in elements:
-                    try:
-                        data_impression = element.get_attribute("data-impression")
-                        if data_impression:
-                            car_id = data_impression.partition("|")[0]
-                            full_url = f"https://fem.encar.com/cars/detail/{car_id}?carid={car_id}"
-                            if full_url not in car_links:
-                                car_links.append(full_url)
-                    except Exception:
-                        continue
+    def _fetch_catalog_page_ids(self, brand_key, page, page_size, collector):
+        """
+        Страница каталога подобранного размера через поисковый API; при ошибке -
+        страницы стандартного размера в браузере, покрывающие тот же диапазон
+
+        Args:
+            brand_key: Ключ марки
+            page: Номер страницы (размера page_size)
+            page_size: Размер страницы
+            collector: CarIdCollector, в который добавляются ID
+
+        Returns:
+            list: Новые ID в порядке каталога
+        """
+        try:
+            with self.logger.span("rate_limit_wait"):
+                self.rate_limiter.acquire()
+            with self.logger.span("catalog_api"):
+                result = fetch_catalog_page(brand_key, page=page, items_per_page=page_size)
+            self.modified_dates.update(result["modified"])
+            return collector.update(result["car_ids"])
+        except Exception as e:
+            logger.warning("Страница %s через API не получена, открываем каталог: %s", page, e)
+
+        browser_page_size = CATALOG_CONFIG["items_per_page"]
+        cars_count = self.get_catalog_count(brand_key, items_per_page=page_size)
+        first_page = (page - 1) * page_size // browser_page_size + 1
+        last_page = min(
+            (page * page_size - 1) // browser_page_size + 1,
+            -(-cars_count // browser_page_size),
+        )
+
+        new_ids = []
+        for browser_page in range(first_page, last_page + 1):
+            new_ids.extend(self._load_catalog_page(brand_key, browser_page, collector))
+        return new_ids
+
+    def get_car_links(
+        self, brand_key=None, start_page=None, max_pages=None, since=None, max_cars=None
+    ):
+        """
+        Получение ссылок на автомобили
+
+        Args:
+            brand_key: Ключ марки
+            start_page: Стартовая страница
+            max_pages: Максимум страниц
+            since: Отметка ModifiedDate - только автомобили, измененные после нее
+            max_cars: Остановить обход после стольких автомобилей (None = все)
+
+        Returns:
+            list: URL автомобилей в порядке каталога (без повторов)
+        """
+        car_ids = list(
+            islice(self.iter_car_ids(brand_key, start_page, max_pages, since=since), max_cars)
+        )
+
+        logger.info("Найдено %s уникальных ссылок", len(car_ids))
+        return [car_detail_url(car_id) for car_id in car_ids]
+
+    def _collect_page_ids(self, collector):
+        """
+        Сбор ID автомобилей с открытой страницы каталога
+
+        Args:
+            collector: CarIdCollector, в который добавляются ID
+
+        Returns:
+            list: Новые ID в порядке на странице
+        """
+        new_ids = []
+        for selector in CAR_LINK_SELECTORS:
+            elements = self.scraper.find_elements(selector)
+            logger.debug("Селектор '%s': найдено %s элементов", selector, len(elements))
+
+            for element in elements:
+                try:
+                    car_id = parse_impression_id(element.get_attribute("data-impression"))
+                    if car_id is not None and collector.add(car_id):
+                        new_ids.append(car_id)
+                except Exception:
+                    continue
 
-        print(f"Найдено {len(car_links)} уникальных ссылок")
-        return car_links
+        return new_ids
 
     def extract_car_data(self, car_url, modal=None):
         """
@@ -191,7 +618,7 @@ class EncarParser:
         Returns:
             dict: Данные автомобиля
         """
-        print("Извлекаем данные автомобиля...")
+        logger.debug("Извлекаем данные автомобиля...")
 
         car_data = CAR_DATA.copy()
 
@@ -200,20 +627,20 @@ class EncarParser:
             match = re.search(r"/detail/(\d+)", car_url)
             if match:
                 car_data["id"] = match.group(1)
-                print(f"ID: {car_data['id']}")
+                logger.debug("ID: %s", car_data["id"])
             else:
                 # КРИТИЧНАЯ ОШИБКА
-                print("ОШИБКА: не удалось извлечь ID")
+                logger.error("Не удалось извлечь ID: %s", car_url)
                 self._save_debug_info(car_url, "no_car_id")
                 return car_data
 
             # Марка
             if self.preset_brand:
                 car_data["brand"] = self.preset_brand
-                print(f"Марка (предустановлена): {self.preset_brand}")
+                logger.debug("Марка (предустановлена): %s", self.preset_brand)
             else:
                 car_data["brand"] = "Unknown brand"
-                print("Марка не определена")
+                logger.debug("Марка не определена")
 
             # Модель
             car_data["model"] = self.scraper.get_text_by_selector(
@@ -221,12 +648,12 @@ class EncarParser:
             )
 
             if not car_data["model"]:
-                print("ВНИМАНИЕ: модель не найдена")
+                logger.warning("Модель не найдена: %s", car_url)
                 # СОХРАНЯЕМ debug
                 if self.settings.get("debug_on_error_only", True):
                     self._save_debug_info(car_url, "no_model")
             else:
-                print(f"Модель: {car_data['model']}")
+                logger.debug("Модель: %s", car_data["model"])
 
             # Цена
             price_text = self.scraper.get_text_by_selector(
@@ -236,9 +663,9 @@ class EncarParser:
                 car_data["price"] = price_text.replace(",", "")
                 try:
                     car_data["price"] = str(int(car_data["price"]) * 10000)
-                    print(f"Цена: {car_data['price']}")
+                    logger.debug("Цена: %s", car_data["price"])
                 except ValueError:
-                    print(f"Ошибка преобразования цены: {price_text}")
+                    logger.warning("Ошибка преобразования цены: %s", price_text)
 
             # Конфигурация
             conf_1 = self.scraper.get_text_by_selector(
@@ -250,7 +677,7 @@ class EncarParser:
             car_data["configuration"] = (
                 f"{conf_1} {conf_2}".strip() if conf_2 else conf_1
             )
-            print(f"Конфигурация: {car_data['configuration']}")
+            logger.debug("Конфигурация: %s", car_data["configuration"])
 
             # Год
             year_text = self.scraper.get_text_by_selector(
@@ -260,9 +687,9 @@ class EncarParser:
                 try:
                     year_short = year_text[:2]
                     car_data["year"] = str(int(year_short) + 2000)
-                    print(f"Год: {car_data['year']}")
+                    logger.debug("Год: %s", car_data["year"])
                 except ValueError:
-                    print(f"Ошибка преобразования года: {year_text}")
+                    logger.warning("Ошибка преобразования года: %s", year_text)
 
             # Пробег
             mileage_text = self.scraper.get_text_by_selector(
@@ -270,28 +697,28 @@ class EncarParser:
             )
             if mileage_text:
                 car_data["mileage"] = re.sub(r"\D", "", mileage_text.replace(",", ""))
-                print(f"Пробег: {car_data['mileage']}")
+                logger.debug("Пробег: %s", car_data["mileage"])
 
             # Топливо
             car_data["fuel"] = self.scraper.get_text_by_selector(
                 ".DetailSummary_define_summary__NOYid > dd", 2
             ).strip()
-            print(f"Топливо: {car_data['fuel']}")
+            logger.debug("Топливо: %s", car_data["fuel"])
 
             # Гос номер
             car_data["vehnumber"] = self.scraper.get_text_by_selector(
                 ".DetailSummary_define_summary__NOYid > dd", 3
             ).strip()
-            print(f"Гос номер: {car_data['vehnumber']}")
+            logger.debug("Гос номер: %s", car_data["vehnumber"])
 
             # Данные из модального окна
             if modal:
-                print("Извлекаем данные из модального окна...")
+                logger.debug("Извлекаем данные из модального окна...")
                 extracted_fields = self.extract_fields_from_modal(modal)
                 car_data.update(extracted_fields)
 
         except Exception as e:
-            print(f"Ошибка извлечения данных: {e}")
+            logger.error("Ошибка извлечения данных: %s", e)
             self._save_debug_info(car_url, "extract_error")
             self.logger.log_error("extract_car_data", str(e))
 
@@ -313,7 +740,7 @@ class EncarParser:
             list_items = self.scraper.find_elements(
                 MODAL_SELECTORS["list_items"], parent=modal
             )
-            print(f"  Найдено {len(list_items)} элементов в модальном окне")
+            logger.debug("Найдено %s элементов в модальном окне", len(list_items))
 
             for item in list_items:
                 try:
@@ -347,13 +774,13 @@ class EncarParser:
                             value_text = re.sub(r"[^0-9]", "", value_text)
 
                         extracted_data[field_key] = value_text
-                        print(f"    {field_key}: {value_text}")
+                        logger.debug("%s: %s", field_key, value_text)
 
                 except Exception:
                     continue
 
         except Exception as e:
-            print(f"Ошибка извлечения полей из модального окна: {e}")
+            logger.error("Ошибка извлечения полей из модального окна: %s", e)
             self.logger.log_error("extract_fields_from_modal", str(e))
 
         return extracted_data
@@ -369,10 +796,10 @@ class EncarParser:
             dict: Переведенные данные
         """
         if not self.enable_translation:
-            print("Перевод отключен")
+            logger.debug("Перевод отключен")
             return car_data
 
-        print("Переводим данные...")
+        logger.debug("Переводим данные...")
         translated_data = car_data.copy()
 
         for field in FIELDS_TRANSLATE:
@@ -382,7 +809,7 @@ class EncarParser:
                     translated_text = translate_text(original_text)
                     translated_data[field] = translated_text
                 except Exception as e:
-                    print(f"Ошибка перевода поля {field}: {e}")
+                    logger.warning("Ошибка перевода поля %s: %s", field, e)
                     self.logger.increment("translation_errors")
                     translated_data[field] = car_data[field]
 
@@ -412,10 +839,10 @@ class EncarParser:
 
             return True
         except TimeoutException:
-            print("Таймаут загрузки страницы")
+            logger.warning("Таймаут загрузки страницы")
             return False
         except Exception as e:
-            print(f"Ошибка проверки загрузки страницы: {e}")
+            logger.warning("Ошибка проверки загрузки страницы: %s", e)
             return False
 
     def click_details_button(self):
@@ -426,18 +853,18 @@ class EncarParser:
         Returns:
             bool: True если успешно, False иначе
         """
-        print("Ищем кнопку 'Детали'...")
+        logger.debug("Ищем кнопку 'Детали'...")
 
         # Проверяем загрузку страницы
         self.check_page_loaded()
 
         for i, selector in enumerate(EXTRA_BUTTON_SELECTORS):
             try:
-                print(f"Проверяем селектор {i + 1}: {selector}")
+                logger.debug("Проверяем селектор %s: %s", i + 1, selector)
 
                 # Ищем элементы
                 elements = self.scraper.find_elements(selector)
-                print(f"  Найдено элементов: {len(elements)}")
+                logger.debug("Найдено элементов: %s", len(elements))
 
                 if not elements:
                     continue
@@ -446,7 +873,7 @@ class EncarParser:
                 for idx, elem in enumerate(elements):
                     try:
                         is_displayed = elem.is_displayed()
-                        print(f"  Элемент {idx + 1} видим: {is_displayed}")
+                        logger.debug("Элемент %s видим: %s", idx + 1, is_displayed)
 
                         if not is_displayed:
                             continue
@@ -461,78 +888,150 @@ class EncarParser:
                         self.driver.execute_script("arguments[0].click();", elem)
                         time.sleep(3)
 
-                        print(f"Кнопка нажата успешно: {selector}")
+                        logger.debug("Кнопка нажата успешно: %s", selector)
                         return True
 
                     except Exception as e:
-                        print(f"  Ошибка с элементом {idx + 1}: {e}")
+                        logger.debug("Ошибка с элементом %s: %s", idx + 1, e)
                         continue
 
             except Exception as e:
-                print(f"Ошибка с селектором {selector}: {e}")
+                logger.warning("Ошибка с селектором %s: %s", selector, e)
                 continue
 
-        print("Кнопка 'Детали' не найдена - продолжаем без модального окна")
+        logger.warning("Кнопка 'Детали' не найдена - продолжаем без модального окна")
         return False
 
-    def parse_car_page(self, car_url):
+    def _resolve_fields(self, fields):
+        """
+        Нормализация набора запрошенных этапов парсинга
+
+        Args:
+            fields: Итерируемый набор этапов из PARSE_FIELDS (None = все)
+
+        Returns:
+            set: Набор этапов (summary добавляется всегда)
+        """
+        if fields is None:
+            return set(PARSE_FIELDS)
+
+        fields = set(fields)
+        unknown = fields - PARSE_FIELDS
+        if unknown:
+            raise ValueError(
+                f"Неизвестные поля: {', '.join(sorted(unknown))}. "
+                f"Доступны: {', '.join(sorted(PARSE_FIELDS))}"
+            )
+
+        # Без основных данных нет ни ID, ни модели
+        fields.add("summary")
+        return fields
+
+    @profile_run("parse_car_page")
+    def parse_car_page(self, car_url, fields=None):
         """
         Парсинг страницы отдельного автомобиля
 
         Args:
             car_url: URL страницы автомобиля
+            fields: Набор этапов из PARSE_FIELDS (None = все). Этапы, которые
+                не запрошены, пропускаются, а их поля остаются пустыми
 
         Returns:
             dict или None: Данные автомобиля или None при ошибке
         """
+        fields = self._resolve_fields(fields)
+        self.last_failure = None
+
         if car_url in self.processed_urls:
-            print(f"URL уже обработан: {car_url}")
+            logger.debug("URL уже обработан: %s", car_url)
             return None
 
-        print(f"\n{'=' * 60}")
-        print(f"Парсим автомобиль: {car_url}")
-        print("=" * 60)
+        with self.logger.span("parse_car_page"):
+            car_data = self._parse_car_page(car_url, fields)
+
+        self._check_driver_health()
+        return car_data
+
+    def _parse_car_page(self, car_url, fields):
+        """
+        Этапы парсинга страницы автомобиля (каждый этап замеряется)
+
+        Args:
+            car_url: URL страницы автомобиля
+            fields: Нормализованный набор этапов
+
+        Returns:
+            dict или None: Данные автомобиля или None при ошибке
+        """
+        logger.info("Парсим автомобиль: %s", car_url)
 
         self.logger.increment("total_processed")
+        self.last_failure = None
+        stage = "navigation"
 
         try:
+            # Ждем свой слот (общий темп для всех потоков)
+            with self.logger.span("rate_limit_wait"):
+                self.rate_limiter.acquire()
+
             # Открываем страницу
-            self.scraper.open_url(car_url, wait_time=3)
+            with self.logger.span("open_url"):
+                self.supervisor.page_served()
+                self.scraper.open_url(car_url, wait_time=3)
 
             # ДОБАВЛЕНО: Проверка капчи
-            if self.captcha_handler.check_captcha():
-                print("ОБНАРУЖЕНА КАПЧА!")
+            with self.logger.span("check_captcha"):
+                captcha_found = self.captcha_handler.check_captcha()
+
+            if captcha_found:
+                logger.warning("ОБНАРУЖЕНА КАПЧА!")
+                self.logger.increment("captcha_detected")
+                self.rate_limiter.on_captcha()
                 self.captcha_handler.save_captcha_debug()
 
-                if not self.captcha_handler.handle_captcha():
-                    print("Не удалось пройти капчу, пропускаем автомобиль")
+                if self._should_quarantine():
+                    self._quarantine_car(car_url)
+                    return None
+
+                if not self.captcha_handler.handle_captcha(
+                    timeout=CAPTCHA_SETTINGS.get("wait_timeout", 120)
+                ):
+                    logger.warning("Не удалось пройти капчу, пропускаем автомобиль")
                     self.logger.increment("failed")
                     return None
 
             # Открываем модальное окно
+            stage = "modal"
             modal = None
-            modal_opened = self.click_details_button()
+            modal_opened = False
+            if "details" in fields:
+                with self.logger.span("click_details_button"):
+                    modal_opened = self.click_details_button()
 
             if modal_opened:
-                modal = self.scraper.wait_for_element(
-                    MODAL_SELECTORS["container"], condition="visible"
-                )
+                with self.logger.span("wait_for_element"):
+                    modal = self.scraper.wait_for_element(
+                        MODAL_SELECTORS["container"], condition="visible"
+                    )
                 if modal:
-                    print("Модальное окно найдено")
+                    logger.debug("Модальное окно найдено")
                 else:
-                    print("Модальное окно не найдено")
+                    logger.warning("Модальное окно не найдено")
                     if self.settings.get("debug_on_error_only", True):
-                        print("Сохраняем debug: модальное окно не найдено")
                         self._save_debug_info(car_url, "modal_not_found")
 
             # Извлекаем основные данные
-            car_data = self.extract_car_data(car_url, modal)
+            with self.logger.span("extract_car_data"):
+                car_data = self.extract_car_data(car_url, modal)
 
             # ПРОВЕРЯЕМ критичные поля
             if not car_data.get("id") or not car_data.get("model"):
-                print("ОШИБКА: не удалось извлечь критичные данные")
+                logger.error("Не удалось извлечь критичные данные: %s", car_url)
                 # СОХРАНЯЕМ debug
                 self._save_debug_info(car_url, "missing_critical_data")
+                self.last_failure = {"stage": stage, "error": "missing_critical_data"}
+                self.rate_limiter.on_error()
                 self.logger.increment("failed")
                 return None
 
@@ -540,32 +1039,145 @@ class EncarParser:
             car_data["parsed_at"] = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
 
             # Извлекаем изображения
-            car_data["images"] = self.image_extractor.extract_images(
-                max_images=self.settings.get("max_images", 10)
-            )
+            stage = "images"
+            if "images" in fields:
+                with self.logger.span("extract_images"):
+                    car_data["images"] = self.image_extractor.extract_images(
+                        max_images=self.settings.get("max_images", 10)
+                    )
 
             # Извлекаем опции
-            car_data["options"] = self.options_extractor.extract_options(car_data["id"])
+            stage = "options"
+            if "options" in fields:
+                with self.logger.span("extract_options"):
+                    options = self._extract_options(car_data["id"])
+                # Без опций автомобиль сохраняется, но не со всеми опциями False
+                if options is not None:
+                    car_data["options"] = options
+                else:
+                    self.logger.increment("option_errors")
+                    self.logger.log_error("extract_options", f"Опции {car_data['id']} не получены")
 
             # Переводим данные
-            car_data = self.translate_car_data(car_data)
+            stage = "translate"
+            with self.logger.span("translate"):
+                car_data = self.translate_car_data(car_data)
 
             self.processed_urls.add(car_url)
             self.logger.increment("successful")
+            if not captcha_found:
+                self.rate_limiter.on_success()
 
             return car_data
 
         except Exception as e:
-            print(f"Ошибка при парсинге {car_url}: {e}")
+            logger.error("Ошибка при парсинге %s (этап %s): %s", car_url, stage, e)
+            self.last_failure = {"stage": stage, "error": str(e)}
 
             # СОХРАНЯЕМ debug при любой ошибке
-            print("Сохраняем HTML и скриншот при ошибке...")
             self._save_debug_info(car_url, "exception")
 
+            # Драйвер неработоспособен: перезапускаем, автомобиль повторяется
+            if self.supervisor.is_driver_failure(e):
+                try:
+                    self._rotate_driver(f"ошибка WebDriver: {type(e).__name__}")
+                    self.last_failure["stage"] = "driver"
+                except Exception as restart_error:
+                    logger.error("Не удалось перезапустить драйвер: %s", restart_error)
+            else:
+                self.rate_limiter.on_error()
+
             self.logger.increment("failed")
             self.logger.log_error("parse_car_page", str(e))
             return None
 
+    def parse_car_options(self, car_id):
+        """
+        Отдельное получение опций автомобиля (по запросу)
+
+        Args:
+            car_id: ID автомобиля
+
+        Returns:
+            dict или None: Словарь опций или None при ошибке
+        """
+        logger.info("Получаем опции автомобиля: %s", car_id)
+
+        try:
+            with self.logger.span("rate_limit_wait"):
+                self.rate_limiter.acquire()
+            with self.logger.span("extract_options"):
+                options = self._extract_options(car_id)
+            if options is None:
+                self.logger.increment("option_errors")
+                self.logger.log_error("parse_car_options", f"Опции {car_id} не получены")
+            return options
+        except Exception as e:
+            logger.error("Ошибка получения опций %s: %s", car_id, e)
+            self.logger.increment("option_errors")
+            self.logger.log_error("parse_car_options", str(e))
+            return None
+
+    def _extract_options(self, car_id):
+        """
+        Извлечение опций с повтором по политике "options"
+        (страница опций открывается отдельно, поэтому повторяется на месте)
+
+        Args:
+            car_id: ID автомобиля
+
+        Returns:
+            dict или None: Словарь опций или None, если страница опций не
+                получена и повторы исчерпаны (все опции False - не результат)
+        """
+        while True:
+            self.supervisor.page_served()
+            options = self.options_extractor.extract_options(car_id)
+            if self.options_extractor.last_error is None:
+                return options
+
+            delay = self.retry.schedule(f"options:{car_id}", "options")
+            if delay is None:
+                logger.error(
+                    "Опции %s не получены: %s", car_id, self.options_extractor.last_error
+                )
+                return None
+            time.sleep(delay)
+
+    def retry_quarantined(self, car_urls=None, on_result=None):
+        """
+        Повтор автомобилей этого парсера, отложенных из-за капчи
+
+        Args:
+            car_urls: Ограничить повтор этими URL (None = все отложенные)
+            on_result: Функция (car_url, car_data), вызывается для каждого
+                полученного автомобиля
+
+        Returns:
+            list: Данные автомобилей, которые удалось получить
+        """
+        results = []
+        for attempt in range(CAPTCHA_SETTINGS.get("retry_attempts", 1)):
+            pending = set(self.quarantine.get_urls())
+            urls = [url for url in self.quarantined_urls if url in pending]
+            if car_urls is not None:
+                urls = [url for url in urls if url in car_urls]
+            if not urls:
+                break
+
+            logger.info(
+                "Повтор отложенных автомобилей: %s (попытка %s)", len(urls), attempt + 1
+            )
+            for car_url in urls:
+                car_data = self.parse_car_page(car_url)
+                if car_data:
+                    self.quarantine.release(car_url)
+                    results.append(car_data)
+                    if on_result:
+                        on_result(car_url, car_data)
+
+        return results
+
     def _save_debug_info(self, car_url, reason="error"):
         """
         Внутренний метод для сохранения debug информации
@@ -578,12 +1190,226 @@ class EncarParser:
             car_id_match = re.search(r"/detail/(\d+)", car_url)
             car_id = car_id_match.group(1) if car_id_match else "unknown"
 
-            prefix = f"{reason}_{car_id}"
-            self.scraper.save_page_debug_info(prefix=prefix)
+            self.scraper.save_page_debug_info(prefix=reason, car_id=car_id)
+
+        except Exception as e:
+            logger.error("Ошибка сохранения debug информации: %s", e)
+
+    def parse_links(self, car_links, on_result=None):
+        """
+        Парсинг списка автомобилей. Неудачные автомобили, которым
+        разрешен повтор, встают в конец очереди со своей задержкой
+
+        Args:
+            car_links: URL автомобилей
+            on_result: Функция (car_url, car_data или None), вызывается
+                для каждого окончательного результата (без промежуточных повторов)
+
+        Returns:
+            list: Данные успешно полученных автомобилей
+        """
+        results = []
+        total_to_parse = len(car_links)
+        pending = deque((car_url, 0.0) for car_url in car_links)
+        position = 0
+
+        while pending:
+            car_url, not_before = pending.popleft()
+            METRICS.set_gauge("catalog_queue_depth", len(pending) + 1)
+
+            if not_before:
+                time.sleep(max(0.0, not_before - time.monotonic()))
+            else:
+                position += 1
+                logger.info("Прогресс: %s/%s", position, total_to_parse)
+
+            car_data = self.parse_car_page(car_url)
+
+            if car_data:
+                results.append(car_data)
+                brand = car_data.get("brand", "Unknown")
+                model = car_data.get("model", "Unknown")
+                img_count = len(car_data.get("images", []))
+                logger.info("Успешно: %s %s (%s фото)", brand, model, img_count)
+            elif self.last_failure:
+                delay = self.retry.schedule(car_url, self.last_failure["stage"])
+                if delay is not None:
+                    pending.append((car_url, time.monotonic() + delay))
+                    continue
+
+            if on_result:
+                on_result(car_url, car_data)
+
+            if METRICS_SETTINGS["textfile"]:
+                write_metrics_textfile(METRICS_SETTINGS["textfile"])
+
+            # Пауза между запросами задается RATE_LIMITER в parse_car_page
+
+        METRICS.set_gauge("catalog_queue_depth", 0)
+        return results
+
+    def parse_pipelined(
+        self,
+        brand_key=None,
+        max_cars=None,
+        start_page=None,
+        max_pages=None,
+        workers=2,
+        since=None,
+    ):
+        """
+        Конвейер: этот парсер обходит страницы каталога и кладет ID в
+        ограниченную очередь, а workers дополнительных парсеров (каждый со
+        своим браузером) параллельно разбирают автомобили из очереди.
+        Неудачные автомобили с разрешенным повтором возвращаются в очередь
+        после задержки, не занимая рабочий поток.
+
+        Args:
+            brand_key: Ключ марки
+            max_cars: Максимум автомобилей (None = без ограничения)
+            start_page: Стартовая страница
+            max_pages: Максимум страниц
+            workers: Количество парсеров автомобилей
+            since: Отметка ModifiedDate (см. iter_car_ids)
+
+        Returns:
+            list: Данные успешно полученных автомобилей
+        """
+        id_queue = queue.Queue(maxsize=CATALOG_CONFIG.get("pipeline_queue_size", 100))
+        results = []
+        lock = threading.Condition()
+        counters = {"produced": 0, "finished": 0}
+
+        def finish(car_data=None):
+            with lock:
+                if car_data:
+                    results.append(car_data)
+                counters["finished"] += 1
+                lock.notify_all()
+
+        def consume(worker):
+            while True:
+                car_id = id_queue.get()
+                if car_id is None:
+                    break
+
+                car_url = car_detail_url(car_id)
+                car_data = worker.parse_car_page(car_url)
+
+                if not car_data and worker.last_failure:
+                    delay = self.retry.schedule(car_url, worker.last_failure["stage"])
+                    if delay is not None:
+                        timer = threading.Timer(delay, id_queue.put, args=(car_id,))
+                        timer.daemon = True
+                        timer.start()
+                        continue
+
+                finish(car_data)
+
+            # Отложенные из-за капчи - повтор этим же парсером
+            for car_data in worker.retry_quarantined():
+                with lock:
+                    results.append(car_data)
+
+        logger.info("Конвейер: обход каталога + %s парсеров автомобилей", workers)
+        parsers = []
+        threads = []
 
+        try:
+            # Парсеры создаются по одному: если браузер очередного не запустился,
+            # уже созданные закрываются в finally
+            for _ in range(workers):
+                parsers.append(
+                    EncarParser(
+                        headless=self.headless,
+                        enable_translation=self.enable_translation,
+                        preset_brand=self.preset_brand,
+                    )
+                )
+
+            for i, worker in enumerate(parsers):
+                thread = threading.Thread(
+                    target=consume, args=(worker,), name=f"detail-worker-{i}"
+                )
+                thread.start()
+                threads.append(thread)
+
+            for car_id in self.iter_car_ids(brand_key, start_page, max_pages, since=since):
+                if max_cars and counters["produced"] >= max_cars:
+                    break
+                id_queue.put(car_id)
+                with lock:
+                    counters["produced"] += 1
+                METRICS.set_gauge("catalog_queue_depth", id_queue.qsize())
+        finally:
+            # Ждем окончательных результатов (включая отложенные повторы)
+            with lock:
+                while counters["finished"] < counters["produced"] and any(
+                    thread.is_alive() for thread in threads
+                ):
+                    lock.wait(timeout=1)
+
+            for _ in threads:
+                id_queue.put(None)
+            for thread in threads:
+                thread.join()
+
+            for worker in parsers:
+                self.logger.merge(worker.logger)
+                worker.close()
+            METRICS.set_gauge("catalog_queue_depth", 0)
+
+        logger.info("Конвейер завершен: получено %s автомобилей", len(results))
+        return results
+
+    def _index_output(self, output_file):
+        """
+        Добавление файла результатов в индекс для поиска (data/catalog_index.py)
+
+        Args:
+            output_file: Путь к сохраненному файлу
+        """
+        try:
+            with CatalogIndex() as index:
+                updated = index.ingest_file(output_file)
+            logger.info("Индекс поиска: обновлено автомобилей %s", updated)
         except Exception as e:
-            print(f"Ошибка сохранения debug информации: {e}")
+            logger.error("Ошибка обновления индекса: %s", e)
+            self.logger.log_error("catalog_index", str(e))
 
+    def _record_price_history(self, brand_key):
+        """
+        Запись цен и пробега автомобилей запуска в историю цен
+        (после полного обхода каталога - и отметка снятых с продажи)
+
+        Args:
+            brand_key: Ключ марки
+        """
+        if not PRICE_HISTORY_SETTINGS["enabled"] or not self.cars_data:
+            return
+
+        try:
+            with PriceHistoryStore() as history:
+                added = history.record(self.cars_data, brand=brand_key)
+
+                removed = 0
+                if brand_key in self.full_catalog_ids:
+                    seen_ids, cars_count = self.full_catalog_ids[brand_key]
+                    if len(seen_ids) >= cars_count * PRICE_HISTORY_SETTINGS["min_coverage"]:
+                        removed = history.mark_removed(brand_key, seen_ids)
+                    else:
+                        logger.warning(
+                            "Каталог пройден не полностью (%s из %s) - снятые не отмечаются",
+                            len(seen_ids),
+                            cars_count,
+                        )
+
+            logger.info("История цен: новых наблюдений %s, снято %s", added, removed)
+        except Exception as e:
+            logger.error("Ошибка записи истории цен: %s", e)
+            self.logger.log_error("price_history", str(e))
+
+    @profile_run("parse_catalog")
     def parse_catalog(
         self,
         brand_key=None,
@@ -591,6 +1417,7 @@ class EncarParser:
         start_page=None,
         max_pages=None,
         filename=None,
+        delta=None,
     ):
         """
         Основной метод парсинга каталога
@@ -601,6 +1428,8 @@ class EncarParser:
             start_page: Стартовая страница
             max_pages: Максимум страниц
             filename: Имя файла
+            delta: Только автомобили, измененные после прошлого запуска
+                (None = CATALOG_CONFIG["delta"])
         """
         start_time = time.time()
         self.logger.start()
@@ -612,51 +1441,98 @@ class EncarParser:
             if max_cars is None:
                 max_cars = CATALOG_CONFIG.get("max_cars", 1000)
 
-            print("\n" + "=" * 60)
-            print("НАЧАЛО ПАРСИНГА КАТАЛОГА")
-            print(f"Марка: {brand_key.upper()} ({BRANDS[brand_key]})")
-            print("=" * 60)
-
-            # Получаем ссылки на автомобили
-            car_links = self.get_car_links(
-                brand_key=brand_key, start_page=start_page, max_pages=max_pages
+            logger.info(
+                "Начало парсинга каталога: %s (%s)",
+                brand_key.upper(),
+                BRANDS[brand_key],
             )
 
-            if not car_links:
-                print("Не найдено ссылок на автомобили")
-                return
-
-            total_to_parse = min(len(car_links), max_cars)
-            print(f"\nНачинаем парсинг {total_to_parse} автомобилей...")
+            if delta is None:
+                delta = CATALOG_CONFIG.get("delta", False)
+
+            since = None
+            if delta:
+                high_water = HighWaterMarks()
+                since = high_water.get(brand_key, build_search_query(brand_key))
+                logger.info("Обход изменений с отметки: %s", since or "нет (первый запуск)")
+                self.logger.set_run_info("delta_since", {brand_key: since})
+
+            detail_workers = CATALOG_CONFIG.get("detail_workers", 0)
+            if detail_workers:
+                # Парсинг автомобилей параллельно с обходом каталога
+                self.cars_data.extend(
+                    self.parse_pipelined(
+                        brand_key,
+                        max_cars,
+                        start_page,
+                        max_pages,
+                        workers=detail_workers,
+                        since=since,
+                    )
+                )
+            else:
+                # Получаем ссылки на автомобили
+                car_links = self.get_car_links(
+                    brand_key=brand_key,
+                    start_page=start_page,
+                    max_pages=max_pages,
+                    since=since,
+                    max_cars=max_cars,
+                )
 
-            # Парсим каждый автомобиль
-            for i, car_url in enumerate(car_links[:max_cars]):
-                print(f"\nПрогресс: {i + 1}/{total_to_parse}")
+                if not car_links:
+                    if since:
+                        logger.info("Изменений после %s нет", since)
+                    else:
+                        logger.warning("Не найдено ссылок на автомобили")
+                    return
 
-                car_data = self.parse_car_page(car_url)
+                total_to_parse = min(len(car_links), max_cars)
+                logger.info("Начинаем парсинг %s автомобилей...", total_to_parse)
 
-                if car_data:
-                    self.cars_data.append(car_data)
-                    brand = car_data.get("brand", "Unknown")
-                    model = car_data.get("model", "Unknown")
-                    img_count = len(car_data.get("images", []))
-                    print(f"Успешно: {brand} {model} ({img_count} фото)")
+                self.cars_data.extend(self.parse_links(car_links[:max_cars]))
 
-                # Пауза между запросами
-                time.sleep(self.settings.get("request_delay", 2))
+                # Повтор автомобилей, отложенных из-за капчи
+                self.cars_data.extend(self.retry_quarantined())
 
             # Сохраняем данные
             if self.cars_data:
-                save_to_json(self.cars_data, filename)
+                output_file = save_to_json(self.cars_data, filename)
+                if output_file and INDEX_SETTINGS["enabled"]:
+                    self._index_output(output_file)
             else:
-                print("Нет данных для сохранения")
+                logger.warning("Нет данных для сохранения")
+
+            self._record_price_history(brand_key)
+
+            # Отметка - только после сохранения и только после завершенного
+            # обхода без потерь, чтобы следующий запуск не пропустил автомобили
+            if delta and brand_key in self.delta_walks:
+                newest = self.delta_walks[brand_key].new_mark(
+                    self.modified_dates, [car_data.get("id") for car_data in self.cars_data]
+                )
+                if newest:
+                    high_water.update(brand_key, build_search_query(brand_key), newest)
 
             # Показываем статистику
             elapsed_time = time.time() - start_time
             self.logger.print_statistics(elapsed_time, self.cars_data)
+            quarantine_file = self.quarantine.save(output_dir=FILE_SETTINGS["output_dir"])
+            if quarantine_file:
+                logger.warning("Отложенные из-за капчи автомобили: %s", quarantine_file)
+
+            rate = self.rate_limiter.get_stats()
+            logger.info(
+                "Темп запросов: %.1f стр/мин (пауза %.2f с, замедлений: %s)",
+                rate["pages_per_minute"],
+                rate["delay"],
+                rate["backoffs"],
+            )
+            logger.info("Повторы: %s", self.retry.get_stats())
+            self.logger.save_log(output_dir=FILE_SETTINGS["log_dir"])
 
         except Exception as e:
-            print(f"Ошибка в основном процессе парсинга: {e}")
+            logger.error("Ошибка в основном процессе парсинга: %s", e)
             self.logger.log_error("parse_catalog", str(e))
         finally:
             self.close()
@@ -0,0 +1,100 @@
+"""
+Catalog probe service
+Количество автомобилей и первая страница каталога через поисковый API
+"""
+
+import json
+import logging
+import threading
+import time
+from urllib.request import Request, urlopen
+
+from encar_parser.config.catalog_settings import CATALOG_CONFIG, build_search_api_url
+from encar_parser.utils.car_ids import parse_impression_id
+from encar_parser.utils.high_water import normalize_modified_date
+
+logger = logging.getLogger(__name__)
+
+API_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+    ),
+    "Referer": "https://www.encar.com/",
+    "Accept": "application/json",
+}
+
+
+def fetch_catalog_page(brand_key, page=1, timeout=10, **kwargs):
+    """
+    Запрос страницы каталога к поисковому API
+
+    Args:
+        brand_key: Ключ марки из BRANDS
+        page: Номер страницы
+        timeout: Таймаут запроса (секунды)
+        **kwargs: Параметры каталога (sort_by, items_per_page и т.д.)
+
+    Returns:
+        dict: {"count": общее количество, "car_ids": ID автомобилей страницы,
+            "modified": {ID: ModifiedDate "YYYY-MM-DD HH:MM:SS"}}
+
+    Raises:
+        Exception: При ошибке запроса или неожиданном ответе
+    """
+    request = Request(build_search_api_url(brand_key, page=page, **kwargs), headers=API_HEADERS)
+    with urlopen(request, timeout=timeout) as response:
+        data = json.loads(response.read().decode("utf-8"))
+
+    car_ids = []
+    modified = {}
+    for car in data.get("SearchResults", []):
+        car_id = parse_impression_id(str(car["Id"]))
+        if car_id is None:
+            continue
+        car_ids.append(car_id)
+        modified_date = normalize_modified_date(car.get("ModifiedDate"))
+        if modified_date:
+            modified[car_id] = modified_date
+
+    return {"count": int(data["Count"]), "car_ids": car_ids, "modified": modified}
+
+
+class CatalogCache:
+    """
+    Кэш результатов проверки каталога с ограниченным временем жизни
+    (ключ - марка, страница и фильтры)
+    """
+
+    def __init__(self, ttl=None):
+        """
+        Args:
+            ttl: Время жизни записи (секунды); None = CATALOG_CONFIG["count_cache_ttl"]
+        """
+        self.ttl = ttl if ttl is not None else CATALOG_CONFIG["count_cache_ttl"]
+        self.lock = threading.Lock()
+        self.entries = {}
+
+    def get(self, key):
+        """Значение или None, если записи нет или она устарела"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self.entries[key]
+                return None
+            return value
+
+    def set(self, key, value):
+        with self.lock:
+            self.entries[key] = (time.monotonic(), value)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+# Общий кэш процесса (все EncarParser)
+CATALOG_CACHE = CatalogCache()
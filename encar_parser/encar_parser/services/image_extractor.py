@@ -3,6 +3,10 @@ Image extraction service
 Сервис извлечения изображений из слайдера
 """
 
+import logging
+
+logger = logging.getLogger(__name__)
+
 
 class ImageExtractor:
     """
@@ -29,7 +33,7 @@ class ImageExtractor:
         images = []
 
         try:
-            print("Извлекаем изображения из слайдера...")
+            logger.debug("Извлекаем изображения из слайдера...")
 
             # Селектор контейнера слайдера
             slider_container = ".swiper-wrapper"
@@ -38,17 +42,17 @@ class ImageExtractor:
             slider = self.scraper.wait_for_element(slider_container)
 
             if not slider:
-                print("Слайдер не найден")
+                logger.warning("Слайдер не найден")
                 return images
 
-            print("Слайдер найден")
+            logger.debug("Слайдер найден")
 
             # Селектор изображений в слайдере
             image_selector = "img[class*=DetailCarPhotoPc_thumb__]"
 
             # Ищем все изображения в слайдере
             image_elements = self.scraper.find_elements(image_selector, parent=slider)
-            print(f"Найдено {len(image_elements)} изображений в слайдере")
+            logger.debug("Найдено %s изображений в слайдере", len(image_elements))
 
             for i, img_element in enumerate(image_elements):
                 if len(images) >= max_images:
@@ -69,13 +73,13 @@ class ImageExtractor:
                             images.append(img_src)
 
                 except Exception as e:
-                    print(f"Ошибка получения изображения {i + 1}: {e}")
+                    logger.debug("Ошибка получения изображения %s: %s", i + 1, e)
                     continue
 
         except Exception as e:
-            print(f"Ошибка извлечения изображений: {e}")
+            logger.warning("Ошибка извлечения изображений: %s", e)
 
-        print(f"Итого извлечено {len(images)} изображений")
+        logger.info("Итого извлечено %s изображений", len(images))
         return images
 
     def _is_valid_image_url(self, url):
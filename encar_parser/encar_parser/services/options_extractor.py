@@ -3,10 +3,14 @@ Options extraction service
 Сервис извлечения опций автомобиля
 """
 
+import logging
+
 from encar_parser.config.field_mappings import CAR_OPTIONS
 
 from .translator import translate_text
 
+logger = logging.getLogger(__name__)
+
 
 class OptionsExtractor:
     """
@@ -19,6 +23,7 @@ class OptionsExtractor:
             scraper: Экземпляр класса Scraper
         """
         self.scraper = scraper
+        self.last_error = None  # Ошибка последнего вызова extract_options
 
     def extract_options(self, car_id):
         """
@@ -32,16 +37,17 @@ class OptionsExtractor:
         """
         car_option_url = f"https://fem.encar.com/cars/option/{car_id}"
         car_options = CAR_OPTIONS.copy()
+        self.last_error = None
 
         try:
-            print(f"Открываем страницу опций: {car_option_url}")
+            logger.debug("Открываем страницу опций: %s", car_option_url)
 
             # Открываем страницу опций в новой вкладке
             self.scraper.open_new_tab(car_option_url, wait_time=5)
 
             # Получаем элементы опций
             elements = self.scraper.find_elements('[class*="PeerIntoCarOptions_"] > a')
-            print(f"Найдено {len(elements)} элементов опций")
+            logger.debug("Найдено %s элементов опций", len(elements))
 
             # Обрабатываем первые 53 элемента (стандартное количество опций)
             for element in elements[:53]:
@@ -58,7 +64,7 @@ class OptionsExtractor:
                         car_options[normalized_text] = True
 
                 except Exception as e:
-                    print(f"Ошибка обработки опции: {e}")
+                    logger.debug("Ошибка обработки опции: %s", e)
                     continue
 
             # Закрываем вкладку и возвращаемся к основной
@@ -66,10 +72,11 @@ class OptionsExtractor:
 
             # Подсчитываем количество активных опций
             active_count = sum(1 for value in car_options.values() if value)
-            print(f"{active_count} опций автомобиля успешно получены")
+            logger.info("%s опций автомобиля успешно получены", active_count)
 
         except Exception as e:
-            print(f"Не удалось открыть страницу опций: {e}")
+            logger.warning("Не удалось открыть страницу опций: %s", e)
+            self.last_error = e
             # Если что-то пошло не так, закрываем вкладку если она открыта
             try:
                 if len(self.scraper.driver.window_handles) > 1:
@@ -3,7 +3,38 @@ Utils module for Encar Parser
 Содержит вспомогательные утилиты
 """
 
+from .car_ids import CarIdCollector, car_detail_url
+from .debug_artifacts import DEBUG_ARTIFACTS, DebugArtifactManager
 from .file_handler import load_from_json, save_to_csv, save_to_json
+from .high_water import HighWaterMarks
+from .log_config import setup_logging
 from .logger import ParserLogger
+from .metrics import METRICS, start_metrics_server, write_metrics_textfile
+from .profiling import configure_profiling, profile_run
+from .quarantine import QUARANTINE, CaptchaQuarantine
+from .rate_limiter import RATE_LIMITER, AdaptiveRateLimiter
+from .retry import RetryableError, RetryManager
 
-__all__ = ["save_to_json", "save_to_csv", "load_from_json", "ParserLogger"]
+__all__ = [
+    "save_to_json",
+    "save_to_csv",
+    "load_from_json",
+    "ParserLogger",
+    "DebugArtifactManager",
+    "DEBUG_ARTIFACTS",
+    "CarIdCollector",
+    "car_detail_url",
+    "setup_logging",
+    "METRICS",
+    "start_metrics_server",
+    "write_metrics_textfile",
+    "configure_profiling",
+    "profile_run",
+    "QUARANTINE",
+    "CaptchaQuarantine",
+    "RATE_LIMITER",
+    "AdaptiveRateLimiter",
+    "RetryManager",
+    "RetryableError",
+    "HighWaterMarks",
+]
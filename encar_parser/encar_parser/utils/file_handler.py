@@ -5,9 +5,12 @@ File handling utilities
 
 import csv
 import json
+import logging
 from datetime import datetime
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
 
 def save_to_json(data, filename=None, output_dir="output"):
     """
@@ -40,13 +43,16 @@ def save_to_json(data, filename=None, output_dir="output"):
         with open(filepath, "w", encoding="utf-8") as jsonfile:
             json.dump(data, jsonfile, ensure_ascii=False, indent=2)
 
-        print(f"JSON сохранен: {filepath}")
-        print(f"Записей: {len(data) if isinstance(data, list) else 1}")
+        logger.info(
+            "JSON сохранен: %s (записей: %s)",
+            filepath,
+            len(data) if isinstance(data, list) else 1,
+        )
 
         return str(filepath)
 
     except Exception as e:
-        print(f"Ошибка сохранения JSON: {e}")
+        logger.error("Ошибка сохранения JSON: %s", e)
         return None
 
 
@@ -63,7 +69,7 @@ def save_to_csv(data, filename=None, output_dir="output"):
         str: Путь к сохраненному файлу
     """
     if not data:
-        print("Нет данных для сохранения")
+        logger.warning("Нет данных для сохранения")
         return None
 
     # Создаем директорию
@@ -102,13 +108,12 @@ def save_to_csv(data, filename=None, output_dir="output"):
                         row[key] = value
                 writer.writerow(row)
 
-        print(f"CSV сохранен: {filepath}")
-        print(f"Записей: {len(data)}")
+        logger.info("CSV сохранен: %s (записей: %s)", filepath, len(data))
 
         return str(filepath)
 
     except Exception as e:
-        print(f"Ошибка сохранения CSV: {e}")
+        logger.error("Ошибка сохранения CSV: %s", e)
         return None
 
 
@@ -126,20 +131,20 @@ def load_from_json(filepath):
         with open(filepath, "r", encoding="utf-8") as jsonfile:
             data = json.load(jsonfile)
 
-        print(f"JSON загружен: {filepath}")
+        logger.debug("JSON загружен: %s", filepath)
         if isinstance(data, list):
-            print(f"Записей: {len(data)}")
+            logger.debug("Записей: %s", len(data))
 
         return data
 
     except FileNotFoundError:
-        print(f"Файл не найден: {filepath}")
+        logger.warning("Файл не найден: %s", filepath)
         return None
     except json.JSONDecodeError as e:
-        print(f"Ошибка декодирования JSON: {e}")
+        logger.error("Ошибка декодирования JSON: %s", e)
         return None
     except Exception as e:
-        print(f"Ошибка загрузки JSON: {e}")
+        logger.error("Ошибка загрузки JSON: %s", e)
         return None
 
 
@@ -0,0 +1,137 @@
+"""
+Catalog high-water marks
+Отметки самого нового ModifiedDate по маркам для обхода только изменений
+"""
+
+import json
+import logging
+import threading
+from pathlib import Path
+
+from encar_parser.config.catalog_settings import CATALOG_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_modified_date(value):
+    """
+    ModifiedDate из поискового API в виде "YYYY-MM-DD HH:MM:SS"
+    (такие строки сравниваются как даты)
+
+    Args:
+        value: Значение из API, например "2024-05-13 11:22:33.000 +09"
+
+    Returns:
+        str или None: Нормализованная дата или None, если формат неизвестен
+    """
+    value = str(value or "").replace("T", " ")[:19]
+    return value if len(value) == 19 and value[4] == "-" and value[13] == ":" else None
+
+
+class DeltaWalk:
+    """
+    Учет обхода каталога для отметки: выданные ID (по порядку каталога)
+    и признак того, что обход дошел до отметки прошлого запуска или до
+    конца каталога. Обход, прерванный на max_cars, не завершен.
+    """
+
+    def __init__(self):
+        self.car_ids = []
+        self.complete = False
+
+    def record(self, car_id):
+        """Отметка выданного ID"""
+        self.car_ids.append(car_id)
+
+    def new_mark(self, modified_dates, parsed_ids):
+        """
+        Новая отметка после запуска
+
+        Отметка двигается только вперед и только если обход завершен и все
+        выданные автомобили получены: иначе следующий запуск остановился бы
+        на новой отметке, и пропущенные автомобили между старой отметкой и
+        местом остановки не были бы обработаны никогда.
+
+        Args:
+            modified_dates: {ID: ModifiedDate} из поискового API
+            parsed_ids: ID успешно полученных автомобилей
+
+        Returns:
+            str или None: Самый новый ModifiedDate обхода или None
+                (оставить прежнюю отметку)
+        """
+        if not self.complete:
+            logger.warning("Обход каталога не завершен (max_cars) - отметка не сдвигается")
+            return None
+
+        parsed_ids = {str(car_id) for car_id in parsed_ids}
+        missing = [car_id for car_id in self.car_ids if str(car_id) not in parsed_ids]
+        if missing:
+            logger.warning(
+                "Не получено автомобилей: %s - отметка не сдвигается", len(missing)
+            )
+            return None
+
+        dates = [modified_dates.get(car_id) for car_id in self.car_ids]
+        return max(filter(None, dates), default=None)
+
+
+class HighWaterMarks:
+    """
+    Отметки по маркам в JSON-файле: самый новый ModifiedDate прошлого запуска.
+    Отметка привязана к поисковому запросу - при смене фильтров она не
+    используется (обход начинается заново).
+    """
+
+    def __init__(self, filepath=None):
+        """
+        Args:
+            filepath: Путь к файлу (по умолчанию CATALOG_CONFIG["delta_state_file"])
+        """
+        self.path = Path(filepath or CATALOG_CONFIG["delta_state_file"])
+        self.lock = threading.Lock()
+        self.marks = {}
+
+        if self.path.exists():
+            self.marks = json.loads(self.path.read_text(encoding="utf-8"))
+
+    def get(self, brand_key, query):
+        """
+        Отметка марки
+
+        Args:
+            brand_key: Ключ марки
+            query: Поисковый запрос, для которого сохранена отметка
+
+        Returns:
+            str или None: ModifiedDate или None (первый запуск или другой запрос)
+        """
+        with self.lock:
+            mark = self.marks.get(brand_key)
+        if not mark or mark["query"] != query:
+            return None
+        return mark["modified"]
+
+    def update(self, brand_key, query, modified):
+        """
+        Сохранение отметки (только если она новее текущей)
+
+        Args:
+            brand_key: Ключ марки
+            query: Поисковый запрос
+            modified: Самый новый ModifiedDate обхода
+        """
+        current = self.get(brand_key, query)
+        if current and current >= modified:
+            return
+
+        with self.lock:
+            self.marks[brand_key] = {"query": query, "modified": modified}
+            data = json.dumps(self.marks, ensure_ascii=False, indent=2)
+
+        # Атомарная запись (через временный файл)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_text(data, encoding="utf-8")
+        tmp_path.replace(self.path)
+        logger.info("Отметка обхода %s: %s", brand_key, modified)
@@ -3,8 +3,20 @@ Logging and statistics utilities
 Утилиты для логирования и статистики
 """
 
+import logging
+import math
+import time
+from collections import deque
+from contextlib import contextmanager
 from datetime import datetime
 
+from .metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+# Сколько последних ошибок хранить (старые вытесняются, счетчик сохраняется)
+MAX_STORED_ERRORS = 500
+
 
 class ParserLogger:
     """
@@ -20,9 +32,14 @@ class ParserLogger:
             "translation_errors": 0,
             "image_errors": 0,
             "option_errors": 0,
+            "captcha_detected": 0,
+            "quarantined": 0,
         }
 
-        self.errors = []
+        self.errors = deque(maxlen=MAX_STORED_ERRORS)
+        self.errors_total = 0
+        self.timings = {}
+        self.run_info = {}
         self.start_time = None
 
     def start(self):
@@ -38,6 +55,65 @@ class ParserLogger:
         """
         if counter_name in self.stats:
             self.stats[counter_name] += 1
+            METRICS.inc(f"parser_{counter_name}_total")
+
+    @contextmanager
+    def span(self, stage):
+        """
+        Замер длительности этапа парсинга
+
+        Пример:
+            with logger.span("open_url"):
+                scraper.open_url(url)
+
+        Args:
+            stage: Название этапа
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_timing(stage, time.perf_counter() - started)
+
+    def record_timing(self, stage, duration):
+        """
+        Запись длительности этапа
+
+        Args:
+            stage: Название этапа
+            duration: Длительность (секунды)
+        """
+        self.timings.setdefault(stage, []).append(duration)
+        METRICS.observe("parser_stage_duration_seconds", duration, stage=stage)
+
+    def get_timing_stats(self):
+        """
+        Статистика длительностей по этапам
+
+        Returns:
+            dict: {этап: {count, total, p50, p95, max}} (секунды)
+        """
+        stats = {}
+        for stage, durations in self.timings.items():
+            ordered = sorted(durations)
+            stats[stage] = {
+                "count": len(ordered),
+                "total": round(sum(ordered), 3),
+                "p50": round(_percentile(ordered, 50), 3),
+                "p95": round(_percentile(ordered, 95), 3),
+                "max": round(ordered[-1], 3),
+            }
+        return stats
+
+    def set_run_info(self, name, value):
+        """
+        Параметры запуска для лога (например, выбранный размер страницы каталога)
+
+        Args:
+            name: Название параметра
+            value: Значение (JSON-совместимое)
+        """
+        self.run_info[name] = value
 
     def log_error(self, location, error_message):
         """
@@ -53,6 +129,23 @@ class ParserLogger:
             "message": error_message,
         }
         self.errors.append(error_entry)
+        self.errors_total += 1
+
+    def merge(self, other):
+        """
+        Добавление статистики другого логгера (например, рабочих потоков)
+
+        Args:
+            other: ParserLogger
+        """
+        for name, value in other.stats.items():
+            self.stats[name] = self.stats.get(name, 0) + value
+        for stage, durations in other.timings.items():
+            self.timings.setdefault(stage, []).extend(durations)
+        self.errors.extend(other.errors)
+        self.errors_total += other.errors_total
+        for name, value in other.run_info.items():
+            self.run_info.setdefault(name, value)
 
     def get_stats(self):
         """
@@ -70,7 +163,7 @@ class ParserLogger:
         Returns:
             list: Список ошибок
         """
-        return self.errors.copy()
+        return list(self.errors)
 
     def print_statistics(self, elapsed_time=None, cars_data=None):
         """
@@ -102,6 +195,12 @@ class ParserLogger:
         if self.stats["option_errors"] > 0:
             print(f"Ошибок опций: {self.stats['option_errors']}")
 
+        if self.stats["captcha_detected"] > 0:
+            print(f"Капч обнаружено: {self.stats['captcha_detected']}")
+
+        if self.stats["quarantined"] > 0:
+            print(f"Отложено из-за капчи: {self.stats['quarantined']}")
+
         # Статистика по изображениям
         if cars_data:
             total_images = sum(len(car.get("images", [])) for car in cars_data)
@@ -127,12 +226,26 @@ class ParserLogger:
 
         print("=" * 60)
 
+        # Длительности этапов
+        timing_stats = self.get_timing_stats()
+        if timing_stats:
+            print("\nДлительность этапов (сек):")
+            print(f"  {'этап':<24}{'кол-во':>8}{'p50':>9}{'p95':>9}{'max':>9}{'всего':>10}")
+            for stage, stage_stats in sorted(
+                timing_stats.items(), key=lambda item: item[1]["total"], reverse=True
+            ):
+                print(
+                    f"  {stage:<24}{stage_stats['count']:>8}"
+                    f"{stage_stats['p50']:>9.2f}{stage_stats['p95']:>9.2f}"
+                    f"{stage_stats['max']:>9.2f}{stage_stats['total']:>10.1f}"
+                )
+
         # Вывод критических ошибок
         if self.errors:
-            print(f"\nЗафиксировано ошибок: {len(self.errors)}")
+            print(f"\nЗафиксировано ошибок: {self.errors_total}")
 
             # Показываем последние 5 ошибок
-            recent_errors = self.errors[-5:]
+            recent_errors = list(self.errors)[-5:]
             if recent_errors:
                 print("\nПоследние ошибки:")
                 for error in recent_errors:
@@ -149,8 +262,13 @@ class ParserLogger:
             "translation_errors": 0,
             "image_errors": 0,
             "option_errors": 0,
+            "captcha_detected": 0,
+            "quarantined": 0,
         }
-        self.errors = []
+        self.errors = deque(maxlen=MAX_STORED_ERRORS)
+        self.errors_total = 0
+        self.timings = {}
+        self.run_info = {}
         self.start_time = None
 
     def save_log(self, filename=None, output_dir="logs"):
@@ -177,7 +295,10 @@ class ParserLogger:
 
         log_data = {
             "statistics": self.stats,
-            "errors": self.errors,
+            "run_info": self.run_info,
+            "timings": self.get_timing_stats(),
+            "errors": list(self.errors),
+            "errors_total": self.errors_total,
             "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         }
 
@@ -185,9 +306,26 @@ class ParserLogger:
             with open(filepath, "w", encoding="utf-8") as f:
                 json.dump(log_data, f, ensure_ascii=False, indent=2)
 
-            print(f"Лог сохранен: {filepath}")
+            logger.info("Лог сохранен: %s", filepath)
             return str(filepath)
 
         except Exception as e:
-            print(f"Ошибка сохранения лога: {e}")
+            logger.error("Ошибка сохранения лога: %s", e)
             return None
+
+
+def _percentile(ordered, percent):
+    """
+    Перцентиль по методу ближайшего ранга
+
+    Args:
+        ordered: Отсортированный список значений
+        percent: Перцентиль (0-100)
+
+    Returns:
+        float: Значение перцентиля
+    """
+    if not ordered:
+        return 0.0
+    rank = max(math.ceil(percent / 100 * len(ordered)), 1)
+    return ordered[min(rank, len(ordered)) - 1]
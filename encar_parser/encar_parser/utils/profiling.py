@@ -0,0 +1,232 @@
+"""
+Profiling hooks
+Профилирование запусков парсера (cProfile или сэмплирование стеков)
+"""
+
+import cProfile
+import json
+import logging
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from encar_parser.config.settings import PROFILE_SETTINGS
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ("cprofile", "sample")
+
+# Профилируется только внешний вызов (parse_catalog -> parse_car_page)
+_active = threading.local()
+
+
+def configure_profiling(mode, output_dir=None, interval=None):
+    """
+    Включение профилирования (флаг --profile или переменная окружения бота)
+
+    Args:
+        mode: "cprofile", "sample" или пустое значение (выключено)
+        output_dir: Директория для результатов
+        interval: Интервал сэмплирования (секунды)
+    """
+    if mode and mode not in PROFILE_MODES:
+        raise ValueError(f"Неизвестный режим профилирования: {mode}")
+
+    PROFILE_SETTINGS["mode"] = mode or ""
+    if output_dir:
+        PROFILE_SETTINGS["dir"] = output_dir
+    if interval:
+        PROFILE_SETTINGS["interval"] = interval
+
+
+def _is_selenium(filename):
+    """Файл относится к пакету selenium"""
+    return "selenium" in Path(filename).parts
+
+
+class StackSampler:
+    """
+    Сэмплирующий профайлер: периодически снимает стек одного потока.
+    Результат - свернутые стеки (формат flamegraph.pl / speedscope).
+    """
+
+    def __init__(self, thread_id, interval=0.005):
+        """
+        Args:
+            thread_id: ID потока, стек которого снимается
+            interval: Интервал между снимками (секунды)
+        """
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.webdriver_samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="profile-sampler", daemon=True
+        )
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+
+            names = []
+            in_webdriver = False
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{Path(code.co_filename).stem}:{code.co_name}")
+                in_webdriver = in_webdriver or _is_selenium(code.co_filename)
+                frame = frame.f_back
+
+            self.stacks[";".join(reversed(names))] += 1
+            if in_webdriver:
+                self.webdriver_samples += 1
+
+    @property
+    def total_samples(self):
+        return sum(self.stacks.values())
+
+    def write_folded(self, filepath):
+        """Запись свернутых стеков: "a;b;c <количество>" на строку"""
+        lines = [f"{stack} {count}" for stack, count in self.stacks.most_common()]
+        Path(filepath).write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def split_webdriver_time(stats):
+    """
+    Разделение времени по данным cProfile
+
+    - webdriver: команды WebDriver (WebDriver.execute) и ожидание
+      в WebDriverWait (time.sleep, вызванный из selenium)
+    - sleep: остальные паузы (request_delay, scroll_pause и т.п.)
+
+    Args:
+        stats: pstats.Stats
+
+    Returns:
+        dict: {"webdriver": секунды, "sleep": секунды}
+    """
+    webdriver = 0.0
+    sleep = 0.0
+
+    for (filename, _, func), (_, _, _, cumtime, callers) in stats.stats.items():
+        if func == "execute" and _is_selenium(filename) and filename.endswith("webdriver.py"):
+            webdriver += cumtime
+        elif func == "<built-in method time.sleep>":
+            for (caller_file, _, _), caller_stats in callers.items():
+                if _is_selenium(caller_file):
+                    webdriver += caller_stats[2]
+                else:
+                    sleep += caller_stats[2]
+
+    return {"webdriver": webdriver, "sleep": sleep}
+
+
+@contextmanager
+def profile_run(name):
+    """
+    Профилирование одного запуска (контекстный менеджер или декоратор)
+
+    При включенном профилировании в PROFILE_SETTINGS["dir"] сохраняются:
+    - {name}_{ts}.prof (cProfile: snakeviz, flameprof, gprof2dot) или
+      {name}_{ts}.folded (сэмплирование: flamegraph.pl, speedscope)
+    - {name}_{ts}_summary.json: время всего, в WebDriver, в паузах и в Python
+
+    Args:
+        name: Имя запуска (например, "parse_catalog")
+    """
+    mode = PROFILE_SETTINGS["mode"]
+    if not mode or getattr(_active, "running", False):
+        yield
+        return
+
+    profiler = None
+    sampler = None
+
+    if mode == "cprofile":
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as e:
+            # Другой профайлер уже активен (cProfile не работает в нескольких потоках сразу)
+            logger.debug("Профилирование %s пропущено: %s", name, e)
+            yield
+            return
+    else:
+        sampler = StackSampler(threading.get_ident(), PROFILE_SETTINGS["interval"])
+        sampler.start()
+
+    _active.running = True
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        wall = time.perf_counter() - start
+        _active.running = False
+
+        if profiler:
+            profiler.disable()
+        if sampler:
+            sampler.stop()
+
+        try:
+            _save_profile(name, wall, profiler, sampler)
+        except Exception as e:
+            logger.error("Ошибка сохранения профиля %s: %s", name, e)
+
+
+def _save_profile(name, wall, profiler, sampler):
+    """Запись профиля и сводки по времени"""
+    output_dir = Path(PROFILE_SETTINGS["dir"])
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    base = output_dir / f"{name}_{timestamp}"
+
+    if profiler:
+        profile_path = f"{base}.prof"
+        profiler.dump_stats(profile_path)
+        split = split_webdriver_time(pstats.Stats(profiler))
+    else:
+        profile_path = f"{base}.folded"
+        sampler.write_folded(profile_path)
+        share = sampler.webdriver_samples / sampler.total_samples if sampler.total_samples else 0
+        # time.sleep вне selenium не виден в стеке Python - паузы входят в python_seconds
+        split = {"webdriver": wall * share, "sleep": None}
+
+    python_time = wall - split["webdriver"] - (split["sleep"] or 0)
+    summary = {
+        "name": name,
+        "mode": "cprofile" if profiler else "sample",
+        "profile": profile_path,
+        "wall_seconds": round(wall, 3),
+        "webdriver_seconds": round(split["webdriver"], 3),
+        "sleep_seconds": None if split["sleep"] is None else round(split["sleep"], 3),
+        "python_seconds": round(max(python_time, 0), 3),
+    }
+
+    Path(f"{base}_summary.json").write_text(
+        json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8"
+    )
+
+    logger.info(
+        "Профиль %s: всего %.2fс, WebDriver %.2fс, Python %.2fс -> %s",
+        name,
+        summary["wall_seconds"],
+        summary["webdriver_seconds"],
+        summary["python_seconds"],
+        profile_path,
+    )
@@ -0,0 +1,131 @@
+"""
+Adaptive request pacing
+Адаптивный темп запросов к Encar (общий для всех потоков и драйверов)
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+
+from encar_parser.config.settings import RATE_LIMIT_SETTINGS, SETTINGS
+from encar_parser.utils.metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveRateLimiter:
+    """
+    Пауза между открытиями страниц, которая подстраивается под сайт:
+    - каждая успешная страница уменьшает паузу на speedup_step
+    - капча увеличивает паузу в backoff_factor раз
+    - доля ошибок выше error_threshold в окне error_window - тоже
+
+    Пауза общая: потоки получают слоты по очереди, поэтому суммарный
+    темп не зависит от количества запущенных браузеров.
+    """
+
+    def __init__(self, settings=None):
+        """
+        Args:
+            settings: Настройки (по умолчанию RATE_LIMIT_SETTINGS)
+        """
+        self.settings = {**RATE_LIMIT_SETTINGS, **(settings or {})}
+        initial = self.settings["initial_delay"]
+        if initial is None:
+            initial = SETTINGS.get("request_delay", 2)
+
+        self.lock = threading.Lock()
+        self.delay = self._clamp(initial)
+        self.next_slot = 0.0
+        self.outcomes = deque(maxlen=self.settings["error_window"])
+        self.backoffs = 0
+
+        self._report()
+
+    def _clamp(self, delay):
+        return min(max(delay, self.settings["min_delay"]), self.settings["max_delay"])
+
+    def _report(self):
+        METRICS.set_gauge("rate_limiter_delay_seconds", round(self.delay, 3))
+        METRICS.set_gauge("rate_limiter_pages_per_minute", round(self.get_rate(), 2))
+
+    def acquire(self):
+        """
+        Ожидание своего слота перед открытием страницы
+
+        Returns:
+            float: Время ожидания (секунды)
+        """
+        if not self.settings["enabled"]:
+            return 0.0
+
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.delay
+
+        wait = slot - now
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def on_success(self):
+        """Страница загружена без капчи и ошибок - ускоряемся"""
+        with self.lock:
+            self.outcomes.append(False)
+            self.delay = self._clamp(self.delay - self.settings["speedup_step"])
+            self._report()
+
+    def on_error(self):
+        """Ошибка парсинга - замедляемся, если ошибок стало много"""
+        with self.lock:
+            self.outcomes.append(True)
+            if len(self.outcomes) < self.outcomes.maxlen:
+                return
+
+            error_rate = sum(self.outcomes) / len(self.outcomes)
+            if error_rate > self.settings["error_threshold"]:
+                self.outcomes.clear()
+                self._backoff(f"доля ошибок {error_rate:.0%}")
+
+    def on_captcha(self):
+        """Обнаружена капча - экспоненциально замедляемся"""
+        with self.lock:
+            self._backoff("капча")
+
+    def _backoff(self, reason):
+        """Увеличение паузы (вызывается под lock)"""
+        self.delay = self._clamp(self.delay * self.settings["backoff_factor"])
+        self.next_slot = max(self.next_slot, time.monotonic() + self.delay)
+        self.backoffs += 1
+        self._report()
+        METRICS.inc("rate_limiter_backoffs_total")
+        logger.warning("Замедление (%s): пауза %.1f с", reason, self.delay)
+
+    def get_rate(self):
+        """
+        Текущий темп
+
+        Returns:
+            float: Страниц в минуту
+        """
+        return 60 / self.delay if self.delay else 0.0
+
+    def get_stats(self):
+        """
+        Состояние ограничителя
+
+        Returns:
+            dict: Пауза, темп и количество замедлений
+        """
+        with self.lock:
+            return {
+                "delay": round(self.delay, 3),
+                "pages_per_minute": round(self.get_rate(), 2),
+                "backoffs": self.backoffs,
+            }
+
+
+# Общий ограничитель процесса (все EncarParser и потоки пула)
+RATE_LIMITER = AdaptiveRateLimiter()
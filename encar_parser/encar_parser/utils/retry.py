@@ -0,0 +1,142 @@
+"""
+Retry policies
+Политики повторных попыток по этапам парсинга
+"""
+
+import logging
+import random
+import threading
+from collections import Counter
+
+from encar_parser.config.settings import RETRY_SETTINGS, SETTINGS
+from encar_parser.utils.metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+
+class RetryableError(Exception):
+    """Ошибка этапа парсинга, который можно повторить"""
+
+    def __init__(self, message, stage):
+        """
+        Args:
+            message: Текст ошибки
+            stage: Этап, на котором произошла ошибка
+        """
+        super().__init__(message)
+        self.stage = stage
+
+
+class RetryManager:
+    """
+    Решает, повторять ли неудачный этап, и через сколько:
+    - у каждого этапа своя политика (количество попыток, задержки)
+    - задержка растет экспоненциально, со случайным разбросом (jitter)
+    - бюджет ограничивает общее число повторов за запуск
+    """
+
+    def __init__(self, policies=None, budget=None):
+        """
+        Args:
+            policies: Политики этапов (по умолчанию RETRY_SETTINGS["policies"])
+            budget: Максимум повторов за запуск (по умолчанию RETRY_SETTINGS["budget"])
+        """
+        self.policies = policies if policies is not None else RETRY_SETTINGS["policies"]
+        self.budget = budget if budget is not None else RETRY_SETTINGS["budget"]
+
+        self.lock = threading.Lock()
+        self.attempts = Counter()
+        self.retries = Counter()
+        self.exhausted = Counter()
+
+    def get_policy(self, stage):
+        """
+        Политика этапа
+
+        Returns:
+            dict или None: Политика или None, если этап не повторяется
+        """
+        policy = self.policies.get(stage)
+        if policy is None:
+            return None
+
+        max_retries = policy.get("max_retries")
+        if max_retries is None:
+            max_retries = SETTINGS.get("max_retries", 3)
+        return {**policy, "max_retries": max_retries}
+
+    def compute_delay(self, stage, attempt):
+        """
+        Задержка перед повтором: base_delay * 2^attempt (не больше max_delay)
+        со случайным отклонением +-jitter
+
+        Args:
+            stage: Этап
+            attempt: Номер повтора (с 0)
+
+        Returns:
+            float: Задержка (секунды)
+        """
+        policy = self.get_policy(stage) or {}
+        delay = min(
+            policy.get("base_delay", 1) * 2**attempt, policy.get("max_delay", 60)
+        )
+        jitter = policy.get("jitter", 0.5)
+        return delay * random.uniform(1 - jitter, 1 + jitter)
+
+    def schedule(self, key, stage):
+        """
+        Регистрация повтора
+
+        Args:
+            key: Что повторяется (URL или "options:<id>")
+            stage: Этап, на котором произошла ошибка
+
+        Returns:
+            float или None: Задержка перед повтором или None, если повтор
+                не разрешен (этап не повторяется, попытки или бюджет исчерпаны)
+        """
+        policy = self.get_policy(stage)
+        if policy is None:
+            return None
+
+        with self.lock:
+            attempt = self.attempts[key]
+            if attempt >= policy["max_retries"]:
+                self.exhausted[stage] += 1
+                return None
+
+            if self.budget is not None and sum(self.retries.values()) >= self.budget:
+                self.exhausted["budget"] += 1
+                logger.warning("Бюджет повторов исчерпан (%s)", self.budget)
+                return None
+
+            self.attempts[key] += 1
+            self.retries[stage] += 1
+
+        METRICS.inc("parser_retries_total", stage=stage)
+        delay = self.compute_delay(stage, attempt)
+        logger.info(
+            "Повтор %s (этап %s, попытка %s/%s) через %.1f с",
+            key,
+            stage,
+            attempt + 1,
+            policy["max_retries"],
+            delay,
+        )
+        return delay
+
+    def get_stats(self):
+        """
+        Статистика повторов
+
+        Returns:
+            dict: Повторы и отказы по этапам, остаток бюджета
+        """
+        with self.lock:
+            used = sum(self.retries.values())
+            return {
+                "retries": dict(self.retries),
+                "exhausted": dict(self.exhausted),
+                "budget_left": None if self.budget is None else self.budget - used,
+            }
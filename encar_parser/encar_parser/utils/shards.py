@@ -0,0 +1,127 @@
+"""
+Shard planning and merging
+Разбиение страниц каталога на части и объединение результатов частей
+(без браузера - используется core/sharding.py и main_linux.py)
+"""
+
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+
+from encar_parser.config.catalog_settings import SHARD_CONFIG
+from encar_parser.utils.file_handler import save_to_json
+
+logger = logging.getLogger(__name__)
+
+
+def plan_shards(start_page, pages, shards):
+    """
+    Разбиение страниц [start_page, start_page + pages) на последовательные диапазоны
+
+    Args:
+        start_page: Первая страница
+        pages: Количество страниц
+        shards: Количество частей
+
+    Returns:
+        list: [(первая страница, количество страниц), ...] (пустые части пропускаются)
+    """
+    base, extra = divmod(pages, shards)
+    plan = []
+    page = start_page
+    for index in range(shards):
+        count = base + (1 if index < extra else 0)
+        if count:
+            plan.append((page, count))
+        page += count
+    return plan
+
+
+def parse_shard_spec(spec):
+    """
+    Разбор номера части вида "2/4" (части нумеруются с 1)
+
+    Returns:
+        tuple: (номер, всего частей)
+
+    Raises:
+        ValueError: При неверном формате
+    """
+    index, _, total = spec.partition("/")
+    index, total = int(index), int(total)
+    if not 1 <= index <= total:
+        raise ValueError(f"Неверный номер части: {spec} (ожидается 1..N/N)")
+    return index, total
+
+
+def _car_key(car_data):
+    """Ключ автомобиля для удаления повторов (ID, иначе URL)"""
+    return str(car_data.get("id") or car_data.get("url"))
+
+
+def _parsed_at(car_data):
+    """Время парсинга записи (для выбора самой свежей из повторов)"""
+    try:
+        return datetime.strptime(car_data.get("parsed_at", ""), "%d/%m/%Y %H:%M:%S")
+    except ValueError:
+        return datetime.min
+
+
+def merge_shards(paths, filename=None, output_dir=None):
+    """
+    Объединение частичных JSONL-файлов частей без повторов по ID автомобиля
+    (из повторов остается самая свежая запись по parsed_at)
+
+    Args:
+        paths: Файлы .jsonl и/или директории с ними
+        filename: Имя общего файла (по умолчанию <марка/директория>_merged_<timestamp>.json)
+        output_dir: Директория общего файла (по умолчанию SHARD_CONFIG["output_dir"])
+
+    Returns:
+        dict: {"files", "records", "unique", "duplicates", "output"}
+    """
+    files = []
+    for path in map(Path, paths):
+        files.extend(sorted(path.glob("*.jsonl")) if path.is_dir() else [path])
+
+    merged = {}
+    records = 0
+    for path in files:
+        with open(path, encoding="utf-8") as shard_file:
+            for line in shard_file:
+                if not line.strip():
+                    continue
+                car_data = json.loads(line)
+                records += 1
+
+                key = _car_key(car_data)
+                if key not in merged or _parsed_at(car_data) >= _parsed_at(merged[key]):
+                    merged[key] = car_data
+
+    summary = {
+        "files": len(files),
+        "records": records,
+        "unique": len(merged),
+        "duplicates": records - len(merged),
+        "output": None,
+    }
+
+    if merged:
+        if filename is None:
+            prefix = Path(paths[0]).stem if len(paths) == 1 else "shards"
+            filename = f"{prefix}_merged_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        summary["output"] = save_to_json(
+            list(merged.values()), filename, str(output_dir or SHARD_CONFIG["output_dir"])
+        )
+    else:
+        logger.warning("Нет данных для объединения")
+
+    logger.info(
+        "Объединено файлов: %s, записей: %s, уникальных: %s, повторов: %s",
+        summary["files"],
+        summary["records"],
+        summary["unique"],
+        summary["duplicates"],
+    )
+    return summary
@@ -0,0 +1,129 @@
+"""
+Тесты разбора строки поиска и локального индекса результатов
+"""
+
+import json
+
+import pytest
+
+from encar_parser.data.catalog_index import CatalogIndex, parse_search_terms
+
+CARS = [
+    {
+        "id": "40647630",
+        "brand": "Hyundai",
+        "model": "쏘나타",
+        "year": "21/03(2021년형)",
+        "price": "25000000",
+        "mileage": "45,000km",
+        "fuel": "가솔린",
+        "options": {"sunroof": True, "smart_key": True},
+        "parsed_at": "01/10/2026 10:00:00",
+    },
+    {
+        "id": "39912345",
+        "brand": "현대",
+        "model": "아반떼",
+        "year": "2019",
+        "price": "15000000",
+        "mileage": "80,000km",
+        "fuel": "가솔린",
+        "options": {"sunroof": False, "smart_key": True},
+        "parsed_at": "01/10/2026 10:00:00",
+    },
+    {
+        "id": "38800001",
+        "brand": "Kia",
+        "model": "쏘렌토",
+        "year": "2022",
+        "price": "38000000",
+        "mileage": "20,000km",
+        "fuel": "디젤",
+        "options": {"sunroof": True},
+        "parsed_at": "01/10/2026 10:00:00",
+    },
+]
+
+
+@pytest.fixture
+def index(tmp_path):
+    with CatalogIndex(tmp_path / "index.sqlite3") as catalog_index:
+        catalog_index.ingest_cars(CARS, "test")
+        yield catalog_index
+
+
+def _ids(cars):
+    return sorted(car["id"] for car in cars)
+
+
+def test_parse_search_terms_ranges_and_options():
+    filters = parse_search_terms(
+        "brand=kia year=2018-2021 price=-3000 mileage=50000- option=sunroof,smart_key 쏘렌토"
+    )
+    assert filters == {
+        "brand": "kia",
+        "year_from": 2018,
+        "year_to": 2021,
+        "price_to": 3000,
+        "mileage_from": 50000,
+        "options": ["sunroof", "smart_key"],
+        "text": "쏘렌토",
+    }
+
+
+def test_parse_search_terms_single_value_is_exact_range():
+    assert parse_search_terms("year=2020") == {"year_from": 2020, "year_to": 2020}
+
+
+def test_parse_search_terms_rejects_unknown_filter():
+    with pytest.raises(ValueError):
+        parse_search_terms("color=white")
+
+
+def test_search_filters(index):
+    assert index.count() == 3
+    assert _ids(index.search(brand="hyundai")) == ["39912345", "40647630"]
+    assert _ids(index.search(year_from=2020)) == ["38800001", "40647630"]
+    assert _ids(index.search(price_to=2500)) == ["39912345", "40647630"]
+    assert _ids(index.search(mileage_to=50000, fuel="디젤")) == ["38800001"]
+
+
+def test_search_order_and_limit(index):
+    cars = index.search(order="-price", limit=2)
+    assert [car["id"] for car in cars] == ["38800001", "40647630"]
+
+
+def test_search_options_mask(index):
+    assert _ids(index.search(options=["sunroof"])) == ["38800001", "40647630"]
+    assert _ids(index.search(options=["sunroof", "smart_key"])) == ["40647630"]
+    assert index.search(options=["heated_seats"]) == []
+    assert index.count(options=["heated_seats"]) == 0
+
+
+def test_text_search(index):
+    assert _ids(index.search(text="쏘")) == ["38800001", "40647630"]
+    assert _ids(index.search(text="kia 쏘렌")) == ["38800001"]
+
+
+def test_text_without_words_is_ignored(index):
+    assert index.count(**parse_search_terms("-")) == 3
+
+
+def test_newer_record_replaces_older(index):
+    updated = dict(CARS[0], price="21000000", parsed_at="02/10/2026 10:00:00")
+    stale = dict(CARS[0], price="99000000", parsed_at="30/09/2026 10:00:00")
+
+    assert index.ingest_cars([updated, stale], "test") == 1
+    assert index.search(text="쏘나타")[0]["price"] == "21000000"
+
+
+def test_sync_skips_unchanged_files(tmp_path):
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+    (output_dir / "cars.json").write_text(json.dumps(CARS), encoding="utf-8")
+    (output_dir / "state.json").write_text(json.dumps({"page": 3}), encoding="utf-8")
+
+    with CatalogIndex(tmp_path / "index.sqlite3") as catalog_index:
+        assert catalog_index.sync([output_dir]) == {"files": 2, "updated": 3}
+        assert catalog_index.sync([output_dir]) == {"files": 2, "updated": 0}
+        assert catalog_index.count() == 3
@@ -0,0 +1,75 @@
+"""
+Тесты построения и разбора поисковых запросов каталога
+"""
+
+import pytest
+
+from encar_parser.config.catalog_settings import (
+    CATALOG_CONFIG,
+    CatalogQuery,
+    build_catalog_url,
+    build_search_api_url,
+    parse_catalog_url,
+)
+
+
+def _explicit(query):
+    """Запрос с типами из конфига (from_query возвращает их явно)"""
+    query.car_type = query.car_type or CATALOG_CONFIG["car_type"]
+    query.sell_type = query.sell_type or CATALOG_CONFIG["sell_type"]
+    return query
+
+
+QUERIES = [
+    CatalogQuery("hyundai"),
+    CatalogQuery("kia", model="쏘렌토"),
+    CatalogQuery("hyundai", year_from=2018, year_to=2021, price_to=3000, mileage_to=80000),
+    CatalogQuery("bmw", year_from=2019, price_from=2000),
+    CatalogQuery("kia", fuel=["diesel"], region=["seoul"]),
+    CatalogQuery("hyundai", model="쏘나타", fuel=["gasoline", "hybrid"], region=["seoul", "busan"]),
+]
+
+
+@pytest.mark.parametrize("query", QUERIES, ids=range(len(QUERIES)))
+def test_query_round_trip(query):
+    assert CatalogQuery.from_query(query.to_query()) == _explicit(query)
+
+
+def test_query_string_shape():
+    text = CatalogQuery("hyundai", model="쏘나타", fuel=["gasoline", "diesel"]).to_query()
+    assert text.startswith("(And.Hidden.N._.(C.CarType.")
+    assert "(C.Manufacturer.현대._.ModelGroup.쏘나타.)" in text
+    assert "(Or.FuelType.가솔린._.FuelType.디젤.)" in text
+
+
+def test_open_ranges():
+    text = CatalogQuery("kia", year_from=2020, price_to=1500).to_query()
+    assert "Year.range(202000..)." in text
+    assert "Price.range(..1500)." in text
+
+    parsed = CatalogQuery.from_query(text)
+    assert (parsed.year_from, parsed.year_to) == (2020, None)
+    assert (parsed.price_from, parsed.price_to) == (None, 1500)
+
+
+def test_catalog_url_round_trip():
+    query = CatalogQuery("kia", model="쏘렌토", year_from=2019, region=["seoul", "incheon"])
+    url = build_catalog_url(page=3, sort_by="PriceAsc", items_per_page=50, query=query)
+
+    parsed = parse_catalog_url(url)
+    assert parsed["query"] == _explicit(query)
+    assert (parsed["page"], parsed["sort_by"], parsed["items_per_page"]) == (3, "PriceAsc", 50)
+
+
+def test_search_api_url_round_trip():
+    query = CatalogQuery("hyundai", price_from=1000, price_to=2500, fuel=["lpg"])
+    url = build_search_api_url(page=4, sort_by="ModifiedDate", items_per_page=100, query=query)
+
+    parsed = parse_catalog_url(url)
+    assert parsed["query"] == _explicit(query)
+    assert (parsed["page"], parsed["sort_by"], parsed["items_per_page"]) == (4, "ModifiedDate", 100)
+
+
+def test_parse_rejects_url_without_query():
+    with pytest.raises(ValueError):
+        parse_catalog_url("https://www.encar.com/index.do")
@@ -0,0 +1,70 @@
+"""
+Тесты отметки обхода изменений (ModifiedDate) по маркам
+"""
+
+from itertools import islice
+
+from encar_parser.utils.high_water import DeltaWalk, HighWaterMarks
+
+# Каталог отсортирован по ModifiedDate (сначала новые); отметка прошлого запуска
+CATALOG = [
+    (105, "2026-05-05 10:00:00"),
+    (104, "2026-05-04 10:00:00"),
+    (103, "2026-05-03 10:00:00"),
+    (102, "2026-05-02 10:00:00"),
+    (101, "2026-05-01 10:00:00"),
+]
+SINCE = "2026-05-02 00:00:00"
+MODIFIED = dict(CATALOG)
+
+
+def _walk_catalog(walk, since=SINCE):
+    """Обход как в EncarParser.iter_car_ids: до отметки, затем - завершен"""
+    for car_id, modified in CATALOG:
+        if modified < since:
+            walk.complete = True
+            return
+        walk.record(car_id)
+        yield car_id
+    walk.complete = True
+
+
+def test_complete_walk_moves_mark_to_newest():
+    walk = DeltaWalk()
+    car_ids = list(_walk_catalog(walk))
+
+    assert car_ids == [105, 104, 103, 102]
+    assert walk.new_mark(MODIFIED, [str(car_id) for car_id in car_ids]) == "2026-05-05 10:00:00"
+
+
+def test_walk_truncated_by_max_cars_keeps_mark():
+    walk = DeltaWalk()
+    car_ids = list(islice(_walk_catalog(walk), 2))
+
+    assert car_ids == [105, 104]
+    assert not walk.complete
+    # 103 и 102 не обработаны - новая отметка пропустила бы их навсегда
+    assert walk.new_mark(MODIFIED, car_ids) is None
+
+
+def test_failed_car_keeps_mark():
+    walk = DeltaWalk()
+    car_ids = list(_walk_catalog(walk))
+
+    assert walk.new_mark(MODIFIED, [car_id for car_id in car_ids if car_id != 103]) is None
+
+
+def test_walk_without_changes_keeps_mark():
+    walk = DeltaWalk()
+    assert list(_walk_catalog(walk, since="2026-06-01 00:00:00")) == []
+    assert walk.new_mark(MODIFIED, []) is None
+
+
+def test_high_water_marks_only_move_forward(tmp_path):
+    marks = HighWaterMarks(tmp_path / "marks.json")
+    marks.update("kia", "q", "2026-05-05 10:00:00")
+    marks.update("kia", "q", "2026-05-01 10:00:00")
+
+    reloaded = HighWaterMarks(tmp_path / "marks.json")
+    assert reloaded.get("kia", "q") == "2026-05-05 10:00:00"
+    assert reloaded.get("kia", "other query") is None
@@ -0,0 +1,67 @@
+"""
+Тесты истории цен: запись изменений, снятые с продажи, изменения цены
+"""
+
+import pytest
+
+from encar_parser.data.price_history import STATUS_ACTIVE, STATUS_REMOVED, PriceHistoryStore
+
+DAY = 86400
+T0 = 1_700_000_000
+
+
+@pytest.fixture
+def store(tmp_path):
+    with PriceHistoryStore(tmp_path / "history.db", record_unchanged=False) as history:
+        yield history
+
+
+def _car(car_id, price, mileage=10000):
+    return {"id": str(car_id), "price": str(price), "mileage": f"{mileage:,}", "model": "K5"}
+
+
+def test_unchanged_observations_are_not_duplicated(store):
+    assert store.record([_car(1, 2000), _car(2, 3000)], brand="kia", observed_at=T0) == 2
+    assert store.record([_car(1, 2000), _car(2, 3000)], brand="kia", observed_at=T0 + DAY) == 0
+    assert store.record([_car(1, 1900), _car(2, 3000)], brand="kia", observed_at=T0 + 2 * DAY) == 1
+
+    assert [row["price"] for row in store.get_history(1)] == [2000, 1900]
+    assert store.get_stats() == {"cars": 2, "active": 2, "observations": 3}
+
+
+def test_price_changes_within_period(store):
+    store.record([_car(1, 2000), _car(2, 3000)], brand="kia", observed_at=T0)
+    store.record([_car(1, 1900), _car(2, 3100)], brand="kia", observed_at=T0 + DAY)
+    store.record([_car(3, 5000)], brand="bmw", observed_at=T0 + DAY)
+    store.record([_car(3, 4500)], brand="bmw", observed_at=T0 + 10 * DAY)
+
+    changes = store.price_changes(hours=48, now=T0 + 2 * DAY)
+    assert {(row["car_id"], row["old_price"], row["price"], row["change"]) for row in changes} == {
+        (1, 2000, 1900, -100),
+        (2, 3000, 3100, 100),
+    }
+
+    assert [row["car_id"] for row in store.price_changes(brand="bmw", hours=24, now=T0 + 10 * DAY)] == [3]
+    assert store.price_changes(brand="kia", hours=24, now=T0 + 10 * DAY) == []
+
+
+def test_mark_removed_only_affects_brand_and_unseen(store):
+    store.record([_car(1, 2000), _car(2, 3000)], brand="kia", observed_at=T0)
+    store.record([_car(3, 5000)], brand="bmw", observed_at=T0)
+
+    assert store.mark_removed("kia", [1], observed_at=T0 + 5 * DAY) == 1
+    assert store.mark_removed("kia", [1], observed_at=T0 + 6 * DAY) == 0
+
+    history = store.get_history(2)
+    assert [row["status"] for row in history] == [STATUS_ACTIVE, STATUS_REMOVED]
+    assert history[-1]["price"] == 3000
+    assert store.get_stats()["active"] == 2
+
+
+def test_days_on_market(store):
+    store.record([_car(1, 2000)], brand="kia", observed_at=T0)
+    store.record([_car(1, 2000)], brand="kia", observed_at=T0 + 3 * DAY)
+    store.mark_removed("kia", [], observed_at=T0 + 4 * DAY)
+
+    assert store.days_on_market(1) == 3.0
+    assert store.days_on_market(999) is None
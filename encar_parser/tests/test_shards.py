@@ -0,0 +1,67 @@
+"""
+Тесты плана частей каталога и объединения результатов частей
+"""
+
+import json
+
+import pytest
+
+from encar_parser.utils.shards import merge_shards, parse_shard_spec, plan_shards
+
+
+def test_plan_covers_all_pages_without_overlap():
+    plan = plan_shards(1, 10, 4)
+    assert plan == [(1, 3), (4, 3), (7, 2), (9, 2)]
+
+    pages = [page for first, count in plan for page in range(first, first + count)]
+    assert pages == list(range(1, 11))
+
+
+def test_plan_skips_empty_shards():
+    assert plan_shards(5, 2, 4) == [(5, 1), (6, 1)]
+
+
+def test_parse_shard_spec():
+    assert parse_shard_spec("2/4") == (2, 4)
+    for spec in ("0/4", "5/4", "2"):
+        with pytest.raises(ValueError):
+            parse_shard_spec(spec)
+
+
+def _write_jsonl(path, records):
+    path.write_text("".join(json.dumps(record) + "\n" for record in records), encoding="utf-8")
+
+
+def test_merge_keeps_newest_duplicate(tmp_path):
+    shards = tmp_path / "kia"
+    shards.mkdir()
+    _write_jsonl(
+        shards / "shard_1of2.jsonl",
+        [
+            {"id": "1", "price": "100", "parsed_at": "01/01/2026 10:00:00"},
+            {"id": "2", "price": "200", "parsed_at": "01/01/2026 10:00:00"},
+        ],
+    )
+    _write_jsonl(
+        shards / "shard_2of2.jsonl",
+        [
+            {"id": "2", "price": "190", "parsed_at": "02/01/2026 09:00:00"},
+            {"id": "3", "price": "300", "parsed_at": "01/01/2026 11:00:00"},
+        ],
+    )
+
+    summary = merge_shards([shards], filename="merged.json", output_dir=tmp_path)
+    assert (summary["files"], summary["records"], summary["unique"], summary["duplicates"]) == (
+        2,
+        4,
+        3,
+        1,
+    )
+
+    merged = json.loads((tmp_path / "merged.json").read_text(encoding="utf-8"))
+    assert {car["id"]: car["price"] for car in merged} == {"1": "100", "2": "190", "3": "300"}
+
+
+def test_merge_without_data(tmp_path):
+    summary = merge_shards([tmp_path])
+    assert summary["unique"] == 0 and summary["output"] is None